@@ -0,0 +1,45 @@
+"""
+@file bench_components.py
+
+Benchmarks building the parts a design is made of, each of which reads its catalog entry
+"""
+from harness import bench
+
+from imperium.classes.hardpoint import Hardpoint
+from imperium.classes.misc import Misc
+from imperium.classes.software import Software
+from imperium.classes.turrets import Turret
+
+
+@bench("turret", "components")
+def turret():
+    return lambda: Turret("Triple Turret")
+
+
+@bench("turret_armed", "components")
+def turret_armed():
+    def build():
+        armed = Turret("Triple Turret")
+        for slot in range(armed.max_wep):
+            armed.modify_weapon("Pulse Laser", slot)
+        return armed
+    return build
+
+
+@bench("hardpoint", "components")
+def hardpoint():
+    def build():
+        built = Hardpoint("HP000")
+        built.add_turret(Turret("Double Turret"))
+        return built
+    return build
+
+
+@bench("software", "components")
+def software():
+    return lambda: Software("Jump Control", 3)
+
+
+@bench("misc", "components")
+def misc():
+    return lambda: Misc("Staterooms", 10)
@@ -0,0 +1,116 @@
+"""
+@file bench_compression.py
+
+Benchmarks the size and throughput of each compression codec on a synthetic fleet archive. The
+fleet is built by cycling through the default designs under new names and is streamed straight to
+disk, so it is never held in memory whole
+Run on its own for a table of sizes and ratios, while the suite times writing and reading a
+smaller fleet with each codec
+
+Usage:
+    python benchmarks/bench_compression.py [--ships 100000] [--decode]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from harness import bench
+from ships import synthetic_fleet
+
+from imperium.shipyard.compression import CODECS, open_file
+from imperium.shipyard.stream import read_fleet, read_models, write_models
+
+# Ships in the fleet the suite writes and reads
+SUITE_SHIPS = 1000
+
+
+def archive_path(directory, codec):
+    # Path of the fleet archive written with a codec
+    return os.path.join(directory, "fleet.jsonl" + (CODECS[codec][2] if codec is not None else ""))
+
+
+def run(codec, ships, directory, decode=False):
+    """
+    Writes and reads back a synthetic fleet with a codec
+    :param codec: codec name, or None for plain text
+    :param ships: number of ships in the fleet
+    :param directory: directory to write the archive into
+    :param decode: whether reading builds spacecraft objects rather than only parsing
+    :return: dictionary of the archive size and timings
+    """
+    path = archive_path(directory, codec)
+
+    start = time.perf_counter()
+    with open_file(path, 'w') as f:
+        write_models(synthetic_fleet(ships), f)
+    write_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open_file(path) as f:
+        count = sum(1 for _ in (read_fleet(f) if decode else read_models(f)))
+    read_time = time.perf_counter() - start
+    assert count == ships
+
+    size = os.path.getsize(path)
+    os.remove(path)
+    return {"codec": codec or "none", "size": size, "write": write_time, "read": read_time}
+
+
+def register(codec):
+    # Registers the suite's write and read benchmarks of a codec
+    name = codec or "none"
+
+    @bench("write_" + name, "compression", repeat=5)
+    def write():
+        models = list(synthetic_fleet(SUITE_SHIPS))
+        with tempfile.TemporaryDirectory() as directory:
+            path = archive_path(directory, codec)
+
+            def write_fleet():
+                with open_file(path, 'w') as f:
+                    write_models(models, f)
+            yield write_fleet
+
+    @bench("read_" + name, "compression", repeat=5)
+    def read():
+        models = list(synthetic_fleet(SUITE_SHIPS))
+        with tempfile.TemporaryDirectory() as directory:
+            path = archive_path(directory, codec)
+            with open_file(path, 'w') as f:
+                write_models(models, f)
+
+            def read_fleet_models():
+                with open_file(path) as f:
+                    for _ in read_models(f):
+                        pass
+            yield read_fleet_models
+
+
+for _codec in [None] + sorted(CODECS):
+    register(_codec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the compression codecs on a synthetic fleet")
+    parser.add_argument("--ships", type=int, default=100000, help="number of ships in the fleet")
+    parser.add_argument("--decode", action="store_true", help="build spacecraft objects when reading")
+    args = parser.parse_args(argv)
+
+    print("{:<6} {:>10} {:>7} {:>10} {:>12} {:>12}".format(
+        "codec", "size (MB)", "ratio", "write (s)", "read (s)", "read ships/s"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        plain_size = None
+        for codec in [None] + sorted(CODECS):
+            result = run(codec, args.ships, directory, args.decode)
+            if plain_size is None:
+                plain_size = result['size']
+
+            print("{:<6} {:>10.2f} {:>7.2f} {:>10.2f} {:>12.2f} {:>12.0f}".format(
+                result['codec'], result['size'] / 1e6, plain_size / result['size'],
+                result['write'], result['read'], args.ships / result['read']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+@file bench_fileloader.py
+
+Benchmarks saving designs and loading them without a window, the work behind every file
+operation and headless tool
+"""
+import os
+import tempfile
+
+from harness import bench
+from ships import default_path, max_ship
+
+from imperium.shipyard.fileloader import FileLoader
+
+
+@bench("save_model", "fileloader")
+def save_model():
+    fileloader = FileLoader()
+    spacecraft = max_ship()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "max.srd")
+        yield lambda: fileloader.save_model(path, spacecraft)
+
+
+@bench("encode_model", "fileloader")
+def encode_model():
+    fileloader = FileLoader()
+    spacecraft = max_ship()
+    return lambda: fileloader.encode_model(spacecraft)
+
+
+@bench("load_default", "fileloader")
+def load_default():
+    fileloader = FileLoader()
+    path = default_path("Mercenary Cruiser")
+    return lambda: fileloader.load_spacecraft(path)
+
+
+@bench("load_max", "fileloader")
+def load_max():
+    fileloader = FileLoader()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "max.srd")
+        fileloader.save_model(path, max_ship())
+        yield lambda: fileloader.load_spacecraft(path)
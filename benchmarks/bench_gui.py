@@ -0,0 +1,45 @@
+"""
+@file bench_gui.py
+
+Benchmarks the window refreshing its stats after an edit and loading a design, on the offscreen
+platform so the suite runs without a display
+"""
+import os
+
+from harness import bench
+from ships import default_path
+
+
+def build_window():
+    """
+    Builds a window, starting the application first if the suite hasn't yet
+    :return: Window object
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from imperium.gui.window import Window
+
+    global _app
+    _app = QApplication.instance() or QApplication([])
+    return Window()
+
+
+@bench("update_stats", "gui", repeat=10)
+def update_stats():
+    window = build_window()
+    window.fileloader.load_model(default_path("Mercenary Cruiser"), window)
+
+    # The request is coalesced, so the refresh it schedules is run straight away
+    def edit():
+        window.update_stats()
+        window.refresh_stats()
+    yield edit
+    window.close()
+
+
+@bench("load_model", "gui", repeat=10)
+def load_model():
+    window = build_window()
+    path = default_path("Mercenary Cruiser")
+    yield lambda: window.fileloader.load_model(path, window)
+    window.close()
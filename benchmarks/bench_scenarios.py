@@ -0,0 +1,35 @@
+"""
+@file bench_scenarios.py
+
+Benchmarks whole scripted sessions, the built in scenarios of imperium.scenarios, so a slowdown
+anywhere between loading, editing and saving a ship shows even when no finer benchmark covers it
+"""
+import random
+import tempfile
+
+from harness import bench
+
+from imperium.scenarios import SEED, Steps, defaults, defaults_gui
+
+
+def scenario_run(scenario):
+    """
+    Times runs of a scenario saving to a scratch directory, reseeded as the scenario command does
+    :param scenario: scenario function
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        def run():
+            random.seed(SEED)
+            scenario(Steps(), directory)
+        yield run
+
+
+# Sessions touch the disk, so they are noisier than the rest of the suite
+@bench("defaults", "scenario", repeat=10, threshold=0.10)
+def scenario_defaults():
+    yield from scenario_run(defaults)
+
+
+@bench("defaults_gui", "scenario", repeat=10, threshold=0.10)
+def scenario_defaults_gui():
+    yield from scenario_run(defaults_gui)
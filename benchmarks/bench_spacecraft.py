@@ -0,0 +1,43 @@
+"""
+@file bench_spacecraft.py
+
+Benchmarks the totals of a design, on a bare 100 ton hull and on the largest fitted out hull
+"""
+from harness import bench
+from ships import max_ship, small_ship
+
+
+@bench("total_cost_small", "spacecraft")
+def total_cost_small():
+    return small_ship().get_total_cost
+
+
+@bench("total_cost_max", "spacecraft")
+def total_cost_max():
+    return max_ship().get_total_cost
+
+
+@bench("remaining_cargo_small", "spacecraft")
+def remaining_cargo_small():
+    return small_ship().get_remaining_cargo
+
+
+@bench("remaining_cargo_max", "spacecraft")
+def remaining_cargo_max():
+    return max_ship().get_remaining_cargo
+
+
+@bench("stats_max", "spacecraft")
+def stats_max():
+    return max_ship().get_stats
+
+
+@bench("components_max", "spacecraft")
+def components_max():
+    return max_ship().get_components
+
+
+@bench("performance_by_volume", "spacecraft")
+def performance_by_volume():
+    spacecraft = max_ship()
+    return lambda: spacecraft.performance_by_volume("jdrive", spacecraft.jdrive.drive_type)
@@ -0,0 +1,235 @@
+"""
+@file compare.py
+
+Compares the benchmark suite against a stored baseline, flagging benchmarks whose slowdown is both
+larger than their threshold and statistically significant under Welch's t-test of the samples. Exits
+with 1 when any benchmark regressed, so it can gate a change
+
+Baselines are results files from write_results, kept under benchmarks/baselines and recorded with
+the machine and commit they were taken on. Times only compare on like hardware, so save a baseline
+on the machine that will check against it
+
+Usage:
+    python benchmarks/compare.py --save [--baseline FILE] [-k TEXT] [--rounds N]
+    python benchmarks/compare.py [--baseline FILE] [--results FILE] [-k TEXT] [--rounds N]
+                                 [--threshold FRACTION] [--alpha P]
+"""
+import argparse
+import math
+import os
+import statistics
+import sys
+
+import harness
+from run import discover, format_time, run_suite, select
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json")
+
+# Chance of a slowdown being noise below which it is taken as real
+ALPHA = 0.01
+
+# Rounds of the suite run for a baseline or a comparison, as times drift between runs
+ROUNDS = 3
+
+# Environment fields that must match for times to be comparable
+COMPARABLE = ["python", "implementation", "machine", "cpus"]
+
+# Continued fraction limits of the incomplete beta function
+BETA_ITERATIONS = 200
+BETA_EPSILON = 1e-14
+
+
+def beta_fraction(a, b, x):
+    # Continued fraction of the incomplete beta function by the modified Lentz method
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, BETA_ITERATIONS + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < BETA_EPSILON:
+            break
+    return fraction
+
+
+def incomplete_beta(a, b, x):
+    """
+    Regularized incomplete beta function I_x(a, b)
+    :param a: first shape, positive
+    :param b: second shape, positive
+    :param x: point in [0, 1]
+    :return: value in [0, 1]
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x))
+    # The fraction converges quickly only below the mean, so the other side is taken by symmetry
+    if x < (a + 1) / (a + b + 2):
+        return front * beta_fraction(a, b, x) / a
+    return 1.0 - front * beta_fraction(b, a, 1 - x) / b
+
+
+def welch_test(baseline, current):
+    """
+    Welch's t-test of whether the current samples take longer than the baseline's, not assuming
+    the two have the same variance
+    :param baseline: list of seconds per call
+    :param current: list of seconds per call
+    :return: tuple of (t statistic, degrees of freedom, one sided p-value of current being no slower)
+    """
+    if len(baseline) < 2 or len(current) < 2:
+        raise ValueError("Error: a t-test needs at least two samples on each side")
+
+    mean_base, mean_now = statistics.mean(baseline), statistics.mean(current)
+    error_base = statistics.variance(baseline) / len(baseline)
+    error_now = statistics.variance(current) / len(current)
+    error = error_base + error_now
+    if error == 0:
+        # Samples without spread differ surely or not at all
+        return (math.inf if mean_now > mean_base else -math.inf if mean_now < mean_base else 0.0,
+                float(len(baseline) + len(current) - 2), 0.0 if mean_now > mean_base else 1.0)
+
+    t = (mean_now - mean_base) / math.sqrt(error)
+    df = error ** 2 / (error_base ** 2 / (len(baseline) - 1) + error_now ** 2 / (len(current) - 1))
+    tail = 0.5 * incomplete_beta(df / 2, 0.5, df / (df + t * t))
+    return t, df, tail if t > 0 else 1.0 - tail
+
+
+def log_times(times):
+    # Logarithms of times, clamped above zero for timers too coarse to see a call
+    return [math.log(max(seconds, 1e-12)) for seconds in times]
+
+
+def compare(baseline, current, threshold=None, alpha=ALPHA):
+    """
+    Compares each benchmark run against its baseline
+    A benchmark regressed when its median slowed by more than its threshold and Welch's test finds
+    the slowdown significant; it improved when the reverse holds. The test is of the median of each
+    round when both sides ran several, else of the samples, and of their logarithms as a busy machine
+    scales every time rather than adding to it
+    :param baseline: list of result dictionaries of the baseline
+    :param current: list of result dictionaries of the run
+    :param threshold: least change reported, None for each benchmark's own
+    :param alpha: greatest p-value taken as significant
+    :return: list of comparison dictionaries in the order of the run, verdict being "regressed",
+             "improved", "unchanged" or "new"
+    """
+    baseline = {result['name']: result for result in baseline}
+    comparisons = list()
+    for result in current:
+        base = baseline.get(result['name'])
+        if base is None:
+            comparisons.append({"name": result['name'], "baseline": None, "current": result['median'],
+                                "change": None, "p": None, "threshold": None, "verdict": "new"})
+            continue
+
+        limit = threshold if threshold is not None else result.get('threshold', harness.THRESHOLD)
+        change = result['median'] / base['median'] - 1
+        # Samples of one run understate the drift between runs, so rounds are tested when both have them
+        key = 'rounds' if len(base.get('rounds', [])) > 1 and len(result.get('rounds', [])) > 1 else 'samples'
+        _, _, p_slower = welch_test(log_times(base[key]), log_times(result[key]))
+        p_faster = 1.0 - p_slower
+        if change > limit and p_slower < alpha:
+            verdict, p = "regressed", p_slower
+        elif change < -limit and p_faster < alpha:
+            verdict, p = "improved", p_faster
+        else:
+            verdict, p = "unchanged", min(p_slower, p_faster)
+        comparisons.append({"name": result['name'], "baseline": base['median'], "current": result['median'],
+                            "change": change, "p": p, "threshold": limit, "verdict": verdict})
+    return comparisons
+
+
+def format_report(comparisons):
+    """
+    Formats comparisons as a table of medians, change, p-value and verdict per benchmark
+    :param comparisons: list of comparison dictionaries
+    :return: list of lines
+    """
+    lines = ["{:<36} {:>10} {:>10} {:>9} {:>9} {:>7}  {}".format(
+        "benchmark", "baseline", "current", "change", "p", "limit", "verdict")]
+    for comparison in comparisons:
+        if comparison['verdict'] == "new":
+            lines.append("{:<36} {:>10} {:>10} {:>9} {:>9} {:>7}  new".format(
+                comparison['name'], "-", format_time(comparison['current']), "-", "-", "-"))
+            continue
+        lines.append("{:<36} {:>10} {:>10} {:>+8.1f}% {:>9.2g} {:>6.0f}%  {}".format(
+            comparison['name'], format_time(comparison['baseline']), format_time(comparison['current']),
+            comparison['change'] * 100, comparison['p'], comparison['threshold'] * 100, comparison['verdict']))
+    return lines
+
+
+def environment_mismatch(baseline, current):
+    """
+    Lists the environment fields that differ between two runs
+    :param baseline: environment dictionary of the baseline
+    :param current: environment dictionary of the run
+    :return: list of "field: baseline != current" strings
+    """
+    return ["{}: {} != {}".format(field, baseline.get(field), current.get(field))
+            for field in COMPARABLE if baseline.get(field) != current.get(field)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the benchmark suite against a stored baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results file")
+    parser.add_argument("--save", action="store_true", help="run the suite and save it as the baseline")
+    parser.add_argument("--results", default=None, help="compare this results file instead of running the suite")
+    parser.add_argument("-k", dest="pattern", default=None, help="only compare benchmarks whose name holds this text")
+    parser.add_argument("--repeat", type=int, default=None, help="samples per benchmark, overriding their own")
+    parser.add_argument("--min-time", type=float, default=harness.MIN_TIME, help="least seconds a sample lasts")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="times the suite is run")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="least slowdown flagged, as a fraction, overriding each benchmark's own")
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="greatest p-value taken as significant")
+    args = parser.parse_args(argv)
+
+    if args.save:
+        benchmarks = select(discover(), args.pattern)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        harness.write_results(args.baseline, run_suite(benchmarks, args.repeat, args.min_time, rounds=args.rounds))
+        print("Baseline saved to {}".format(args.baseline))
+        return 0
+
+    try:
+        baseline = harness.read_results(args.baseline)
+    except (OSError, ValueError) as error:
+        print("Error: couldn't read the baseline {} - {}".format(args.baseline, error), file=sys.stderr)
+        return 2
+
+    if args.results is not None:
+        document = harness.read_results(args.results)
+        current = [result for result in document['benchmarks'] if args.pattern is None or args.pattern in result['name']]
+        environment = document['environment']
+    else:
+        # The table of the run goes to stderr, leaving stdout to the report
+        current = run_suite(select(discover(), args.pattern), args.repeat, args.min_time, sys.stderr,
+                            args.rounds)
+        environment = harness.environment()
+
+    for mismatch in environment_mismatch(baseline['environment'], environment):
+        print("Warning: baseline taken on another environment, {}".format(mismatch), file=sys.stderr)
+
+    comparisons = compare(baseline['benchmarks'], current, args.threshold, args.alpha)
+    print("Baseline {} from commit {}".format(args.baseline, baseline['environment'].get('commit')))
+    print("\n".join(format_report(comparisons)))
+
+    regressed = [comparison['name'] for comparison in comparisons if comparison['verdict'] == "regressed"]
+    if regressed:
+        print("{} of {} benchmarks regressed: {}".format(len(regressed), len(comparisons), ", ".join(regressed)))
+        return 1
+    print("No regressions in {} benchmarks".format(len(comparisons)))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+"""
+@file harness.py
+
+Registry and timing loop shared by the benchmark suite. A benchmark is a setup function registered
+with @bench that returns the callable to time, or yields it when it has cleaning up to do after.
+Setup is never timed. Each benchmark is timed in samples of enough calls to outlast the timer's
+resolution, and reported per call with the statistics runs are compared by
+"""
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Version of the results layout written by write_results
+RESULTS_VERSION = 1
+
+# Samples taken of each benchmark, and the least time a sample lasts
+REPEAT = 20
+MIN_TIME = 0.01
+
+# Least slowdown of the median a comparison reports as a regression, as a fraction
+THRESHOLD = 0.05
+
+# Registered benchmarks by name, in the order they were registered
+BENCHMARKS = dict()
+
+
+class Benchmark:
+    """
+    A registered benchmark
+
+    :param name: unique name, "group.name" by convention
+    :param group: group the benchmark is listed under, such as "spacecraft" or "gui"
+    :param setup: function returning or yielding the callable to time
+    :param repeat: samples taken, overriding REPEAT for slow benchmarks
+    :param threshold: least slowdown reported as a regression, overriding THRESHOLD for noisy benchmarks
+    """
+    def __init__(self, name, group, setup, repeat=None, threshold=None):
+        self.name      = name
+        self.group     = group
+        self.setup     = setup
+        self.repeat    = repeat
+        self.threshold = threshold
+
+
+def bench(name, group, repeat=None, threshold=None):
+    """
+    Registers a benchmark setup function
+    :param name: name of the benchmark within its group
+    :param group: group the benchmark is listed under
+    :param repeat: samples taken, if the benchmark is too slow for REPEAT
+    :param threshold: least slowdown reported as a regression, if the benchmark is too noisy for THRESHOLD
+    :return: decorator registering the function
+    """
+    def register(setup):
+        full_name = "{}.{}".format(group, name)
+        if full_name in BENCHMARKS:
+            raise ValueError("Error: benchmark {} is registered twice".format(full_name))
+        BENCHMARKS[full_name] = Benchmark(full_name, group, setup, repeat, threshold)
+        return setup
+    return register
+
+
+def quartiles(ordered):
+    """
+    Quartiles of sorted samples, interpolated as statistics.quantiles does by default, which isn't
+    available before Python 3.8
+    :param ordered: list of at least two numbers, sorted
+    :return: list of the first, second and third quartiles
+    """
+    size = len(ordered)
+    cuts = list()
+    for quarter in range(1, 4):
+        index = min(max(quarter * (size + 1) // 4, 1), size - 1)
+        delta = quarter * (size + 1) - index * 4
+        cuts.append((ordered[index - 1] * (4 - delta) + ordered[index] * delta) / 4)
+    return cuts
+
+
+def summarize(samples):
+    """
+    Summarises the per call times of a benchmark's samples
+    :param samples: list of seconds per call, one per sample
+    :return: dictionary of statistics in seconds
+    """
+    ordered = sorted(samples)
+    quarters = quartiles(ordered) if len(ordered) > 1 else [ordered[0]] * 3
+    return {
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": statistics.mean(ordered),
+        "median": statistics.median(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "iqr": quarters[2] - quarters[0]
+    }
+
+
+def measure(funct, repeat=REPEAT, min_time=MIN_TIME):
+    """
+    Times a callable, calling it once to warm up, then doubling the calls per sample until a
+    sample lasts min_time, like timeit's autorange
+    :param funct: callable taking no arguments
+    :param repeat: number of samples
+    :param min_time: least seconds a sample lasts
+    :return: tuple of (calls per sample, list of seconds per call)
+    """
+    funct()
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            funct()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            funct()
+        samples.append((time.perf_counter() - start) / number)
+    return number, samples
+
+
+def run_benchmark(benchmark, repeat=None, min_time=MIN_TIME):
+    """
+    Sets up a benchmark, times it and cleans up after it
+    :param benchmark: Benchmark object
+    :param repeat: samples taken, defaulting to the benchmark's own or REPEAT
+    :param min_time: least seconds a sample lasts
+    :return: result dictionary of the name, group, calls per sample, threshold, samples and statistics
+    """
+    repeat = repeat or benchmark.repeat or REPEAT
+    setup = benchmark.setup()
+    funct = next(setup) if hasattr(setup, "__next__") else setup
+    try:
+        number, samples = measure(funct, repeat, min_time)
+    finally:
+        if hasattr(setup, "close"):
+            setup.close()
+
+    result = {"name": benchmark.name, "group": benchmark.group, "number": number, "repeat": repeat,
+              "threshold": benchmark.threshold or THRESHOLD, "samples": samples}
+    result.update(summarize(samples))
+    return result
+
+
+def merge_rounds(rounds):
+    """
+    Merges the results of a benchmark over several rounds of the suite. Times drift between rounds
+    more than within one, so the median of each round is kept as an observation of its own
+    :param rounds: list of result dictionaries of one benchmark, one per round
+    :return: result dictionary of every sample, with the median of each round under "rounds"
+    """
+    samples = [sample for result in rounds for sample in result['samples']]
+    result = dict(rounds[0], repeat=len(samples), samples=samples,
+                  rounds=[result['median'] for result in rounds])
+    result.update(summarize(samples))
+    return result
+
+
+def environment():
+    """
+    Describes the machine and tree the benchmarks ran on, so results are only compared like for like
+    :return: dictionary of the interpreter, platform, CPU count, git commit and time
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    }
+
+
+def write_results(path, results):
+    """
+    Writes benchmark results as JSON along with the environment they ran in
+    :param path: file to write, or "-" for standard output
+    :param results: list of result dictionaries from run_benchmark
+    """
+    document = {"version": RESULTS_VERSION, "environment": environment(), "benchmarks": results}
+    if path == "-":
+        json.dump(document, sys.stdout, indent=1)
+        print()
+        return
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=1)
+
+
+def read_results(path):
+    """
+    Reads results written by write_results
+    :param path: JSON results file
+    :return: results document
+    """
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError("Error: {} holds results version {}, not {}".format(path, document.get("version"),
+                                                                             RESULTS_VERSION))
+    return document
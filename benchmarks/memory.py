@@ -0,0 +1,232 @@
+"""
+@file memory.py
+
+Measures the memory a fleet of ships holds once loaded through the headless path, for services that
+keep whole fleets resident. Ships are decoded from SRD text under tracemalloc and kept alive, giving
+the bytes per ship, the lines that allocated them, how the total grows with the fleet and whether
+each ship fits a budget
+
+Bytes per part are the objects reachable from each attribute of the ship that nothing else holds,
+so catalog data shared through get_file_data is left out and charged to no ship
+
+Usage:
+    python benchmarks/memory.py [--ships N [N ...]] [--budget BYTES] [--top N] [--json FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import sysconfig
+import tracemalloc
+import types
+
+import harness  # noqa: F401 puts the repository on the path
+from ships import synthetic_fleet
+
+from imperium.classes import json_reader
+from imperium.shipyard.fileloader import FileLoader
+
+# Fleet sizes measured by default, the largest being checked against the budget
+SHIPS = [10, 100, 1000]
+
+# Most bytes a loaded ship may hold, on average over the largest fleet measured
+BUDGET = 8 * 1024
+
+# Allocation sites listed, and frames of each traceback kept to find the shipyard code behind them
+TOP_SITES = 10
+FRAMES = 8
+
+# Folder of the standard library, whose allocations are charged to the code calling into it
+STDLIB = os.path.normpath(sysconfig.get_paths()["stdlib"])
+
+# Objects the walk stops at, being shared by everything rather than held by a ship
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def fleet_text(count):
+    """
+    Encodes a fleet as SRD text, so every ship is decoded from its own parsed dictionary as when
+    read from a file
+    :param count: number of ships
+    :return: list of SRD strings
+    """
+    return [json.dumps(model) for model in synthetic_fleet(count)]
+
+
+def reachable(roots, stop=frozenset()):
+    """
+    Finds every object reachable from some roots through the references the garbage collector sees
+    :param roots: objects to start from
+    :param stop: ids of objects not to count or walk through
+    :return: dictionary of object id to object
+    """
+    found = dict()
+    pending = list(roots)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in stop or id(obj) in found or isinstance(obj, SHARED_TYPES) or obj is None:
+            continue
+        found[id(obj)] = obj
+        pending.extend(gc.get_referents(obj))
+    return found
+
+
+def site_name(frame):
+    # Names a frame by its folder, file and line, such as shipyard/fileloader.py:234
+    path = os.path.normpath(frame.filename)
+    return "{}:{}".format("/".join(path.split(os.sep)[-2:]), frame.lineno)
+
+
+def allocation_sites(stats):
+    """
+    Totals allocations by the line that made them and the line outside the standard library that
+    led there, so memory allocated by the json module is tied to the code that asked for it
+    :param stats: list of StatisticDiff grouped by traceback
+    :return: list of site dictionaries, most bytes first
+    """
+    sites = dict()
+    for stat in stats:
+        frames = list(stat.traceback)
+        name = site_name(frames[-1])
+        caller = next((frame for frame in reversed(frames)
+                       if not os.path.normpath(frame.filename).startswith(STDLIB)), None)
+        if caller is not None and caller is not frames[-1]:
+            name += " via " + site_name(caller)
+        site = sites.setdefault(name, {"site": name, "bytes": 0, "blocks": 0})
+        site['bytes'] += stat.size_diff
+        site['blocks'] += stat.count_diff
+    return sorted(sites.values(), key=lambda site: -site['bytes'])
+
+
+def shared_ids():
+    # Ids of the catalog data every ship may reference, as parsed and cached by get_file_data
+    return frozenset(reachable([json_reader._cache]))
+
+
+def part_sizes(spacecraft, shared):
+    """
+    Sizes the objects each attribute of a ship holds, leaving out shared catalog data. An object
+    reachable from two attributes is charged to the first
+    :param spacecraft: Spacecraft object
+    :param shared: ids of shared objects
+    :return: dictionary of attribute name to bytes, with the ship itself and its plain values under "spacecraft"
+    """
+    seen = set(shared)
+    sizes = {"spacecraft": sys.getsizeof(spacecraft) + sys.getsizeof(vars(spacecraft))}
+    seen.update((id(spacecraft), id(vars(spacecraft))))
+
+    for name, value in vars(spacecraft).items():
+        objects = reachable([value], seen)
+        seen.update(objects)
+        size = sum(sys.getsizeof(obj) for obj in objects.values())
+        if isinstance(value, (list, tuple)) or hasattr(value, "__dict__"):
+            sizes[name] = size
+        else:
+            sizes["spacecraft"] += size
+    return sizes
+
+
+def measure_fleet(count, top=TOP_SITES):
+    """
+    Loads a fleet under tracemalloc and sizes it while it is held
+    :param count: number of ships
+    :param top: allocation sites to list
+    :return: dictionary of the fleet size, bytes held, bytes per ship, bytes per part per ship and the
+             top allocation sites
+    """
+    texts = fleet_text(count)
+    fileloader = FileLoader()
+
+    # The catalog is parsed once by the first ship of any fleet, so it is loaded before tracing
+    fileloader.decode_model(json.loads(texts[0]))
+    gc.collect()
+
+    tracemalloc.start(FRAMES)
+    before = tracemalloc.take_snapshot()
+    ships = [fileloader.decode_model(json.loads(text)) for text in texts]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    sites = [site for site in allocation_sites(after.compare_to(before, "traceback"))[:top] if site['bytes'] > 0]
+
+    shared = shared_ids()
+    parts = dict()
+    for spacecraft in ships:
+        for name, size in part_sizes(spacecraft, shared).items():
+            parts[name] = parts.get(name, 0) + size
+
+    return {"ships": count, "bytes": held, "per_ship": held / count,
+            "parts": {name: size / count for name, size in sorted(parts.items(), key=lambda item: -item[1])},
+            "sites": sites}
+
+
+def format_bytes(size):
+    # Formats a size in the unit that suits it
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024 or unit == "MiB":
+            return "{:.1f} {}".format(size, unit) if unit != "B" else "{:.0f} B".format(size)
+        size /= 1024
+
+
+def format_report(results, budget):
+    """
+    Formats fleet measurements as the growth table, then the parts and allocation sites of the largest
+    :param results: list of dictionaries from measure_fleet, smallest fleet first
+    :param budget: bytes allowed per ship
+    :return: list of lines
+    """
+    lines = ["{:>8} {:>12} {:>12}".format("ships", "held", "per ship")]
+    for result in results:
+        lines.append("{:>8} {:>12} {:>12}".format(result['ships'], format_bytes(result['bytes']),
+                                                  format_bytes(result['per_ship'])))
+    if len(results) > 1:
+        first, last = results[0], results[-1]
+        slope = (last['bytes'] - first['bytes']) / (last['ships'] - first['ships'])
+        lines.append("each further ship holds {}, fixed cost {}".format(
+            format_bytes(slope), format_bytes(first['bytes'] - slope * first['ships'])))
+
+    largest = results[-1]
+    parts_total = sum(largest['parts'].values())
+    lines += ["", "{:<20} {:>12} {:>7}".format("part", "per ship", "share")]
+    for name, size in largest['parts'].items():
+        lines.append("{:<20} {:>12} {:>6.1f}%".format(name, format_bytes(size), 100 * size / parts_total))
+
+    lines += ["", "{:<60} {:>12} {:>10}".format("allocation site", "per ship", "blocks")]
+    for site in largest['sites']:
+        lines.append("{:<60} {:>12} {:>10}".format(site['site'], format_bytes(site['bytes'] / largest['ships']),
+                                                   site['blocks']))
+
+    lines += ["", "budget {} per ship, {} held: {}".format(
+        format_bytes(budget), format_bytes(largest['per_ship']), "ok" if largest['per_ship'] <= budget else "OVER")]
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory held by fleets of loaded ships")
+    parser.add_argument("--ships", type=int, nargs="+", default=SHIPS, help="fleet sizes to measure")
+    parser.add_argument("--budget", type=int, default=BUDGET, help="most bytes a ship may hold")
+    parser.add_argument("--top", type=int, default=TOP_SITES, help="allocation sites to list")
+    parser.add_argument("--json", default=None, help="file to write the measurements to, - for standard output")
+    args = parser.parse_args(argv)
+
+    results = [measure_fleet(count, args.top) for count in sorted(args.ships)]
+    out = sys.stderr if args.json == "-" else sys.stdout
+    print("\n".join(format_report(results, args.budget)), file=out)
+
+    if args.json is not None:
+        document = {"environment": harness.environment(), "budget": args.budget, "fleets": results}
+        if args.json == "-":
+            json.dump(document, sys.stdout, indent=1)
+            print()
+        else:
+            with open(args.json, 'w') as f:
+                json.dump(document, f, indent=1)
+
+    return 0 if results[-1]['per_ship'] <= args.budget else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+"""
+@file run.py
+
+Runs the benchmark suite, every bench_*.py module in this directory, printing a table of the
+per call times and writing the samples and statistics as JSON for comparing runs
+
+Usage:
+    python benchmarks/run.py [-k TEXT] [--repeat N] [--min-time SECONDS] [--rounds N] [--json FILE] [--list]
+"""
+import argparse
+import os
+import sys
+
+import harness
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def discover():
+    """
+    Imports every bench_*.py module, registering its benchmarks
+    :return: dictionary of benchmark names to Benchmark objects
+    """
+    for filename in sorted(os.listdir(BENCHMARK_DIR)):
+        if filename.startswith("bench_") and filename.endswith(".py"):
+            __import__(filename[:-3])
+    return harness.BENCHMARKS
+
+
+def select(benchmarks, pattern=None):
+    """
+    Picks the benchmarks whose name holds a piece of text
+    :param benchmarks: dictionary of benchmark names to Benchmark objects
+    :param pattern: text to look for, None for every benchmark
+    :return: list of Benchmark objects
+    """
+    return [benchmark for name, benchmark in benchmarks.items() if pattern is None or pattern in name]
+
+
+def format_time(seconds):
+    # Formats a time per call in the unit that suits it
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return "{:.3g} {}".format(seconds * scale, unit)
+    return "{:.3g} ns".format(seconds * 1e9)
+
+
+def run_suite(benchmarks, repeat=None, min_time=harness.MIN_TIME, out=sys.stdout, rounds=1):
+    """
+    Runs benchmarks one after another, printing a row of the table as each finishes
+    :param benchmarks: list of Benchmark objects
+    :param repeat: samples per benchmark, None for their own
+    :param min_time: least seconds a sample lasts
+    :param out: stream the table is printed to
+    :param rounds: times the whole suite is run, merging each benchmark's rounds into one result
+    :return: list of result dictionaries
+    """
+    print("{:<36} {:>10} {:>10} {:>10} {:>10} {:>8}".format("benchmark", "median", "mean", "stdev", "min", "calls"),
+          file=out)
+
+    runs = {benchmark.name: list() for benchmark in benchmarks}
+    for idx in range(rounds):
+        if rounds > 1:
+            print("round {} of {}".format(idx + 1, rounds), file=out)
+        for benchmark in benchmarks:
+            result = harness.run_benchmark(benchmark, repeat, min_time)
+            runs[benchmark.name].append(result)
+            print("{:<36} {:>10} {:>10} {:>10} {:>10} {:>8}".format(
+                result['name'], format_time(result['median']), format_time(result['mean']),
+                format_time(result['stdev']), format_time(result['min']), result['number'] * result['repeat']),
+                file=out, flush=True)
+
+    if rounds == 1:
+        return [results[0] for results in runs.values()]
+    return [harness.merge_rounds(results) for results in runs.values()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the imperium-shipyard benchmark suite")
+    parser.add_argument("-k", dest="pattern", default=None, help="only run benchmarks whose name holds this text")
+    parser.add_argument("--repeat", type=int, default=None, help="samples per benchmark, overriding their own")
+    parser.add_argument("--min-time", type=float, default=harness.MIN_TIME, help="least seconds a sample lasts")
+    parser.add_argument("--rounds", type=int, default=1, help="times the suite is run, kept apart in the results")
+    parser.add_argument("--json", default=None, help="file to write the results to, - for standard output")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks without running them")
+    args = parser.parse_args(argv)
+
+    benchmarks = select(discover(), args.pattern)
+    if args.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        return 0
+    if not benchmarks:
+        print("Error: no benchmarks match '{}'".format(args.pattern), file=sys.stderr)
+        return 1
+
+    # The table goes to stderr when the JSON takes stdout
+    out = sys.stderr if args.json == "-" else sys.stdout
+    results = run_suite(benchmarks, args.repeat, args.min_time, out, args.rounds)
+
+    if args.json is not None:
+        harness.write_results(args.json, results)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""
+@file ships.py
+
+Designs the benchmarks run against: the default designs, a bare 100 ton hull, and the largest hull
+fitted out with every hardpoint armed, the most parts a design holds
+"""
+import os
+
+import harness  # noqa: F401 puts the repository on the path
+
+from imperium.classes.armour import Armour
+from imperium.classes.computer import Computer
+from imperium.classes.drives import JDrive, MDrive
+from imperium.classes.hardpoint import Hardpoint
+from imperium.classes.json_reader import get_file_data
+from imperium.classes.misc import Misc
+from imperium.classes.pplant import PPlant
+from imperium.classes.software import Software
+from imperium.classes.spacecraft import Spacecraft
+from imperium.classes.turrets import Turret
+from imperium.shipyard.fileloader import FileLoader
+
+DEFAULT_MODELS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../imperium/shipyard/models/default")
+
+
+def default_path(name):
+    # Path of a default design by name
+    return os.path.join(DEFAULT_MODELS, name + ".srd")
+
+
+def small_ship():
+    # A bare 100 ton hull, as the window starts with
+    return Spacecraft(100)
+
+
+def max_ship():
+    """
+    Builds the largest hull with the largest drives it takes, a triple turret of pulse lasers on
+    every hardpoint and a part of each other kind
+    :return: Spacecraft object
+    """
+    tonnage = max(hull.get("tonnage") for hull in get_file_data("hull_data.json").values())
+    spacecraft = Spacecraft(tonnage)
+
+    letters = sorted(get_file_data("hull_performance.json"))
+    for letter in reversed(letters):
+        if spacecraft.performance_by_volume("jdrive", letter) is not None:
+            spacecraft.add_jdrive(JDrive(letter))
+            spacecraft.add_mdrive(MDrive(letter))
+            spacecraft.add_pplant(PPlant(letter))
+            break
+
+    spacecraft.add_computer(Computer("Model 7"))
+    spacecraft.add_armour(Armour("Crystaliron"))
+    spacecraft.modify_software(Software("Jump Control", 6))
+    spacecraft.modify_software(Software("Fire Control", 5))
+    spacecraft.modify_misc(Misc("Staterooms", 40))
+    spacecraft.modify_misc(Misc("Repair Drones", 1))
+
+    for idx in range(spacecraft.num_hardpoints):
+        hardpoint = Hardpoint("HP{:03d}".format(idx))
+        turret = Turret("Triple Turret")
+        for slot in range(turret.max_wep):
+            turret.modify_weapon("Pulse Laser", slot)
+        hardpoint.add_turret(turret)
+        spacecraft.add_hardpoint(hardpoint)
+    return spacecraft
+
+
+def synthetic_fleet(count):
+    """
+    Generates SRD dictionaries for a fleet of the given size from the default designs
+    :param count: number of ships
+    :return: generator of SRD dictionaries
+    """
+    fileloader = FileLoader()
+    designs = [fileloader.encode_model(fileloader.load_spacecraft(os.path.join(DEFAULT_MODELS, filename)))
+               for filename in sorted(os.listdir(DEFAULT_MODELS))]
+
+    for idx in range(count):
+        model = dict(designs[idx % len(designs)])
+        model['name'] = "Ship {}".format(idx)
+        yield model
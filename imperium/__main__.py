@@ -0,0 +1,9 @@
+"""
+@file __main__.py
+
+Runs the imperium-shipyard front door with python -m imperium
+"""
+from imperium.cli import main
+
+if __name__ == '__main__':
+    raise SystemExit(main())
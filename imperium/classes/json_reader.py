@@ -3,21 +3,60 @@ json_reader.py
 
 Provides json file from the resources directory
 """
+from imperium import instrument
+import hashlib
 import json
 import os.path
 
 
+# Parsed resource files, keyed by path with the (mtime, size) they were parsed at
+_cache = dict()
+
+
 def get_file_data(filename):
     """
     Parses the filename given, grabs the corresponding .json file, and converts it into a
     Python-usable dictionary
+    Parsed files are cached until they change on disk, so the dictionary is shared between
+    callers and must be treated as read-only
     :param filename: The name of the file to get
     :return: Dictionary of the converted .json file
     """
-    data = None
+    if instrument.ENABLED:
+        instrument.count("catalog.get_file_data")
+
     my_path = os.path.abspath(os.path.dirname(__file__))
     path = os.path.join(my_path, "../resources/" + filename)
+
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
     with open(path) as f:
         data = json.load(f)
 
+    if instrument.ENABLED:
+        instrument.count("catalog.parsed." + filename)
+        instrument.count("catalog.bytes." + filename, stat.st_size)
+    _cache[path] = (version, data)
     return data
+
+
+def get_catalog_digest():
+    """
+    Hashes the contents of every .json file in the resources directory, giving a fingerprint
+    that changes whenever a part is added or altered
+    :return: hex digest of the resource files
+    """
+    digest = hashlib.sha1()
+    my_path = os.path.abspath(os.path.dirname(__file__))
+    path = os.path.join(my_path, "../resources/")
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith(".json"):
+            digest.update(filename.encode())
+            with open(os.path.join(path, filename), 'rb') as f:
+                digest.update(f.read())
+
+    return digest.hexdigest()
@@ -6,6 +6,10 @@ Houses the spacecraft class
 from imperium.classes.config import Config
 from imperium.classes.sensors import Sensor
 from imperium.classes.json_reader import get_file_data
+from imperium import instrument
+
+# Sections of Spacecraft.get_components, in the order they are listed
+COMPONENT_SECTIONS = ("hull", "drives", "options", "screens", "armour", "computer", "software", "misc", "hardpoints")
 
 
 class Spacecraft:
@@ -15,6 +19,7 @@ class Spacecraft:
     :param hull_tonnage: the size of the hull, in tons
     """
     def __init__(self, hull_tonnage):
+        self.name               = "Ship" # name of the design
         self.tonnage            = 0 # total tonnage of ship
         self.discount           = 1 # discount factor for the cost
         self.hull_hp            = 0 # calculated as 1 per 50 tonnage
@@ -69,18 +74,20 @@ class Spacecraft:
         # set sensors to standard
         self.sensors = Sensor("Standard")
 
+    @instrument.timed("spacecraft.get_total_cost")
     def get_total_cost(self):
         """
         Gets total cost of all objects for the ship
         :return: total cost
         """
         cost_total = 0
+        hull_cost = 0
+        if self.tonnage != 0:
+            hull_cost = get_file_data("hull_data.json").get(self.hull_designation).get("cost")
 
         # Tonnage / Bridge
         if self.tonnage != 0:
-            ton = get_file_data("hull_data.json")
-            cost = ton.get(self.hull_designation).get("cost")
-            cost_total += cost * self.hull_type.mod_hull_cost
+            cost_total += hull_cost * self.hull_type.mod_hull_cost
         if self.bridge is True:
             cost_total += self.tonnage * .005
 
@@ -103,9 +110,7 @@ class Spacecraft:
         # Armour
         for armour_item in self.armour:
             percent = armour_item.cost_by_hull_percentage
-            ton = get_file_data("hull_data.json")
-            cost = ton.get(self.hull_designation).get("cost")
-            cost_total += percent * cost
+            cost_total += percent * hull_cost
 
         # Sensors
         if self.sensors is not None:
@@ -135,6 +140,7 @@ class Spacecraft:
 
         return cost_total
 
+    @instrument.timed("spacecraft.get_remaining_cargo")
     def get_remaining_cargo(self):
         """
         Calculates the remaining cargo for the ship
@@ -179,6 +185,141 @@ class Spacecraft:
 
         return round(cargo, 2)
 
+    def get_stats(self):
+        """
+        Gathers the headline stats of the ship, used for listings and searching designs
+        :return: dictionary of stat names to values
+        """
+        return {
+            "tonnage": self.tonnage,
+            "cost": round(self.get_total_cost(), 3),
+            "cargo": self.get_remaining_cargo(),
+            "fuel": self.fuel_max,
+            "fuel_jump": self.fuel_jump,
+            "jump": self.jump,
+            "thrust": self.thrust,
+            "armour": self.armour_total,
+            "hardpoints": len(self.hardpoints),
+            "hull_hp": self.hull_hp,
+            "structure_hp": self.structure_hp
+        }
+
+    def get_components(self, sections=None):
+        """
+        Lists every part of the ship keyed by (section, key), with its value and its share of the
+        ship's cost, cargo and fuel. The shares sum to get_total_cost and get_remaining_cargo, the
+        discount being its own entry
+        :param sections: sections of COMPONENT_SECTIONS to list, None for all of them. The discount
+                         depends on every other section, so is only listed along with all of them
+        :return: dictionary of (section, key) to dictionaries of value, cost, cargo and fuel
+        """
+        components = dict()
+
+        def add(section, key, value, cost=0, cargo=0, fuel=0):
+            components[(section, key)] = {"value": value, "cost": cost, "cargo": cargo, "fuel": fuel}
+
+        def wanted(section):
+            return sections is None or section in sections
+
+        hull_cost = 0
+        if self.tonnage != 0:
+            hull_cost = get_file_data("hull_data.json").get(self.hull_designation).get("cost")
+
+        # Hull, split into its base cost and the extra for its configuration
+        if wanted("hull"):
+            add("hull", "tonnage", self.tonnage, hull_cost, self.tonnage)
+            add("hull", "type", self.hull_type.type, hull_cost * (self.hull_type.mod_hull_cost - 1))
+            if self.bridge is True:
+                add("hull", "bridge", True, self.tonnage * .005, -self.get_bridge_tonnage())
+            if self.fuel_scoop is True:
+                add("hull", "fuel_scoop", True, 1 if self.hull_type.type != "Streamlined" else 0)
+            add("hull", "fuel", self.fuel_max, 0, -self.fuel_max, self.fuel_max)
+            if self.sensors is not None:
+                add("hull", "sensors", self.sensors.name, self.sensors.cost, -self.sensors.tonnage)
+
+        # Drives
+        if wanted("drives"):
+            if self.jdrive is not None:
+                add("drives", "jdrive", self.jdrive.drive_type, self.jdrive.cost, -self.jdrive.tonnage,
+                    self.fuel_jump)
+            if self.mdrive is not None:
+                add("drives", "mdrive", self.mdrive.drive_type, self.mdrive.cost, -self.mdrive.tonnage)
+            if self.pplant is not None:
+                add("drives", "pplant", self.pplant.type, self.pplant.cost, -self.pplant.tonnage,
+                    self.pplant.fuel_two_weeks)
+
+        # Hull options / Screens
+        if wanted("options"):
+            for opt in self.hull_options:
+                add("options", opt.name, True, self.tonnage * opt.cost_per_hull_ton)
+        if wanted("screens"):
+            for screen in self.screens:
+                add("screens", screen.name, True, screen.cost, -screen.tonnage)
+
+        # Armour, counted by type
+        if wanted("armour"):
+            for armour_item in self.armour:
+                entry = components.get(("armour", armour_item.type))
+                if entry is None:
+                    add("armour", armour_item.type, 0)
+                    entry = components[("armour", armour_item.type)]
+                entry['value'] += 1
+                entry['cost'] += armour_item.cost_by_hull_percentage * hull_cost
+                entry['cargo'] -= int(self.tonnage * armour_item.hull_amount)
+
+        # Computer / Software
+        if wanted("computer") and self.computer is not None:
+            add("computer", "computer", {
+                "model": self.computer.model,
+                "jump_control_spec": self.computer.bis,
+                "hardened_system": self.computer.fib
+            }, self.computer.get_cost())
+        if wanted("software"):
+            for software in self.software:
+                add("software", software.type, software.level, software.cost)
+
+        # Misc
+        if wanted("misc"):
+            for misc in self.misc:
+                if misc.name == "Repair Drones":
+                    add("misc", misc.name, misc.num, 0.2 * (misc.tonnage * self.tonnage),
+                        -misc.tonnage * self.tonnage)
+                else:
+                    add("misc", misc.name, misc.num, misc.cost, -misc.tonnage)
+
+        # Discount applies to everything so far
+        if sections is None:
+            add("hull", "discount", self.discount, self.get_discount_cost(components))
+
+        # Turrets / Bayweapons (after discount because its included)
+        if wanted("hardpoints"):
+            for hardpoint in self.hardpoints:
+                turret = hardpoint.turret
+                if turret is not None:
+                    turret = {
+                        "type": turret.name,
+                        "weapons": [wep.get("name") if wep is not None else None for wep in turret.weapons],
+                        "missiles": dict(turret.missiles),
+                        "sandcaster_barrels": turret.sandcaster_barrels
+                    }
+                add("hardpoints", hardpoint.id, {
+                    "popup": hardpoint.popup,
+                    "fixed": hardpoint.fixed,
+                    "turret": turret
+                }, hardpoint.get_cost(), -hardpoint.get_tonnage())
+
+        return components
+
+    def get_discount_cost(self, components):
+        """
+        Prices the discount, which applies to every part but the hardpoints
+        :param components: component map holding at least every section but the hardpoints
+        :return: cost of the discount, negative for a saving
+        """
+        subtotal = sum(entry['cost'] for (section, key), entry in components.items()
+                       if section != "hardpoints" and (section, key) != ("hull", "discount"))
+        return subtotal * (self.discount - 1)
+
     def set_tonnage(self, new_tonnage):
         """
         Sets the tonnage of an existing Spacecraft
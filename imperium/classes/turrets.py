@@ -72,6 +72,48 @@ class Turret:
             wep = self.data.get("weapons").get(part)
         self.weapons[idx] = wep
 
+    def load_weapon(self, ref, idx):
+        """
+        Handles setting a weapon read from a saved file, where it is stored by its catalog name or,
+        in older files, as a full copy of its catalog entry. Copies are swapped for the current
+        catalog entry, keeping the copy only if the weapon is no longer in the catalog
+        :param ref: weapon name, weapon dictionary or None
+        :param idx: index of the weapon slot
+        """
+        if self.name == "Bay Weapon":
+            catalog = self.data.get("bayweapons")
+        else:
+            catalog = self.data.get("weapons")
+
+        if ref is None:
+            wep = None
+        elif isinstance(ref, dict):
+            wep = catalog.get(ref.get("name"), ref)
+        else:
+            wep = catalog.get(ref)
+            if wep is None:
+                print("Error: unknown weapon {} on {}".format(ref, self.name))
+        self.weapons[idx] = wep
+
+    def weapon_refs(self):
+        """
+        Handles getting the weapons as they are saved, by catalog name, or as a full copy for a weapon
+        kept from an older file that is no longer in the catalog
+        :return: list of weapon names, weapon dictionaries or None for empty slots
+        """
+        if self.name == "Bay Weapon":
+            catalog = self.data.get("bayweapons")
+        else:
+            catalog = self.data.get("weapons")
+
+        refs = list()
+        for wep in self.weapons:
+            if wep is not None and catalog.get(wep.get("name")) is wep:
+                refs.append(wep.get("name"))
+            else:
+                refs.append(wep)
+        return refs
+
     def modify_missile_ammo(self, type, num):
         if type in self.missiles.keys():
             self.missiles[type] = num
@@ -0,0 +1,107 @@
+"""
+@file cli.py
+
+Front door of the imperium-shipyard program. Each subcommand's module is only imported once that
+subcommand is chosen, so the headless tools never import PyQt5 and only the GUI pays for it
+
+Usage:
+    python -m imperium [--profile[=cprofile|sample]] [--profile-out PREFIX] [command] [args]
+    python -m imperium [gui]
+    python -m imperium <list|diff|migrate|validate|stream|render|scenario> [args]
+"""
+import sys
+
+# Subcommand name to the module whose main(argv) runs it, and its help line
+COMMANDS = {
+    "gui": ("imperium.gui.window", "open the shipyard window (the default)"),
+    "list": ("imperium.shipyard.header", "list the SRD files in a directory with their stats"),
+    "diff": ("imperium.shipyard.diff", "diff two SRD files, libraries or archives"),
+    "migrate": ("imperium.shipyard.migrate", "migrate SRD files to the current schema"),
+    "validate": ("imperium.shipyard.jobs", "check SRD files load without rewriting them"),
+    "stream": ("imperium.shipyard.stream", "export or import fleets as JSON lines"),
+    "render": ("imperium.gui.specsheet", "render spec sheets of SRD files as PNG or PDF"),
+    "scenario": ("imperium.scenarios", "run a scripted session, such as for profiling"),
+}
+
+
+def usage():
+    """
+    Builds the help text listing every subcommand
+    :return: help text
+    """
+    lines = ["usage: python -m imperium [options] [command] [args]", "", "commands:"]
+    for name, (_, description) in COMMANDS.items():
+        lines.append("  {:<10} {}".format(name, description))
+    lines += ["", "options:",
+              "  --profile[=MODE]      run the command under cProfile (the default) or the sampling profiler",
+              "  --profile-out PREFIX  path the profile is written to, less its extension"]
+    return "\n".join(lines)
+
+
+def split_options(argv):
+    """
+    Takes the profiling options off the front of the arguments
+    :param argv: command line arguments
+    :return: tuple of (profile mode or None, output prefix or None, remaining arguments)
+    """
+    mode = output = None
+    argv = list(argv)
+    while argv and argv[0].startswith("--profile"):
+        option = argv.pop(0)
+        if option == "--profile":
+            mode = "cprofile"
+        elif option.startswith("--profile="):
+            mode = option.split("=", 1)[1]
+        elif option == "--profile-out" and argv:
+            output = argv.pop(0)
+        elif option.startswith("--profile-out="):
+            output = option.split("=", 1)[1]
+        else:
+            raise ValueError("Error: unknown option '{}'".format(option))
+    return mode, output, argv
+
+
+def main(argv=None, command=None):
+    """
+    Runs the subcommand named by the first argument, opening the GUI when there is none
+    Parsing is left to the subcommand so that asking for help doesn't import the others
+    :param argv: command line arguments, defaults to sys.argv[1:]
+    :param command: subcommand to run, taking every argument after the profiling options as its own
+    :return: exit code of the subcommand
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    try:
+        mode, output, argv = split_options(argv)
+    except ValueError as error:
+        print("{}\n\n{}".format(error, usage()), file=sys.stderr)
+        return 2
+
+    if command is None and argv and argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+
+    if command is not None:
+        name, args = command, argv
+    else:
+        name, args = (argv[0], argv[1:]) if argv else ("gui", [])
+    if name not in COMMANDS:
+        print("Error: unknown command '{}'\n\n{}".format(name, usage()), file=sys.stderr)
+        return 2
+
+    # __import__ rather than importlib so the subcommand shows up under python -X importtime
+    module = __import__(COMMANDS[name][0], fromlist=["main"])
+    if name == "gui":
+        # Qt takes the program name as its first argument
+        args = [sys.argv[0]] + args
+    if mode is None:
+        return module.main(args)
+
+    # Imported only when asked for, like the subcommands
+    from imperium.profiling import PROFILE_MODES, profile_call
+    if mode not in PROFILE_MODES:
+        print("Error: unknown profile mode '{}', expected one of {}".format(mode, ", ".join(PROFILE_MODES)),
+              file=sys.stderr)
+        return 2
+    return profile_call(lambda: module.main(args), mode, output or "profile-{}".format(name))
@@ -0,0 +1,10 @@
+"""
+@file __init__.py
+
+PyQt5 frontend of the shipyard. Nothing outside this package imports PyQt5, so the headless tools
+in imperium.shipyard start without it
+"""
+import time
+
+# Start of the startup trace, taken when the GUI is first imported and before PyQt5 is
+STARTED = time.perf_counter()
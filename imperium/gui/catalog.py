@@ -0,0 +1,169 @@
+"""
+@file catalog.py
+
+Item models of the parts catalog, built once from the resource files and shared by every combo box
+listing them, so opening a panel or adding a part never reads the catalog again
+"""
+from imperium.classes.json_reader import get_file_data
+
+from PyQt5.QtCore import Qt, QObject, QSortFilterProxyModel, QStringListModel
+from PyQt5.QtGui import QStandardItem, QStandardItemModel
+
+# Item data role holding the tech level of a catalog entry, None for entries without one
+TL_ROLE = Qt.UserRole + 1
+
+# Shared models by name, with the resource file and section they list and the blank item leading them
+MODELS = {
+    "hull_config": ("hull_config.json", None, None),
+    "sensors":     ("hull_sensors.json", None, None),
+    "armour":      ("hull_armor.json", None, "---"),
+    "computers":   ("hull_computer.json", None, "---"),
+    "software":    ("hull_software.json", None, "---"),
+    "misc":        ("hull_misc.json", None, " "),
+    "turrets":     ("hull_turrets.json", "models", "---"),
+    "weapons":     ("hull_turrets.json", "weapons", "---"),
+    "bayweapons":  ("hull_turrets.json", "bayweapons", "---"),
+}
+
+# The catalog shared by every window, built on first use
+_catalog = None
+
+
+def get_catalog():
+    """
+    Gets the shared catalog, building it the first time it is asked for
+    :return: Catalog object
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
+
+
+def entry_tl(entry):
+    """
+    Gets the tech level of a catalog entry, being the lowest of its levels for software
+    :param entry: catalog entry dictionary
+    :return: tech level, or None if the entry has none
+    """
+    if not isinstance(entry, dict):
+        return None
+    if "tl" in entry:
+        return entry.get("tl")
+
+    levels = [level.get("tl") for level in entry.values() if isinstance(level, dict) and "tl" in level]
+    return min(levels) if levels else None
+
+
+class CatalogFilter(QSortFilterProxyModel):
+    """
+    View of a shared catalog model hiding the entries above a tech level, and any entries named
+    as excluded, such as the parts already on a ship
+
+    :param source: shared catalog model
+    :param tl: highest tech level shown, or None to show every level
+    """
+    def __init__(self, source, tl=None, parent=None):
+        super(CatalogFilter, self).__init__(parent)
+        self.tl       = tl
+        self.excluded = set()
+        self.setSourceModel(source)
+
+    def set_tl(self, tl):
+        """
+        Changes the highest tech level shown
+        :param tl: tech level, or None to show every level
+        """
+        if tl != self.tl:
+            self.tl = tl
+            self.invalidateFilter()
+
+    def set_excluded(self, names):
+        """
+        Changes the entries hidden by name, leaving the filter alone if they are unchanged
+        :param names: iterable of entry names
+        """
+        names = set(names)
+        if names != self.excluded:
+            self.excluded = names
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, row, parent):
+        index = self.sourceModel().index(row, 0, parent)
+        if index.data() in self.excluded:
+            return False
+
+        tl = index.data(TL_ROLE)
+        return self.tl is None or tl is None or tl <= self.tl
+
+
+class Catalog(QObject):
+    """
+    Item models for every list of parts the window offers, built once from the resource files.
+    Models are shared between combo boxes and must not be edited through them
+    """
+    def __init__(self, parent=None):
+        super(Catalog, self).__init__(parent)
+        self.models  = dict()
+        self.entries = dict()
+        self.filters = dict()
+
+        for name, (filename, section, blank) in MODELS.items():
+            data = get_file_data(filename)
+            if section is not None:
+                data = data.get(section)
+
+            self.entries[name] = list(data.keys())
+            self.models[name]  = self.build_model([(key, entry_tl(entry)) for key, entry in data.items()], blank)
+
+        tonnages = [str(item.get('tonnage')) for item in get_file_data("hull_data.json").values()]
+        self.models["tonnage"] = self.build_model([(tonnage, None) for tonnage in tonnages])
+
+        # Levels each piece of software comes in, and the level it is installed at
+        self.levels      = dict()
+        self.base_levels = dict()
+        for name, levels in get_file_data("hull_software.json").items():
+            levels = [level for level in levels.keys() if level != "mod_additional"]
+            self.levels[name]      = QStringListModel(levels, self)
+            self.base_levels[name] = min(int(level) for level in levels)
+
+    def build_model(self, items, blank=None):
+        """
+        Builds a read-only item model of catalog entries
+        :param items: list of (name, tech level) tuples
+        :param blank: item leading the list for choosing nothing, if any
+        :return: QStandardItemModel
+        """
+        model = QStandardItemModel(self)
+        if blank is not None:
+            items = [(blank, None)] + items
+
+        for name, tl in items:
+            item = QStandardItem(name)
+            item.setEditable(False)
+            item.setData(tl, TL_ROLE)
+            model.appendRow(item)
+        return model
+
+    def model(self, name, tl=None):
+        """
+        Gets a shared model, or a shared view of it limited to a tech level
+        :param name: name of the model, a key of MODELS or "tonnage"
+        :param tl: highest tech level listed, or None to list every entry
+        :return: QStandardItemModel, or CatalogFilter over it
+        """
+        if tl is None:
+            return self.models[name]
+
+        key = (name, tl)
+        if key not in self.filters:
+            self.filters[key] = CatalogFilter(self.models[name], tl, self)
+        return self.filters[key]
+
+    def names(self, name):
+        """
+        Gets the entries a shared model lists, without its blank item
+        :param name: name of the model
+        :return: list of entry names
+        """
+        return self.entries[name]
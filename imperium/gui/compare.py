@@ -0,0 +1,249 @@
+"""
+@file compare.py
+
+Dockable comparison of the ship being edited against a few pinned reference ships, showing their
+stats side by side and the parts that differ. Reference ships are broken down once when pinned,
+and the edited ship is kept in a ComponentCache so an edit only lists the parts it touched again
+"""
+from imperium.classes.spacecraft import COMPONENT_SECTIONS
+from imperium.shipyard.compression import srd_stem
+from imperium.shipyard.diff import DIFF_STATS, ComponentCache
+from imperium.shipyard.fileloader import FileLoader
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QAbstractItemView, QDockWidget, QHeaderView, QTableView
+
+# Most reference ships pinned beside the ship being edited
+COMPARE_LIMIT = 3
+
+
+def describe(value):
+    """
+    Formats the value of a component for a table cell
+    :param value: value from a component map
+    :return: short text
+    """
+    if value is None:
+        return "-"
+    if value is True:
+        return "Yes"
+    if isinstance(value, dict) and "turret" in value:
+        turret = value['turret']
+        if turret is None:
+            return "Empty"
+        return "{}: {}".format(turret['type'], ", ".join(wep or "-" for wep in turret['weapons']))
+    if isinstance(value, dict):
+        return value.get('model', "-") + "".join(" +" + key for key, flag in value.items() if flag is True)
+    return str(value)
+
+
+def section_parts(components, section):
+    """
+    Gets the parts of one section of a component map, keying hardpoints by their position since
+    their ids differ from ship to ship
+    :param components: component map from Spacecraft.get_components
+    :param section: section name
+    :return: dictionary of keys to component entries
+    """
+    parts = {key: entry for key, entry in components.items() if key[0] == section}
+    if section == "hardpoints":
+        return {(section, str(number)): entry for number, entry in enumerate(parts.values(), 1)}
+    return parts
+
+
+class ComparisonModel(QAbstractTableModel):
+    """
+    Table with a row per stat and per differing part, and a column for the edited ship followed by
+    one per reference ship. Which parts differ is worked out per section, so a refresh only compares
+    the sections an edit changed
+    """
+    def __init__(self, parent=None):
+        super(ComparisonModel, self).__init__(parent)
+        self.references = list()    # (name, stats, sections) of each reference ship
+        self.stats      = dict()    # stats of the edited ship
+        self.sections   = {section: dict() for section in COMPONENT_SECTIONS}   # parts of the edited ship
+        self.differing  = {section: list() for section in COMPONENT_SECTIONS}   # keys of the parts that differ
+        self.rows       = list()    # ("stat", name) or ("part", (section, key)) per row
+
+    def set_references(self, references):
+        """
+        Replaces the reference ships, comparing every section again
+        :param references: list of (name, stats, component map) tuples
+        """
+        self.beginResetModel()
+        self.references = [(name, stats, {section: section_parts(components, section) for section in COMPONENT_SECTIONS})
+                           for name, stats, components in references]
+        for section in COMPONENT_SECTIONS:
+            self.compare(section)
+        self.rows = self.list_rows()
+        self.endResetModel()
+
+    def update(self, stats, components, sections):
+        """
+        Takes in the edited ship's latest stats and parts, comparing only the sections given
+        :param stats: stats dictionary of the edited ship
+        :param components: component map of the edited ship
+        :param sections: sections listed again since the last update
+        """
+        self.stats = stats
+        for section in sections:
+            self.sections[section] = section_parts(components, section)
+
+        # The discount is repriced every time, but only its rate is compared
+        self.sections["hull"][("hull", "discount")] = components[("hull", "discount")]
+        for section in set(sections) | {"hull"}:
+            self.compare(section)
+
+        rows = self.list_rows()
+        if rows != self.rows:
+            self.beginResetModel()
+            self.rows = rows
+            self.endResetModel()
+        elif rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(rows) - 1, self.columnCount() - 1))
+
+    def compare(self, section):
+        # Finds the parts of a section that differ between the edited ship and any reference
+        current = self.sections[section]
+        keys = set(current)
+        for _, _, sections in self.references:
+            keys.update(sections[section])
+
+        def value(parts, key):
+            entry = parts.get(key)
+            return entry['value'] if entry is not None else None
+
+        self.differing[section] = sorted(
+            (key for key in keys if any(value(current, key) != value(sections[section], key)
+                                        for _, _, sections in self.references)), key=str)
+
+    def list_rows(self):
+        # Stats first, then the differing parts in section order
+        rows = [("stat", stat) for stat in DIFF_STATS]
+        for section in COMPONENT_SECTIONS:
+            rows.extend(("part", key) for key in self.differing[section])
+        return rows
+
+    def cell(self, row, column):
+        """
+        Gets the text of a cell and whether it differs from the edited ship's
+        :param row: row key
+        :param column: 1 for the edited ship, then one per reference
+        :return: (text, differs) tuple
+        """
+        kind, key = row
+        if kind == "stat":
+            current = self.stats.get(key)
+            if column == 1:
+                return str(current), False
+
+            value = self.references[column - 2][1][key]
+            if current is None or value == current:
+                return str(value), False
+            return "{} ({:+g})".format(value, round(value - current, 3)), True
+
+        current = self.sections[key[0]].get(key)
+        parts = self.sections if column == 1 else self.references[column - 2][2]
+        entry = parts[key[0]].get(key)
+        text = describe(entry['value'] if entry is not None else None)
+        if column == 1:
+            return text, False
+        return text, (entry['value'] if entry is not None else None) != (current['value'] if current else None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2 + len(self.references)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self.rows[index.row()]
+        if index.column() == 0:
+            if role == Qt.DisplayRole:
+                kind, key = row
+                return key.capitalize() if kind == "stat" else "{}: {}".format(key[0].capitalize(), key[1])
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.cell(row, index.column())[0]
+        if role == Qt.FontRole and self.cell(row, index.column())[1]:
+            font = QFont()
+            font.setBold(True)
+            return font
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or orientation != Qt.Horizontal:
+            return None
+        if section == 0:
+            return ""
+        if section == 1:
+            return "This Ship"
+        return self.references[section - 2][0]
+
+
+class ComparisonPanel(QDockWidget):
+    """
+    Dock comparing the edited ship with up to COMPARE_LIMIT reference ships. The window hands it the
+    sections each refresh changed; while the dock is closed they are only noted, and listed once it
+    is shown again
+    """
+    def __init__(self, parent=None):
+        super(ComparisonPanel, self).__init__("Compare", parent)
+        self.fileloader = FileLoader()
+        self.cache      = None      # ComponentCache of the edited ship
+        self.model      = ComparisonModel(self)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.verticalHeader().hide()
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.setWidget(self.view)
+
+    def set_references(self, paths):
+        """
+        Pins reference ships, breaking each down once
+        :param paths: list of SRD file paths, at most COMPARE_LIMIT
+        """
+        if len(paths) > COMPARE_LIMIT:
+            raise ValueError("Error: at most {} ships can be compared at once".format(COMPARE_LIMIT))
+
+        references = list()
+        for path in paths:
+            spacecraft = self.fileloader.load_spacecraft(path)
+            name = spacecraft.name if spacecraft.name != "Ship" else srd_stem(path)
+            references.append((name, spacecraft.get_stats(), spacecraft.get_components()))
+        self.model.set_references(references)
+
+    def refresh(self, spacecraft, sections):
+        """
+        Notes the sections of the edited ship that changed, comparing them straight away if shown
+        :param spacecraft: spacecraft object being edited
+        :param sections: sections of Spacecraft.get_components changed since the last refresh
+        """
+        if self.cache is None:
+            self.cache = ComponentCache(spacecraft)
+        elif self.cache.spacecraft is not spacecraft:
+            self.cache.set_spacecraft(spacecraft)
+        else:
+            self.cache.invalidate(sections)
+
+        if self.isVisible():
+            self.update_view()
+
+    def update_view(self):
+        # Lists again the sections changed so far and updates the table
+        if self.cache is None:
+            return
+        components, listed = self.cache.components()
+        self.model.update(self.cache.stats(components), components, listed)
+
+    def showEvent(self, event):
+        # Catches up on the edits made while the dock was closed
+        super(ComparisonPanel, self).showEvent(event)
+        self.update_view()
@@ -0,0 +1,218 @@
+"""
+@file fleet.py
+
+Dockable browser over a whole ship library, a folder of .srd files or a fleet archive. Designs are
+listed from precomputed columns and sorted and filtered on the thread pool, so the table stays
+responsive with hundreds of thousands of ships
+"""
+from imperium.shipyard.jobs import FLEET_STATS, order_rows, scan_fleet
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtWidgets import (QAbstractItemView, QDockWidget, QHeaderView, QLineEdit, QTableView,
+                             QVBoxLayout, QWidget)
+
+# Milliseconds the filter text must settle for before the fleet is filtered again
+FILTER_DELAY = 150
+
+
+def order_job(*args):
+    # Runs order_rows as a job of one step, for a Worker
+    yield order_rows(*args)
+
+
+class FleetModel(QAbstractTableModel):
+    """
+    Table of the designs in a fleet, held as one list per column rather than as objects. The rows
+    shown are a list of indices into the columns, worked out by order_rows on the thread pool
+    """
+    HEADERS = ["Name"] + [stat.capitalize() for stat in FLEET_STATS]
+
+    def __init__(self, parent=None):
+        super(FleetModel, self).__init__(parent)
+        self.columns = [list() for _ in self.HEADERS]
+        self.folded  = list()   # casefolded names, for filtering
+        self.sources = list()   # where each design is read from when opened
+        self.shown   = list()   # indices of the rows shown, in order
+        self.text    = ""       # filter text the shown rows match
+
+    def clear(self):
+        # Empties the table for another fleet
+        self.beginResetModel()
+        self.columns = [list() for _ in self.HEADERS]
+        self.folded  = list()
+        self.sources = list()
+        self.shown   = list()
+        self.endResetModel()
+
+    def append(self, results):
+        """
+        Adds a batch of designs from scan_fleet, showing those matching the filter at the end
+        :param results: list of (values, source) tuples
+        """
+        start = len(self.sources)
+        text = self.text.casefold()
+        for values, source in results:
+            for column, value in zip(self.columns, values):
+                column.append(value)
+            self.folded.append(values[0].casefold())
+            self.sources.append(source)
+
+        rows = [row for row in range(start, len(self.sources)) if text in self.folded[row]]
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.shown), len(self.shown) + len(rows) - 1)
+            self.shown.extend(rows)
+            self.endInsertRows()
+
+    def set_shown(self, rows, text):
+        """
+        Replaces the rows shown with an order from order_rows
+        :param rows: list of row indices
+        :param text: filter text the rows were matched against
+        """
+        self.beginResetModel()
+        self.shown = rows
+        self.text  = text
+        self.endResetModel()
+
+    def source(self, index):
+        # Where the design of a model index is read from
+        return self.sources[self.shown[index.row()]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.shown)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            value = self.columns[index.column()][self.shown[index.row()]]
+            return "-" if value is None else str(value)
+        if role == Qt.TextAlignmentRole and index.column() > 0:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
+class FleetBrowser(QDockWidget):
+    """
+    Dock listing a fleet, opening the design of a row in the editor when it is activated
+    Scanning, sorting and filtering run as jobs of the window, so they show in its status bar and
+    stop with Cancel Jobs
+
+    :param window: Window whose jobs run the browser's work and whose editor opens designs
+    """
+    def __init__(self, window):
+        super(FleetBrowser, self).__init__("Fleet", window)
+        self.shipyard = window
+        self.path     = None    # folder or archive browsed
+        self.scanner  = None    # Worker listing the fleet
+        self.orderer  = None    # Worker ordering the rows, only the latest one's order is shown
+        self.sort     = None    # column sorted by and whether descending
+        self.model    = FleetModel(self)
+
+        self.filter_line = QLineEdit()
+        self.filter_line.setPlaceholderText("Filter by name")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY)
+        self.filter_timer.timeout.connect(self.order)
+        self.filter_line.textChanged.connect(lambda: self.filter_timer.start())
+
+        # Fixed row heights so the view never measures rows it isn't showing
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        self.view.verticalHeader().hide()
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.horizontalHeader().setSortIndicatorShown(True)
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.view.horizontalHeader().sectionClicked.connect(self.sort_by)
+        self.view.activated.connect(self.open_row)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.filter_line)
+        layout.addWidget(self.view)
+        contents = QWidget()
+        contents.setLayout(layout)
+        self.setWidget(contents)
+
+    def browse(self, path):
+        """
+        Lists the designs of a folder or archive, replacing the fleet shown
+        :param path: folder of .srd files or fleet archive
+        :return: the Worker listing the fleet
+        """
+        for worker in (self.scanner, self.orderer):
+            if worker is not None:
+                worker.cancel()
+
+        self.path = path
+        self.orderer = None
+        self.model.clear()
+        self.setWindowTitle("Fleet - {}".format(path.rstrip('/').split('/')[-1]))
+
+        # Batches a cancelled scan still delivers are dropped
+        def listed(results):
+            if worker is self.scanner:
+                self.model.append(results)
+
+        def scanned(completed):
+            # Rows listed before a sort or filter was asked for are put in place once all are in
+            unordered = self.sort is not None or self.model.text != self.filter_line.text()
+            if worker is self.scanner and completed and unordered:
+                self.order()
+
+        worker = self.scanner = self.shipyard.start_job(scan_fleet, path, on_results=listed, on_finished=scanned)
+        return worker
+
+    def sort_by(self, column):
+        """
+        Sorts by a column, flipping the order when it is already sorted by
+        :param column: index of the column
+        """
+        descending = self.sort == (column, False)
+        self.sort = (column, descending)
+        self.view.horizontalHeader().setSortIndicator(column, Qt.DescendingOrder if descending else Qt.AscendingOrder)
+        self.order()
+
+    def order(self):
+        """
+        Sorts and filters the rows listed so far on the thread pool, showing the order once it is done
+        :return: the Worker ordering the rows
+        """
+        if self.orderer is not None:
+            self.orderer.cancel()
+
+        text = self.filter_line.text()
+        sort, descending = self.sort if self.sort is not None else (None, False)
+        # Orders finishing after a newer one was asked for are dropped
+        def ordered(results):
+            if worker is self.orderer:
+                self.model.set_shown(results[-1], text)
+
+        worker = self.orderer = self.shipyard.start_job(order_job, self.model.columns, self.model.folded,
+                                                        len(self.model.sources), sort, descending, text,
+                                                        on_results=ordered)
+        return worker
+
+    def open_row(self, index):
+        """
+        Opens the design of a row in the editor
+        :param index: model index of the row
+        """
+        if index.isValid():
+            self.shipyard.open_design(self.model.source(index))
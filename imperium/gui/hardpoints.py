@@ -0,0 +1,244 @@
+"""
+@file hardpoints.py
+
+Table model and delegates for editing the hardpoints and turrets of a ship
+"""
+from imperium.classes.json_reader import get_file_data
+from imperium.classes.turrets import Turret
+from imperium.gui.catalog import get_catalog
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtWidgets import QComboBox, QSpinBox, QStyledItemDelegate
+
+# Item data role under which the hardpoint model lists the options of a turret or weapon cell
+CHOICES_ROLE = Qt.UserRole + 1
+
+
+class HardpointModel(QAbstractTableModel):
+    """
+    Table model over the hardpoints of a spacecraft, one row per hardpoint holding its turret, weapons,
+    options and ammo. Edits are made straight to the hardpoint objects and only the cells they change
+    are reported to the views, which emit edited so the window can refresh its stats
+    """
+    edited = pyqtSignal()
+
+    # Fixed columns, followed by one per missile type and then SUFFIX
+    PREFIX = ["HP", "Turret", "Wep 1", "Wep 2", "Wep 3", "Pop-up", "Fixed"]
+    SUFFIX = ["Sandcaster", "Cost", "Tons"]
+
+    def __init__(self, spacecraft, parent=None):
+        super(HardpointModel, self).__init__(parent)
+        self.data_file  = get_file_data("hull_turrets.json")
+        self.missiles   = list(self.data_file.get("weapons").get("Missile Rack").get("types").keys())
+        self.columns    = self.PREFIX + ["{} Missiles".format(key) for key in self.missiles] + self.SUFFIX
+        self.spacecraft = spacecraft
+
+    def set_spacecraft(self, spacecraft):
+        """
+        Points the model at another ship
+        :param spacecraft: spacecraft object
+        """
+        self.beginResetModel()
+        self.spacecraft = spacecraft
+        self.endResetModel()
+
+    def column(self, name):
+        # Index of a column by its header
+        return self.columns.index(name)
+
+    def hardpoint(self, index):
+        # Hardpoint object of a model index
+        return self.spacecraft.hardpoints[index.row()]
+
+    def add_hardpoint(self, hardpoint):
+        """
+        Adds a hardpoint to the ship as the last row
+        :param hardpoint: hardpoint object
+        """
+        row = len(self.spacecraft.hardpoints)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.spacecraft.add_hardpoint(hardpoint)
+        self.endInsertRows()
+        self.edited.emit()
+
+    def remove_hardpoint(self, hardpoint):
+        """
+        Removes a hardpoint and its row from the ship
+        :param hardpoint: hardpoint object
+        """
+        for row, other in enumerate(self.spacecraft.hardpoints):
+            if other is hardpoint:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.spacecraft.remove_hardpoint(hardpoint)
+                self.endRemoveRows()
+                self.edited.emit()
+                return
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.spacecraft.hardpoints)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return section + 1
+
+    def choices(self, index):
+        """
+        Gets the options of a turret or weapon cell
+        :param index: model index
+        :return: shared catalog model of the options, or None if the cell isn't a choice
+        """
+        name = self.columns[index.column()]
+        if name == "Turret":
+            return get_catalog().model("turrets")
+
+        turret = self.hardpoint(index).turret
+        if name.startswith("Wep") and turret is not None:
+            return get_catalog().model("bayweapons" if turret.name == "Bay Weapon" else "weapons")
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        name = self.columns[index.column()]
+        turret = self.hardpoint(index).turret
+        is_bay = turret is not None and turret.name == "Bay Weapon"
+
+        if name == "Turret":
+            flags |= Qt.ItemIsEditable
+        elif turret is None:
+            pass
+        elif name.startswith("Wep") and int(name[4:]) <= turret.max_wep:
+            flags |= Qt.ItemIsEditable
+        elif name in ("Pop-up", "Fixed") and not is_bay:
+            flags |= Qt.ItemIsUserCheckable
+        elif name.endswith("Missiles") or (name == "Sandcaster" and not is_bay):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        hardpoint = self.hardpoint(index)
+        turret = hardpoint.turret
+        name = self.columns[index.column()]
+
+        if role == CHOICES_ROLE:
+            return self.choices(index)
+
+        if role == Qt.CheckStateRole:
+            if name == "Pop-up":
+                return Qt.Checked if hardpoint.popup else Qt.Unchecked
+            if name == "Fixed":
+                return Qt.Checked if hardpoint.fixed else Qt.Unchecked
+            return None
+
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+
+        if name == "HP":
+            return hardpoint.id
+        if name == "Turret":
+            return turret.name if turret is not None else "---"
+        if name == "Cost":
+            return round(hardpoint.get_cost(), 3)
+        if name == "Tons":
+            return round(hardpoint.get_tonnage(), 3)
+        if turret is None:
+            return None
+
+        if name.startswith("Wep"):
+            idx = int(name[4:]) - 1
+            if idx >= turret.max_wep:
+                return None
+            return turret.weapons[idx].get("name") if turret.weapons[idx] is not None else "---"
+        if name.endswith("Missiles"):
+            return turret.missiles.get(name[:-9])
+        if name == "Sandcaster":
+            return turret.sandcaster_barrels if turret.name != "Bay Weapon" else None
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or not self.flags(index) & (Qt.ItemIsEditable | Qt.ItemIsUserCheckable):
+            return False
+
+        hardpoint = self.hardpoint(index)
+        name = self.columns[index.column()]
+        first, last = index.column(), index.column()
+
+        if role == Qt.CheckStateRole:
+            checked = value == Qt.Checked
+            if (hardpoint.popup if name == "Pop-up" else hardpoint.fixed) == checked:
+                return False
+            hardpoint.modify_addon("Pop-up Turret" if name == "Pop-up" else "Fixed Mounting")
+        elif role != Qt.EditRole:
+            return False
+        elif name == "Turret":
+            if value == self.data(index):
+                return False
+            hardpoint.add_turret(Turret(value) if value != "---" else None)
+            first, last = 0, len(self.columns) - 1
+        elif name.startswith("Wep"):
+            if not self.choices(index).findItems(value):
+                return False
+            hardpoint.turret.modify_weapon(value, int(name[4:]) - 1)
+        else:
+            try:
+                num = int(value)
+            except (TypeError, ValueError):
+                return False
+            if num < 0:
+                return False
+            if name == "Sandcaster":
+                hardpoint.turret.modify_sandcaster_barrel(num)
+            else:
+                hardpoint.turret.modify_missile_ammo(name[:-9], num)
+
+        # The edited cells, then the cost and tonnage of the row
+        row = index.row()
+        self.dataChanged.emit(self.index(row, first), self.index(row, last))
+        self.dataChanged.emit(self.index(row, self.column("Cost")), self.index(row, self.column("Tons")))
+        self.edited.emit()
+        return True
+
+
+class ChoiceDelegate(QStyledItemDelegate):
+    """ Edits turret and weapon cells with a combo box of the options the model gives for the cell """
+    def createEditor(self, parent, option, index):
+        choices = index.data(CHOICES_ROLE)
+        if not choices:
+            return None
+
+        editor = QComboBox(parent)
+        editor.setModel(choices)
+        editor.activated.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.EditRole) or "---")
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+
+class AmmoDelegate(QStyledItemDelegate):
+    """ Edits missile and sandcaster cells with a spin box that can't go below zero """
+    def createEditor(self, parent, option, index):
+        editor = QSpinBox(parent)
+        editor.setRange(0, 999)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setValue(index.data(Qt.EditRole) or 0)
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.EditRole)
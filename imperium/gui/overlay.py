@@ -0,0 +1,62 @@
+"""
+@file overlay.py
+
+Live view of the instrumentation counters and timers, floating over the window while
+IMPERIUM_INSTRUMENT is set
+"""
+from imperium import instrument
+
+from PyQt5.QtCore import Qt, QEvent, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QLabel, QShortcut
+
+# Milliseconds between refreshes of the overlay
+OVERLAY_INTERVAL = 500
+
+# Most timers and counters listed, slowest and largest first
+OVERLAY_ROWS = 10
+
+
+class InstrumentOverlay(QLabel):
+    """
+    Translucent table of the instrumentation totals in the top right corner of the window, kept there
+    as the window resizes. Ctrl+Shift+I hides and shows it
+
+    :param window: QMainWindow to float over
+    """
+    def __init__(self, window):
+        super(InstrumentOverlay, self).__init__(window)
+        self.window_ = window
+        self.setFont(QFont("Monospace", 8))
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: white; padding: 6px;")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextInteractionFlags(Qt.NoTextInteraction)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(OVERLAY_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+        self.shortcut = QShortcut("Ctrl+Shift+I", window)
+        self.shortcut.activated.connect(lambda: self.setVisible(not self.isVisible()))
+
+        window.installEventFilter(self)
+        self.refresh()
+
+    def refresh(self):
+        # Lists the totals as they stand, skipping the work while hidden
+        if self.isHidden():
+            return
+        self.setText("\n".join(instrument.format_report(instrument.snapshot(), OVERLAY_ROWS)))
+        self.adjustSize()
+        self.place()
+        self.raise_()
+
+    def place(self):
+        # Keeps the overlay in the top right corner, below the menu bar
+        self.move(max(0, self.window_.width() - self.width() - 8), self.window_.menuBar().height() + 8)
+
+    def eventFilter(self, watched, event):
+        if watched is self.window_ and event.type() == QEvent.Resize:
+            self.place()
+        return False
@@ -0,0 +1,388 @@
+"""
+@file specsheet.py
+
+Headless rendering of ship spec sheets to PNG or PDF, with the stats, drives, hardpoints and cost
+breakdown of a design. Libraries are rendered on a pool of worker processes, each with its own
+offscreen QGuiApplication, and a manifest in the output directory records the design hash each
+sheet was drawn from so unchanged ships are skipped on later runs
+
+Usage:
+    python -m imperium.gui.specsheet <directory or file> [...] --out DIR [--format png|pdf] [--workers N] [--force]
+"""
+from imperium.classes.json_reader import get_catalog_digest
+from imperium.classes.spacecraft import COMPONENT_SECTIONS
+from imperium.shipyard.compression import open_file, srd_stem
+from imperium.shipyard.fileloader import DECODER, ENCODER, FileLoader, atomic_write
+from imperium.shipyard.header import read_header
+from imperium.shipyard.migrate import find_files
+from imperium.shipyard.schema import hash_model, upgrade
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+
+from PyQt5.QtCore import Qt, QMarginsF, QRectF
+from PyQt5.QtGui import QColor, QFont, QGuiApplication, QImage, QPageLayout, QPageSize, QPainter, QPdfWriter
+
+# Version of the sheet layout, part of every cache key so changing the layout renders sheets again
+SPEC_VERSION = 1
+
+# File formats sheets are rendered to
+FORMATS = ("png", "pdf")
+
+# Manifest of output file names to the cache key each was rendered from
+MANIFEST = "specsheets.json"
+
+# Results of rendering a single design, alongside error messages
+RENDERED = "rendered"
+CACHED = "cached"
+
+# Sheet geometry in pixels, being A4 at 150 dpi
+SHEET_DPI = 150
+SHEET_WIDTH = 1240
+SHEET_HEIGHT = 1754
+MARGIN = 80
+LINE = 30
+
+# Sheets are black on white, so PNGs are drawn in grayscale and compressed a little less than the
+# default, which together encode about three times faster for files around half the size
+PNG_FORMAT = QImage.Format_Grayscale8
+PNG_QUALITY = 80
+
+# Tables of the sheet, with the heading, column headers and the share of the width each column takes
+DRIVE_COLUMNS = (("Drive", 0.4), ("Type", 0.2), ("Tons", 0.2), ("MCr", 0.2))
+HARDPOINT_COLUMNS = (("#", 0.08), ("Turret", 0.27), ("Weapons", 0.45), ("Mount", 0.1), ("MCr", 0.1))
+COST_COLUMNS = (("Section", 0.2), ("Part", 0.4), ("Tons", 0.2), ("MCr", 0.2))
+
+# Columns right aligned, holding numbers
+NUMERIC_COLUMNS = ("Tons", "MCr")
+
+# Drive components and their names on the sheet
+DRIVES = (("jdrive", "Jump Drive"), ("mdrive", "Manoeuvre Drive"), ("pplant", "Power Plant"))
+
+# The application of a worker process, created by get_app
+_app = None
+
+
+def get_app():
+    """
+    Gets the application painting needs, creating an offscreen QGuiApplication if there is none
+    Called once in each worker process as it starts
+    :return: QGuiApplication, or the QApplication already running
+    """
+    global _app
+    if QGuiApplication.instance() is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        _app = QGuiApplication([sys.argv[0]])
+    return QGuiApplication.instance()
+
+
+def format_number(value):
+    # Formats tons and credits without trailing zeros
+    return "{:g}".format(round(value, 3))
+
+
+def build_sheet(spacecraft, name=None):
+    """
+    Lays out the contents of a spec sheet, independent of how it is drawn
+    :param spacecraft: spacecraft object
+    :param name: name shown if the design has none of its own
+    :return: dictionary of the title, subtitle, stat pairs and tables of (heading, columns, rows)
+    """
+    components = spacecraft.get_components()
+    stats = spacecraft.get_stats()
+    title = spacecraft.name if spacecraft.name != "Ship" or name is None else name
+
+    drives = list()
+    for key, label in DRIVES:
+        entry = components.get(("drives", key))
+        if entry is not None and entry['value'] is not None:
+            drives.append([label, entry['value'], format_number(-entry['cargo']), format_number(entry['cost'])])
+
+    hardpoints = list()
+    for number, key in enumerate(key for key in components if key[0] == "hardpoints"):
+        entry = components[key]
+        turret = entry['value']['turret']
+        mount = "Popup" if entry['value']['popup'] else "Fixed" if entry['value']['fixed'] else ""
+        if turret is None:
+            hardpoints.append([str(number + 1), "Empty", "", mount, format_number(entry['cost'])])
+        else:
+            weapons = ", ".join(weapon or "-" for weapon in turret['weapons'])
+            hardpoints.append([str(number + 1), turret['type'], weapons, mount, format_number(entry['cost'])])
+
+    # Hardpoint ids mean nothing on paper, so they are numbered as in the hardpoint table
+    costs = list()
+    for section in COMPONENT_SECTIONS:
+        parts = [(key, entry) for key, entry in components.items() if key[0] == section]
+        for number, (key, entry) in enumerate(parts, 1):
+            if entry['cost'] or entry['cargo']:
+                part = "Hardpoint {}".format(number) if section == "hardpoints" else str(key[1])
+                tons = format_number(-entry['cargo']) if entry['cargo'] < 0 else ""
+                costs.append([section.capitalize(), part, tons, format_number(entry['cost'])])
+    costs.append(["Total", "", format_number(stats['tonnage'] - stats['cargo']), format_number(stats['cost'])])
+
+    return {
+        "title": title,
+        "subtitle": "{} ton {} hull".format(stats['tonnage'], components[("hull", "type")]['value']),
+        "stats": [("Tonnage", stats['tonnage']), ("Cost (MCr)", stats['cost']), ("Cargo", stats['cargo']),
+                  ("Fuel", stats['fuel']), ("Jump", stats['jump']), ("Thrust", stats['thrust']),
+                  ("Armour", stats['armour']), ("Hardpoints", stats['hardpoints']),
+                  ("Hull", stats['hull_hp']), ("Structure", stats['structure_hp'])],
+        "tables": [("Drives", DRIVE_COLUMNS, drives),
+                   ("Hardpoints", HARDPOINT_COLUMNS, hardpoints),
+                   ("Cost Breakdown", COST_COLUMNS, costs)]
+    }
+
+
+def paint_sheet(sheet, painter=None, width=SHEET_WIDTH, page_height=None, new_page=None):
+    """
+    Draws a spec sheet top to bottom, or only measures it when no painter is given
+    :param sheet: contents from build_sheet
+    :param painter: QPainter to draw with, None to measure
+    :param width: width of the page in pixels
+    :param page_height: height of a page in pixels, None for one page as long as the sheet
+    :param new_page: function starting another page, called when a page runs out
+    :return: height of the last page used
+    """
+    inner = width - 2 * MARGIN
+    y = MARGIN
+
+    def font(size, bold=False):
+        result = QFont("Sans")
+        result.setPixelSize(size)
+        result.setBold(bold)
+        return result
+
+    def text(x, w, value, size=18, bold=False, align=Qt.AlignLeft, lines=1):
+        if painter is not None:
+            painter.setFont(font(size, bold))
+            painter.drawText(QRectF(x, y, w, lines * LINE), align | Qt.AlignVCenter, str(value))
+
+    def space(lines):
+        # Starts a new page if the next lines won't fit on this one
+        nonlocal y
+        if page_height is not None and y + lines * LINE > page_height - MARGIN:
+            new_page()
+            y = MARGIN
+
+    text(MARGIN, inner, sheet['title'], size=40, bold=True, lines=2)
+    y += 2 * LINE
+    text(MARGIN, inner, sheet['subtitle'], size=20)
+    y += 2 * LINE
+
+    # Stats two to a row
+    for row in range(0, len(sheet['stats']), 2):
+        space(1)
+        for column, (label, value) in enumerate(sheet['stats'][row:row + 2]):
+            x = MARGIN + column * inner / 2
+            text(x, inner / 4, label, bold=True)
+            text(x + inner / 4, inner / 4 - 20, value, align=Qt.AlignRight)
+        y += LINE
+
+    for heading, columns, rows in sheet['tables']:
+        y += LINE
+        space(3)
+        text(MARGIN, inner, heading, size=26, bold=True)
+        y += LINE + 10
+        for row in [None] + rows:
+            space(1)
+            x = MARGIN
+            values = [label for label, _ in columns] if row is None else row
+            for value, (label, share) in zip(values, columns):
+                align = Qt.AlignRight if label in NUMERIC_COLUMNS else Qt.AlignLeft
+                text(x + 4, inner * share - 8, value, bold=row is None or row[0] == "Total", align=align)
+                x += inner * share
+            if painter is not None and row is None:
+                painter.setPen(QColor(120, 120, 120))
+                painter.drawLine(MARGIN, int(y + LINE), MARGIN + inner, int(y + LINE))
+                painter.setPen(QColor(0, 0, 0))
+            y += LINE
+
+    return y + MARGIN
+
+
+def render_sheet(sheet, path, fmt="png"):
+    """
+    Renders a spec sheet to a PNG, as tall as the sheet needs, or to an A4 PDF of as many pages
+    The file is written under a temporary name and renamed over the target
+    :param sheet: contents from build_sheet
+    :param path: path of the file to write
+    :param fmt: "png" or "pdf"
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Error: unknown spec sheet format {}".format(fmt))
+
+    get_app()
+    temp = "{}.{}.tmp".format(path, os.getpid())
+    if fmt == "png":
+        image = QImage(SHEET_WIDTH, max(SHEET_HEIGHT, paint_sheet(sheet)), PNG_FORMAT)
+        image.fill(Qt.white)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        paint_sheet(sheet, painter)
+        painter.end()
+        saved = image.save(temp, "PNG", PNG_QUALITY)
+    else:
+        writer = QPdfWriter(temp)
+        writer.setResolution(SHEET_DPI)
+        writer.setPageLayout(QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Portrait, QMarginsF()))
+        writer.setTitle(sheet['title'])
+        painter = QPainter(writer)
+        paint_sheet(sheet, painter, writer.width(), writer.height(), writer.newPage)
+        saved = painter.end()
+
+    if not saved:
+        raise OSError("Error: couldn't write {}".format(path))
+    os.replace(temp, path)
+
+
+def render_file(path, output, fmt="png"):
+    """
+    Renders the spec sheet of a single SRD file
+    :param path: full path to the SRD file
+    :param output: path of the sheet to write
+    :param fmt: "png" or "pdf"
+    :return: tuple of (path, result) where result is "rendered" or an error message
+    """
+    try:
+        spacecraft = FileLoader().load_spacecraft(path)
+        render_sheet(build_sheet(spacecraft, srd_stem(os.path.basename(path))), output, fmt)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        return path, "Error: {!r}".format(error)
+    return path, RENDERED
+
+
+def sheet_name(path, fmt):
+    # File name of the sheet of a SRD file
+    return srd_stem(os.path.basename(path)) + "." + fmt
+
+
+def sheet_key(path, fmt, catalog_digest):
+    """
+    Builds the cache key of a design's sheet from its content hash, taken from the SRD header where
+    there is one, along with the parts catalog and sheet layout it is drawn with
+    :param path: full path to the SRD file
+    :param fmt: "png" or "pdf"
+    :param catalog_digest: digest of the parts catalog from get_catalog_digest
+    :return: hex digest
+    """
+    header = read_header(path)
+    content_hash = header.get('hash')
+    if content_hash is None or header.get('version') is None:
+        with open_file(path) as f:
+            content_hash = hash_model(upgrade(json.load(f)))
+
+    key = "{}:{}:{}:{}".format(SPEC_VERSION, fmt, content_hash, catalog_digest)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def read_manifest(out_dir):
+    # Reads the cache keys of the sheets already in an output directory
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return DECODER.decode(f.read())
+    except (OSError, ValueError):
+        return dict()
+
+
+def render_library(paths, out_dir, fmt="png", workers=None, force=False, window=64):
+    """
+    Renders a spec sheet per SRD file into a directory, on a pool of worker processes
+    Designs whose sheet is in the manifest under the same cache key are skipped without being
+    loaded, and the manifest is updated as sheets finish, even if the run stops part way
+    :param paths: list of file or directory paths
+    :param out_dir: directory the sheets are written to, named after each file
+    :param fmt: "png" or "pdf"
+    :param workers: number of worker processes, defaults to the CPU count. 1 renders in this process
+    :param force: whether to render every sheet again regardless of the manifest
+    :param window: most files submitted to the pool and not yet finished
+    :return: generator of (path, result) tuples, where result is "rendered", "cached" or an error message
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Error: unknown spec sheet format {}".format(fmt))
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = read_manifest(out_dir)
+    catalog_digest = get_catalog_digest()
+    outputs = dict()    # file name of each sheet being rendered to its SRD file and cache key
+
+    def plan(path):
+        # Works out whether a file's sheet is current, returning its result if it needs no rendering
+        name = sheet_name(path, fmt)
+        if name in outputs:
+            return "Error: {} is also rendered from {}".format(name, outputs[name][0])
+
+        try:
+            key = sheet_key(path, fmt, catalog_digest)
+        except (OSError, ValueError, KeyError) as error:
+            return "Error: {!r}".format(error)
+        outputs[name] = (path, key)
+        if not force and manifest.get(name) == key and os.path.exists(os.path.join(out_dir, name)):
+            return CACHED
+        return None
+
+    def finish(path, result):
+        name = sheet_name(path, fmt)
+        if result == RENDERED:
+            manifest[name] = outputs[name][1]
+        return path, result
+
+    try:
+        if workers == 1:
+            for path in find_files(paths):
+                result = plan(path)
+                if result is None:
+                    result = render_file(path, os.path.join(out_dir, sheet_name(path, fmt)), fmt)[1]
+                yield finish(path, result)
+            return
+
+        # Spawned rather than forked, as a forked Qt application isn't safe to paint with
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=get_app) as executor:
+            pending = set()
+            for path in find_files(paths):
+                result = plan(path)
+                if result is not None:
+                    yield path, result
+                    continue
+
+                output = os.path.join(out_dir, sheet_name(path, fmt))
+                pending.add(executor.submit(render_file, path, output, fmt))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield finish(*future.result())
+
+            for future in pending:
+                yield finish(*future.result())
+    finally:
+        atomic_write(os.path.join(out_dir, MANIFEST), ENCODER.encode(manifest))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render spec sheets of SRD files")
+    parser.add_argument("paths", nargs="+", help=".srd files or directories holding them")
+    parser.add_argument("--out", required=True, help="directory the sheets are written to")
+    parser.add_argument("--format", choices=FORMATS, default="png", help="file format of the sheets")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--force", action="store_true", help="render every sheet, even if unchanged")
+    args = parser.parse_args(argv)
+
+    counts = {RENDERED: 0, CACHED: 0}
+    failed = 0
+    for path, result in render_library(args.paths, args.out, args.format, workers=args.workers, force=args.force):
+        if result in counts:
+            counts[result] += 1
+        else:
+            failed += 1
+            print("{}: {}".format(path, result))
+
+    print("Rendered {} spec sheets, {} unchanged, {} failed".format(counts[RENDERED], counts[CACHED], failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+"""
+@file startup.py
+
+Tracing how long the window takes to start, panel by panel
+"""
+from imperium.gui import STARTED
+import os
+import time
+
+from PyQt5.QtCore import QEvent, QObject
+
+# Environment variable that turns on the startup trace
+STARTUP_TRACE_ENV = "IMPERIUM_STARTUP_TRACE"
+
+# Cold start target in milliseconds, from importing the GUI to every panel's first paint
+STARTUP_TARGET = 200
+
+
+class StartupTrace(QObject):
+    """
+    Timeline of the window starting up, from imperium.gui being imported to the first paint of each
+    panel. Steps are always timed, being a clock read each, but panels are only watched for their
+    first paint and the timeline printed when IMPERIUM_STARTUP_TRACE is set
+
+    :param started: perf_counter() reading the timeline starts at
+    """
+    def __init__(self, started=STARTED):
+        super(StartupTrace, self).__init__()
+        self.enabled    = bool(os.environ.get(STARTUP_TRACE_ENV))
+        self.started    = started
+        self.last       = started
+        self.steps      = list()    # (name, milliseconds) of each step of building the window
+        self.painted    = list()    # (panel, milliseconds since started) of each first paint
+        self.watched    = dict()    # panel widget -> title, until it first paints
+        self.pending    = set()     # deferred panel widgets not yet built
+        self.reported   = False
+
+    def elapsed(self):
+        # Milliseconds since the timeline started
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, name):
+        # Ends a step, timing it from the end of the previous one
+        now = time.perf_counter()
+        self.steps.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def watch(self, widget):
+        """
+        Records the first paint of a panel from now on
+        :param widget: QGroupBox of the panel
+        """
+        self.pending.discard(widget)
+        if self.enabled:
+            self.watched[widget] = widget.title()
+            widget.installEventFilter(self)
+
+    def defer(self, widget):
+        # Holds the report back until a deferred panel is built and watched
+        if self.enabled:
+            self.pending.add(widget)
+
+    def eventFilter(self, widget, event):
+        if event.type() == QEvent.Paint and widget in self.watched:
+            widget.removeEventFilter(self)
+            self.painted.append((self.watched.pop(widget), self.elapsed()))
+            if not self.watched and not self.pending and not self.reported:
+                self.report()
+        return False
+
+    def cold_start(self):
+        # Milliseconds to the last first paint
+        return max(at for _, at in self.painted) if self.painted else None
+
+    def report(self):
+        # Prints the timeline against the cold start target
+        self.reported = True
+        print("Startup trace (ms):")
+        for name, took in self.steps:
+            print("  {:<36} {:>8.1f}".format(name, took))
+        for name, at in self.painted:
+            print("  first paint {:<24} {:>8.1f}".format(name, at))
+
+        total = self.cold_start()
+        print("Cold start {:.1f} ms, target {} ms{}".format(
+            total, STARTUP_TARGET, "" if total <= STARTUP_TARGET else " - over target"))
@@ -0,0 +1,85 @@
+"""
+@file widgets.py
+
+Helpers for laying out the window's dynamic lists of widgets
+"""
+from imperium import instrument
+
+
+class KeyedRows:
+    """
+    A run of grid layout rows holding one row of widgets for each item of a list, such as the hardpoints
+    of a ship. Reconciling against a new list only builds rows for new keys, removes rows whose key is
+    gone, moves rows whose position changed and updates the rest in place. Widgets, and the signal
+    connections made when they were built, live as long as their key does
+    """
+    def __init__(self, layout, row, build, update=None, key=None):
+        """
+        :param layout: QGridLayout to place the rows in
+        :param row: grid row of the first item
+        :param build: function of an item returning its row as a list of (widget, column, column span)
+        :param update: function of an item and its row that refreshes a kept row, optional
+        :param key: function of an item returning its key, defaults to the item itself
+        """
+        self.layout = layout
+        self.row    = row
+        self.build  = build
+        self.update = update
+        self.key    = key if key is not None else (lambda item: item)
+        self.rows   = dict()     # key -> (grid row, cells)
+        self.built  = 0          # number of rows built over the lifetime of the list
+
+    def __len__(self):
+        return len(self.rows)
+
+    def widgets(self, key):
+        """
+        Gets the widgets of the row for a key
+        :param key: key of the item
+        :return: list of widgets, in the order they were built
+        """
+        return [widget for widget, _, _ in self.rows[key][1]]
+
+    def reconcile(self, items):
+        """
+        Brings the rows in line with a list of items
+        :param items: list of items, in display order
+        """
+        keyed = [(self.key(item), item) for item in items]
+        keys = set(key for key, _ in keyed)
+        for key in [key for key in self.rows if key not in keys]:
+            self.remove(key)
+
+        for idx, (key, item) in enumerate(keyed):
+            row = self.row + idx
+            if key not in self.rows:
+                cells = self.build(item)
+                for widget, column, span in cells:
+                    self.layout.addWidget(widget, row, column, 1, span)
+                self.rows[key] = (row, cells)
+                self.built += 1
+                instrument.count("gui.widgets_created", len(cells))
+                continue
+
+            # Rows shift up when one before them is removed
+            old_row, cells = self.rows[key]
+            if old_row != row:
+                for widget, column, span in cells:
+                    self.layout.removeWidget(widget)
+                    self.layout.addWidget(widget, row, column, 1, span)
+                self.rows[key] = (row, cells)
+
+            if self.update is not None:
+                self.update(item, cells)
+
+    def remove(self, key):
+        """
+        Takes the row for a key out of the layout and deletes its widgets
+        :param key: key of the item
+        """
+        _, cells = self.rows.pop(key)
+        instrument.count("gui.widgets_destroyed", len(cells))
+        for widget, _, _ in cells:
+            self.layout.removeWidget(widget)
+            widget.setParent(None)
+            widget.deleteLater()
@@ -0,0 +1,1606 @@
+"""
+@file window.py
+@author Ryan Missel, Chris Vantine
+
+Main window of the imperium-shipyard program (https://github.com/Milkshak3s/imperium-shipyard)
+Handles all of the UI interaction and display for the PyQT frontend
+"""
+import sys
+import random
+import os
+import string
+from contextlib import contextmanager
+
+from imperium.classes.computer import Computer
+from imperium.classes.config import Config
+from imperium.classes.drives import MDrive, JDrive
+from imperium.classes.hardpoint import Hardpoint
+from imperium.classes.misc import Misc
+from imperium.classes.option import Option
+from imperium.classes.pplant import PPlant
+from imperium.classes.screens import Screen
+from imperium.classes.sensors import Sensor
+from imperium.classes.software import Software
+from imperium.classes.spacecraft import COMPONENT_SECTIONS, Spacecraft
+from imperium.classes.armour import Armour
+from imperium import instrument
+
+from imperium.gui.catalog import CatalogFilter, get_catalog
+from imperium.gui.compare import COMPARE_LIMIT, ComparisonPanel
+from imperium.gui.fleet import FleetBrowser
+from imperium.gui.hardpoints import AmmoDelegate, ChoiceDelegate, HardpointModel
+from imperium.gui.overlay import InstrumentOverlay
+from imperium.gui.startup import StartupTrace
+from imperium.gui.widgets import KeyedRows
+from imperium.gui.workers import Worker
+
+from imperium.shipyard.autosave import AutoSaver
+from imperium.shipyard.compression import is_srd
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.header import read_header, summarize
+from imperium.shipyard.jobs import validate_files
+from imperium.shipyard.stream import read_model
+
+from PyQt5.QtCore import Qt, QTimer, QSortFilterProxyModel, QThreadPool
+from PyQt5.QtGui import QIntValidator, QIcon
+from PyQt5.QtWidgets import (QApplication, QComboBox, QGridLayout, QGroupBox, QFileDialog,
+                             QLabel, QLineEdit, QWidget, QFrame, QPushButton, QCheckBox,
+                             QScrollArea, QMainWindow, QAction, QMessageBox, QTableView, QAbstractItemView)
+
+# Milliseconds without edits before the ship is autosaved
+AUTOSAVE_DELAY = 2000
+
+# File dialog filter for SRD files, compressed or not
+SRD_FILTER = 'Traveller SRD files (*.srd *.srd.gz *.srd.bz2 *.srd.xz)'
+
+# File dialog filter for fleet archives, one design per line
+ARCHIVE_FILTER = 'Fleet archives (*.jsonl *.jsonl.gz *.jsonl.bz2 *.jsonl.xz)'
+
+# Most failed files listed after validating a folder
+VALIDATION_LISTED = 20
+
+# Default designs pinned by Compare With Defaults
+DEFAULT_REFERENCES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "../shipyard/models/default", name)
+                      for name in ("Far Trader.srd", "Free Trader Type-A.srd")]
+
+
+class Window(QMainWindow):
+    def __init__(self):
+        super(Window, self).__init__()
+        self.trace = StartupTrace()
+        self.trace.mark("Import and QApplication")
+
+        # Creating a file loader for saving
+        self.fileloader = FileLoader()
+
+        # Item models of the parts catalog, shared with every other window
+        self.catalog = get_catalog()
+
+        # Autosaving in the background once edits settle, restarted by every stats update
+        self.autosaver = AutoSaver()
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY)
+        self.autosave_timer.timeout.connect(self.autosave)
+
+        # Stats refreshes are requested by edits and performed once per turn of the event loop
+        self.stats_dirty = False
+        self.stats_requests = 0     # number of update_stats calls
+        self.stats_refreshes = 0    # number of refresh_stats calls that did the work
+        self.dirty_sections = set() # component sections changed since the last refresh
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setSingleShot(True)
+        self.stats_timer.setInterval(0)
+        self.stats_timer.timeout.connect(self.refresh_stats)
+
+        # Depth of nested bulk_edit contexts
+        self.bulk_depth = 0
+
+        # Background jobs, kept until they finish
+        self.thread_pool = QThreadPool.globalInstance()
+        self.workers = list()
+        self.validation = list()    # (path, errors) of the files that failed the last folder validation
+
+        # Dock browsing a fleet, built the first time one is browsed
+        self.fleet_browser = None
+
+        # Dock comparing the ship with reference ships, built the first time one is pinned
+        self.comparison = None
+
+        # Create a base Spacecraft to use
+        self.spacecraft = Spacecraft(100)
+        self.logger = QLabel("")
+
+        # Window Title
+        self.setWindowTitle("Imperium Shipyard - Untitled.srd")
+
+        ###################################
+        ###  BEGIN: Imperium Options    ###
+        ###################################
+        imperium_bar = self.menuBar()
+        file_bar = imperium_bar.addMenu("File")
+
+        save_action = QAction("Save", self)
+        save_action.setShortcut("Ctrl+S")
+        save_action.triggered.connect(lambda: self.save_file())
+
+        load_action = QAction("Load", self)
+        load_action.triggered.connect(lambda: self.open_file())
+
+        reset_action = QAction("Reset", self)
+        reset_action.setShortcut("Ctrl+R")
+        reset_action.triggered.connect(lambda: self.reset_ship())
+
+        validate_action = QAction("Validate Folder", self)
+        validate_action.triggered.connect(lambda: self.validate_folder())
+
+        browse_folder_action = QAction("Browse Folder", self)
+        browse_folder_action.triggered.connect(lambda: self.browse_fleet())
+
+        browse_archive_action = QAction("Browse Archive", self)
+        browse_archive_action.triggered.connect(lambda: self.browse_fleet(archive=True))
+
+        self.cancel_action = QAction("Cancel Jobs", self)
+        self.cancel_action.setEnabled(False)
+        self.cancel_action.triggered.connect(lambda: self.cancel_jobs())
+
+        file_bar.addAction(save_action)
+        file_bar.addAction(load_action)
+        file_bar.addAction(reset_action)
+        file_bar.addSeparator()
+        file_bar.addAction(browse_folder_action)
+        file_bar.addAction(browse_archive_action)
+        file_bar.addAction(validate_action)
+        file_bar.addAction(self.cancel_action)
+
+        compare_bar = imperium_bar.addMenu("Compare")
+
+        compare_defaults_action = QAction("Compare With Defaults", self)
+        compare_defaults_action.triggered.connect(lambda: self.compare_ships(DEFAULT_REFERENCES))
+
+        compare_action = QAction("Compare With...", self)
+        compare_action.triggered.connect(lambda: self.compare_ships())
+
+        compare_bar.addAction(compare_defaults_action)
+        compare_bar.addAction(compare_action)
+
+        ###################################
+        ###    END: Imperium Options    ###
+        ###################################
+        self.trace.mark("Menu")
+
+        def add_combo_box(layout, label, catalog, funct, x, y, in_line=True):
+            """
+            Handles adding a combo box widget listing a shared model of the parts catalog
+            :param layout: PyQT layout
+            :param label: label name
+            :param catalog: name of the catalog model
+            :param funct: function to connect items to
+            :param x: row in layout
+            :param y: col in layout
+            :param in_line: whether to put the combox in the same row as the label
+            :return: PyQT Combo Box
+            """
+            layout.addWidget(QLabel(label), x, y)
+            combo_box = QComboBox()
+            combo_box.setModel(self.catalog.model(catalog))
+            combo_box.activated.connect(funct)
+
+            if in_line:
+                layout.addWidget(combo_box, x, y + 1, 1, -1)
+            else:
+                layout.addWidget(combo_box, x + 1, y, 1, -1)
+            return combo_box
+
+        def add_hull_option(layout, name, funct, x, y):
+            """
+            Handles adding a hull option component check box and attaching a function to it
+            :param layout: which PyQT layout this widget belongs to
+            :param name: name to be displayed on the GUI
+            :param funct: function reference
+            :param x: row in the groupbox
+            :param y: column in the groupbox
+            :return: the created QCheckBox
+            """
+            box = QCheckBox(name)
+            box.stateChanged.connect(funct)
+            layout.addWidget(box, x, y)
+            return box
+
+        ###################################
+        ###  BEGIN: Base Stats Grid     ###
+        ###################################
+        base_stats_group = QGroupBox("Base Stats")
+        base_stats_layout = QGridLayout()
+        base_stats_layout.setAlignment(Qt.AlignTop)
+
+        # Add stat function
+        def add_stat_to_layout(layout, label, row, signal_function=None, force_int=False, read_only=False):
+            """
+            Adds all the necessary widgets to a grid layout for a single stat
+
+            :param label: The label to display
+            :param row: The row number to add on
+            :param signal_function: An additional function to connect on edit
+            :param force_int: Force input to be an integer value
+            :param read_only: Make text field read only
+
+            :returns: The QLineEdit object
+            """
+            new_label = QLabel(label)
+            new_line_edit = QLineEdit()
+            new_line_edit.setFixedWidth(50)
+
+            if signal_function is not None:
+                new_line_edit.editingFinished.connect(signal_function)
+            if force_int:
+                new_line_edit.setValidator(QIntValidator(new_line_edit))
+            if read_only:
+                new_line_edit.setReadOnly(True)
+
+            new_line_edit.editingFinished.connect(self.update_stats)
+            layout.addWidget(new_label, row, 0)
+            layout.addWidget(new_line_edit, row, 2)
+
+            return new_line_edit
+
+        # Tonnage
+        base_stats_layout.addWidget(QLabel("Tonnage: "), 0, 0)
+        self.tonnage_box = QComboBox()
+        self.tonnage_box.setModel(self.catalog.model("tonnage"))
+        self.tonnage_box.activated.connect(self.edit_tonnage)
+        base_stats_layout.addWidget(self.tonnage_box, 0, 2)
+
+        # Cargo
+        self.cargo_line_edit = add_stat_to_layout(base_stats_layout, "Cargo:", 1, read_only=True)
+
+        # Fuels
+        self.fuel_line_edit = add_stat_to_layout(base_stats_layout, "Fuel:", 2,
+                                                 signal_function=self.edit_fuel, force_int=True)
+        self.fuel_line_edit.validator().setBottom(0)
+
+        # Fuel to jump
+        self.fuel_label = add_stat_to_layout(base_stats_layout, "Fuel/Jump:", 3, read_only=True)
+
+        # Jump
+        base_stats_layout.addWidget(QLabel(""), 4, 0)
+        self.jump_line_edit = add_stat_to_layout(base_stats_layout, "Jump:", 5, signal_function=self.edit_jdrive)
+        self.jump_label = QLabel("-")
+        base_stats_layout.addWidget(self.jump_label, 5, 1)
+
+        # Thrust
+        self.thrust_line_edit = add_stat_to_layout(base_stats_layout, "Thrust:", 6, signal_function=self.edit_mdrive)
+        self.thrust_label = QLabel("-")
+        base_stats_layout.addWidget(self.thrust_label, 6, 1)
+
+        # PPlant
+        self.pplant_line_edit = add_stat_to_layout(base_stats_layout, "PPlant:", 7, signal_function=self.edit_pplant)
+        self.pplant_label = QLabel("-")
+        base_stats_layout.addWidget(self.pplant_label, 7, 1)
+
+        # Hull HP
+        base_stats_layout.addWidget(QLabel(""), 8, 0)
+        self.hull_hp_line_edit = add_stat_to_layout(base_stats_layout, "Hull HP:", 9,
+                                                    signal_function=self.edit_tonnage, read_only=True)
+
+        # Structure HP
+        self.structure_hp_line_edit = add_stat_to_layout(base_stats_layout, "Structure HP:", 10,
+                                                         signal_function=self.edit_tonnage, read_only=True)
+
+        # Armor
+        self.armour_line_edit = add_stat_to_layout(base_stats_layout, "Armour:", 11, read_only=True)
+
+        # Adding discount field
+        base_stats_layout.addWidget(QLabel(""), 12, 0)
+        self.discount = add_stat_to_layout(base_stats_layout, "Discount %:", 13, force_int=True,
+                                           signal_function=self.edit_discount)
+        self.discount.validator().setBottom(0)
+        self.discount.validator().setTop(100)
+
+        # Cost
+        self.cost_line_edit = add_stat_to_layout(base_stats_layout, "Cost (MCr.):", 14, read_only=True)
+
+        # Grid layout
+        base_stats_group.setLayout(base_stats_layout)
+        ###################################
+        ###  END: Base Stats Grid       ###
+        ###################################
+        self.trace.mark("Base Stats Grid")
+
+        ###################################
+        ###  START: Armor/Config Grid   ###
+        ###################################
+        self.armor_scroll = QScrollArea()
+        self.armor_config_group = QGroupBox("Config/Armor")
+        self.armor_config_layout = QGridLayout()
+        self.armor_config_layout.setAlignment(Qt.AlignTop)
+
+        #### Hull Options ###
+        self.armor_config_layout.addWidget(QLabel("Hull Options:"), 0, 0)
+
+        # Bridge
+        self.bridge_check = add_hull_option(self.armor_config_layout, "Bridge", self.check_bridge, 1, 0)
+
+        # Reflec
+        self.reflec_check = add_hull_option(self.armor_config_layout, "Reflec",
+                                            lambda: self.modify_hull_option(self.reflec_check), 2, 0)
+
+        # Self-Sealing
+        self.seal_check = add_hull_option(self.armor_config_layout, "Self-Sealing",
+                                          lambda: self.modify_hull_option(self.seal_check), 3, 0)
+
+        # Stealth
+        self.stealth_check = add_hull_option(self.armor_config_layout, "Stealth",
+                                             lambda: self.modify_hull_option(self.stealth_check), 4, 0)
+
+        ### Screen Options ###
+        self.armor_config_layout.addWidget(QLabel("Screen Options:"), 0, 1)
+
+        # Meson Screen
+        self.meson_screen = add_hull_option(self.armor_config_layout, "Meson Screen",
+                                            lambda: self.modify_screen(self.meson_screen), 1, 1)
+
+        # Nuclear Damper
+        self.nuclear_damper = add_hull_option(self.armor_config_layout, "Nuclear Damper",
+                                              lambda: self.modify_screen(self.nuclear_damper), 2, 1)
+
+        ### Fuel Options ###
+        self.armor_config_layout.addWidget(QLabel("Fuel Options:"), 3, 1)
+
+        # Fuel Scoop
+        self.fuel_scoop = add_hull_option(self.armor_config_layout, "Fuel Scoop",
+                                          lambda: self.modify_fuel_scoops(), 4, 1)
+
+        ### Hull config list ###
+        self.hull_config_box = add_combo_box(self.armor_config_layout, "Hull Config: ",
+                                             "hull_config", self.edit_hull_config, 5, 0)
+
+        ### Sensors ###
+        self.sensors = add_combo_box(self.armor_config_layout, "Sensors: ", "sensors",
+                                     self.edit_sensors, 7, 0)
+
+        ### Armor list ###
+        self.armor_combo_box = add_combo_box(self.armor_config_layout, "Armour:",
+                                             "armour", self.edit_armor, 9, 0, in_line=False)
+
+        # Rows of armour on the ship
+        self.armor_rows = KeyedRows(self.armor_config_layout, self.armor_config_layout.rowCount(), self.build_armor_row)
+
+        ### Scroll area properties ###
+        self.armor_scroll.setFrameShape(QFrame.NoFrame)
+        self.armor_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.armor_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.armor_scroll.setWidgetResizable(True)
+
+        self.armor_config_group.setLayout(self.armor_config_layout)
+        self.armor_scroll.setWidget(self.armor_config_group)
+        ###################################
+        ###  END: Armor/Config Grid     ###
+        ###################################
+        self.trace.mark("Armor/Config Grid")
+
+        ###################################
+        ###  START: Computer Grid       ###
+        ###################################
+        self.computer_config_group = QGroupBox("Computer")
+        self.computer_config_layout = QGridLayout()
+        self.computer_config_layout.setAlignment(Qt.AlignTop)
+
+        # Computer Model
+        self.computers = add_combo_box(self.computer_config_layout, "Model: ", "computers",
+                                       self.edit_computer, 2, 0)
+
+        # Computer Rating
+        self.computer_config_layout.addWidget(QLabel("Rating:"), 4, 0)
+        self.rating = QLabel("--/--")
+        self.computer_config_layout.addWidget(self.rating, 4, 1)
+        self.computer_config_layout.addWidget(QLabel(""), 5, 0)
+
+        # Computer customizations
+        self.computer_config_layout.addWidget(QLabel("Customizations:"), 6, 0)
+
+        self.jump_control_spec = add_hull_option(self.computer_config_layout, "Jump Control Spec",
+                                                 lambda: self.modify_computer_addon("Jump Control Spec"), 7, 0)
+
+        self.hardened_system = add_hull_option(self.computer_config_layout, "Hardened System",
+                                               lambda: self.modify_computer_addon("Hardened System"), 8, 0)
+
+        self.computer_config_layout.addWidget(QLabel(""), 9, 0)
+
+        # Software
+        self.computer_config_layout.addWidget(QLabel("Software:"), 10, 0)
+        # Lists the software not installed yet
+        self.software_box = QComboBox()
+        self.software_filter = CatalogFilter(self.catalog.model("software"), parent=self)
+        self.software_box.setModel(self.software_filter)
+        button = QPushButton("Add")
+        button.clicked.connect(lambda: self.add_software(self.software_box))
+        self.computer_config_layout.addWidget(self.software_box, 11, 0)
+        self.computer_config_layout.addWidget(QLabel(), 11, 1)
+        self.computer_config_layout.addWidget(button, 11, 2)
+
+        # Rows of software installed, keyed by name
+        self.software_rows = KeyedRows(self.computer_config_layout, 12, self.build_software_row,
+                                       self.update_software_row, key=lambda software: software.type)
+
+        self.computer_config_group.setLayout(self.computer_config_layout)
+        ###################################
+        ###  END: Computer Grid         ###
+        ###################################
+        self.trace.mark("Computer Grid")
+
+        ###################################
+        ###  START: Misc Items Grid     ###
+        ###################################
+        self.misc_scroll = QScrollArea()
+        self.misc_config_group = QGroupBox("Living/Vehicles/Drones")
+        self.misc_config_layout = QGridLayout()
+        self.misc_config_layout.setAlignment(Qt.AlignTop)
+
+        # Combobox of the misc items not on the ship yet
+        self.misc_box = QComboBox()
+        self.misc_filter = CatalogFilter(self.catalog.model("misc"), parent=self)
+        self.misc_box.setModel(self.misc_filter)
+
+        # Button that triggers the add
+        button = QPushButton("Add")
+        button.clicked.connect(lambda: self.add_misc(self.misc_box))
+
+        # Adding elements to GUI
+        self.misc_config_layout.addWidget(self.misc_box, 0, 0)
+        self.misc_config_layout.addWidget(QLabel(), 0, 1)
+        self.misc_config_layout.addWidget(button, 0, 2)
+
+        # Rows of misc items on the ship, keyed by name
+        self.misc_rows = KeyedRows(self.misc_config_layout, 1, self.build_misc_row, self.update_misc_row,
+                                   key=lambda misc: misc.name)
+
+        # Setting scroll area properties
+        self.misc_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.misc_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.misc_scroll.setWidgetResizable(True)
+        self.misc_scroll.setFrameShape(QFrame.NoFrame)
+
+        self.misc_config_group.setLayout(self.misc_config_layout)
+        self.misc_scroll.setWidget(self.misc_config_group)
+        ###################################
+        ###  END: Misc Items Grid       ###
+        ###################################
+        self.trace.mark("Misc Items Grid")
+
+        ###################################
+        ###  START: HP Stats Grid       ###
+        ###################################
+        self.hpstats_config_group = QGroupBox("Hardpoint Stats:")
+        self.hpstats_config_layout = QGridLayout()
+        self.hpstats_config_layout.setAlignment(Qt.AlignTop)
+        self.hpstats_config_group.setLayout(self.hpstats_config_layout)
+
+        self.hpstats2_config_group = QGroupBox("Cont.")
+        self.hpstats2_config_layout = QGridLayout()
+        self.hpstats2_config_layout.setAlignment(Qt.AlignTop)
+        self.hpstats2_config_group.setLayout(self.hpstats2_config_layout)
+
+        # Only shown stats, so their labels are filled in once the window is up
+        self.model_dict = None
+        self.deferred_panels = [(self.build_hardpoint_stats, [self.hpstats_config_group, self.hpstats2_config_group])]
+        ###################################
+        ###  START: Hardpoint Grid      ###
+        ###################################
+        self.hp_config_group = QGroupBox("Hardpoints:")
+        self.hp_config_layout = QGridLayout()
+        self.hp_config_layout.setAlignment(Qt.AlignTop)
+
+        # Total and available hardpoints
+        self.hp_config_layout.addWidget(QLabel("Total: "), 0, 0)
+        self.total_hp = QLabel(str(self.spacecraft.num_hardpoints))
+        self.hp_config_layout.addWidget(self.total_hp, 0, 1)
+
+        self.hp_config_layout.addWidget(QLabel("Avail: "), 0, 2)
+        self.avail_hp = QLabel(str(self.spacecraft.num_hardpoints - len(self.spacecraft.hardpoints)))
+        self.hp_config_layout.addWidget(self.avail_hp, 0, 3)
+
+        # Buttons adding a hardpoint and removing the selected ones
+        add_hp = QPushButton("Add")
+        add_hp.clicked.connect(self.add_hardpoint)
+        self.hp_config_layout.addWidget(add_hp, 0, 4)
+
+        remove_hp = QPushButton("Remove")
+        remove_hp.clicked.connect(self.remove_selected_hardpoints)
+        self.hp_config_layout.addWidget(remove_hp, 0, 5)
+
+        # Table of hardpoints and their turrets, sortable through a proxy so the ship's order is kept
+        self.hardpoint_model = HardpointModel(self.spacecraft, self)
+        self.hardpoint_model.edited.connect(lambda: self.update_stats("hardpoints"))
+        self.hardpoint_proxy = QSortFilterProxyModel(self)
+        self.hardpoint_proxy.setSourceModel(self.hardpoint_model)
+        self.hardpoint_proxy.setSortRole(Qt.EditRole)
+
+        self.hardpoint_view = QTableView()
+        self.hardpoint_view.setModel(self.hardpoint_proxy)
+        self.hardpoint_view.setSortingEnabled(True)
+        self.hardpoint_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.hardpoint_view.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        self.hardpoint_view.sortByColumn(-1, Qt.AscendingOrder)
+
+        self.choice_delegate = ChoiceDelegate(self)
+        self.ammo_delegate = AmmoDelegate(self)
+        for column, name in enumerate(self.hardpoint_model.columns):
+            if name == "Turret" or name.startswith("Wep"):
+                self.hardpoint_view.setItemDelegateForColumn(column, self.choice_delegate)
+            elif name.endswith("Missiles") or name == "Sandcaster":
+                self.hardpoint_view.setItemDelegateForColumn(column, self.ammo_delegate)
+        self.hp_config_layout.addWidget(self.hardpoint_view, 1, 0, 1, -1)
+
+        self.hp_config_group.setLayout(self.hp_config_layout)
+        ###################################
+        ###  END: Hardpoint Grid        ###
+        ###################################
+        self.trace.mark("Hardpoint Grid")
+
+        # Checking bridge to true, needed after initializing everything
+        self.bridge_check.setChecked(True)
+
+        # Setting initial discount to 0%
+        self.discount.setText("0")
+        self.edit_discount()
+
+        # Setting appropriate column widths
+        FIXED_WIDTH = 250
+        base_stats_group.setFixedWidth(175)
+        self.hpstats_config_group.setFixedWidth(175)
+
+        self.armor_config_group.setFixedWidth(FIXED_WIDTH)
+        self.computer_config_group.setFixedWidth(FIXED_WIDTH)
+        self.misc_config_group.setFixedWidth(FIXED_WIDTH)
+        self.misc_scroll.setFixedWidth(FIXED_WIDTH)
+
+        self.hpstats2_config_group.setFixedWidth(FIXED_WIDTH)
+
+        # Setting appropriate layout heights
+        FIXED_HEIGHT = 400
+        base_stats_group.setFixedHeight(FIXED_HEIGHT)
+        self.computer_config_group.setFixedHeight(FIXED_HEIGHT)
+        self.hp_config_group.setFixedHeight(350)
+
+        # Overall layout grid
+        # Top row
+        layout = QGridLayout()
+        layout.addWidget(base_stats_group, 0, 0)
+        layout.addWidget(self.armor_scroll, 0, 1)
+        layout.addWidget(self.computer_config_group, 0, 2)
+        layout.addWidget(self.misc_scroll, 0, 3)
+        # Second Row
+        layout.addWidget(self.hpstats_config_group, 1, 0)
+        layout.addWidget(self.hpstats2_config_group, 1, 1)
+        layout.addWidget(self.hp_config_group, 1, 2, 1, 2)
+
+        # Setting layout to be the central widget of main window
+        wid = QWidget()
+        wid.setLayout(layout)
+        self.setCentralWidget(wid)
+
+        # Update to current stats, nothing to autosave yet
+        self.refresh_stats()
+        self.autosave_timer.stop()
+        self.trace.mark("Layout and stats")
+
+        # Live counters and timers over the window, only built while instrumentation is on
+        self.overlay = InstrumentOverlay(self) if instrument.ENABLED else None
+
+        for group in (base_stats_group, self.armor_config_group, self.computer_config_group, self.misc_config_group,
+                      self.hp_config_group):
+            self.trace.watch(group)
+        for _, groups in self.deferred_panels:
+            for group in groups:
+                self.trace.defer(group)
+
+    def build_hardpoint_stats(self):
+        """
+        Fills the hardpoint stats panels with a label per turret model, weapon and bay weapon
+        """
+        def add_turret_stat(layout, row, string):
+            # Handles creating and adding a name and value to a layout
+            name_label = QLabel(string)
+            value_label = QLabel("0")
+
+            layout.addWidget(name_label, row, 0)
+            layout.addWidget(value_label, row, 1)
+            return name_label, value_label
+
+        _, self.active_hardpoints = add_turret_stat(self.hpstats_config_layout, 0, "Active HPs:")
+        _, self.hardpoint_cost = add_turret_stat(self.hpstats_config_layout, 1, "Cost: ")
+        _, self.hardpoint_ton = add_turret_stat(self.hpstats_config_layout, 2, "Tonnage: ")
+
+        """ Showing how many of each turret model """
+        self.hpstats_config_layout.addWidget(QLabel(""), 3, 0)
+        self.hpstats_config_layout.addWidget(QLabel("Turret Models:"), 4, 0)
+
+        self.model_dict = dict()
+        row = 5
+        for model in self.catalog.names("turrets"):
+            name, value = add_turret_stat(self.hpstats_config_layout, row, model)
+            self.model_dict[model] = value
+            row += 1
+
+        """ Showing how much of each weapon """
+        self.hpstats2_config_layout.addWidget(QLabel("Weapons:"), row + 1, 0)
+
+        row += 2
+        self.weapon_dict = dict()
+        for weapon in self.catalog.names("weapons"):
+            name, value = add_turret_stat(self.hpstats2_config_layout, row, weapon)
+            self.weapon_dict[weapon] = value
+            row += 1
+
+        self.hpstats2_config_layout.addWidget(QLabel(""), row, 0)
+        self.hpstats2_config_layout.addWidget(QLabel("Bay Weapons:"), row + 1, 0)
+        row += 2
+
+        self.bay_dict = dict()
+        for weapon in self.catalog.names("bayweapons"):
+            name, value = add_turret_stat(self.hpstats2_config_layout, row, weapon)
+            self.bay_dict[weapon] = value
+            row += 1
+
+        # Showing the current ship
+        self.update_turret_stats()
+
+    def showEvent(self, event):
+        # Deferred panels are built on the first idle tick after the window shows
+        super(Window, self).showEvent(event)
+        if self.deferred_panels:
+            QTimer.singleShot(0, self.build_panels)
+
+    def build_panels(self):
+        """
+        Builds any panels still deferred, such as when one is needed before the window has shown
+        """
+        while self.deferred_panels:
+            build, groups = self.deferred_panels.pop(0)
+            build()
+            self.trace.mark(build.__name__)
+            for group in groups:
+                self.trace.watch(group)
+
+    def closeEvent(self, event):
+        # Stops background jobs and finishes any autosave in progress before closing
+        self.cancel_jobs()
+        for worker in list(self.workers):
+            self.thread_pool.tryTake(worker)
+        self.thread_pool.waitForDone()
+
+        self.stats_timer.stop()
+        self.autosave_timer.stop()
+        self.autosaver.stop()
+        super(Window, self).closeEvent(event)
+
+    def start_job(self, job, *args, on_results=None, on_finished=None, total=0):
+        """
+        Runs a job on the thread pool, showing its progress in the status bar
+        :param job: generator function from imperium.shipyard.jobs
+        :param args: arguments for the job
+        :param on_results: called on the GUI thread with each batch of results
+        :param on_finished: called on the GUI thread with whether the job ran to its end
+        :param total: expected number of results, 0 if unknown
+        :return: the Worker running the job
+        """
+        worker = Worker(job, *args, total=total)
+        if on_results is not None:
+            worker.signals.results.connect(on_results)
+        worker.signals.progress.connect(self.show_job_progress)
+        worker.signals.error.connect(self.statusBar().showMessage)
+        worker.signals.finished.connect(lambda completed: self.finish_job(worker))
+        if on_finished is not None:
+            worker.signals.finished.connect(on_finished)
+
+        self.workers.append(worker)
+        self.cancel_action.setEnabled(True)
+        self.thread_pool.start(worker)
+        return worker
+
+    def show_job_progress(self, done, total):
+        # Status bar progress of the running jobs
+        if total:
+            self.statusBar().showMessage("Working... {} of {}".format(done, total))
+        else:
+            self.statusBar().showMessage("Working... {} done".format(done))
+
+    def finish_job(self, worker):
+        # Drops a worker once it is done
+        if worker in self.workers:
+            self.workers.remove(worker)
+        self.cancel_action.setEnabled(len(self.workers) > 0)
+
+    def cancel_jobs(self):
+        # Asks every running job to stop
+        for worker in self.workers:
+            worker.cancel()
+
+    def validate_folder(self, directory=None):
+        """
+        Checks every SRD file in a folder in the background, listing the ones that fail once done
+        :param directory: folder to check, asked for if not given
+        :return: the Worker running the validation, or None if no folder was chosen
+        """
+        if directory is None:
+            directory = QFileDialog.getExistingDirectory(self, 'Validate Folder', 'imperium/shipyard/models')
+            if directory == '':
+                return None
+
+        self.validation = list()
+        counts = [0]
+
+        def collect(results):
+            counts[0] += len(results)
+            self.validation.extend((path, errors) for path, errors in results if errors)
+
+        def report(completed):
+            message = "Validated {} SRD files, {} failed".format(counts[0], len(self.validation))
+            if not completed:
+                message += " before stopping"
+            self.statusBar().showMessage(message)
+
+            if self.validation and self.isVisible():
+                box = QMessageBox(QMessageBox.Warning, "Validate Folder", message, parent=self)
+                box.setDetailedText("\n".join("{}: {}".format(path, "; ".join(errors))
+                                               for path, errors in self.validation[:VALIDATION_LISTED]))
+                box.setModal(False)
+                box.show()
+
+        return self.start_job(validate_files, [directory], on_results=collect, on_finished=report)
+
+    def browse_fleet(self, path=None, archive=False):
+        """
+        Lists a folder of SRD files or a fleet archive in the fleet browser dock
+        :param path: folder or archive to browse, asked for if not given
+        :param archive: whether to ask for an archive rather than a folder
+        :return: the Worker listing the fleet, or None if nothing was chosen
+        """
+        if path is None and archive:
+            path = QFileDialog.getOpenFileName(self, 'Browse Archive', 'imperium/shipyard/models', ARCHIVE_FILTER)[0]
+        elif path is None:
+            path = QFileDialog.getExistingDirectory(self, 'Browse Folder', 'imperium/shipyard/models')
+        if path == '':
+            return None
+
+        if self.fleet_browser is None:
+            self.fleet_browser = FleetBrowser(self)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.fleet_browser)
+        self.fleet_browser.show()
+        return self.fleet_browser.browse(path)
+
+    def compare_ships(self, paths=None):
+        """
+        Pins reference ships in the comparison dock, replacing any pinned before
+        :param paths: SRD files to compare with, asked for if not given
+        :return: the ComparisonPanel, or None if nothing was chosen
+        """
+        if paths is None:
+            paths = QFileDialog.getOpenFileNames(self, 'Compare With', 'imperium/shipyard/models/default', SRD_FILTER)[0]
+        if not paths:
+            return None
+        if len(paths) > COMPARE_LIMIT:
+            self.statusBar().showMessage("Error: only the first {} ships are compared".format(COMPARE_LIMIT))
+            paths = paths[:COMPARE_LIMIT]
+
+        if self.comparison is None:
+            self.comparison = ComparisonPanel(self)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.comparison)
+
+        try:
+            self.comparison.set_references(paths)
+        except (OSError, ValueError, KeyError) as error:
+            self.statusBar().showMessage("Error: couldn't load ship to compare - {!r}".format(error))
+            return None
+
+        self.comparison.refresh(self.spacecraft, COMPONENT_SECTIONS)
+        self.comparison.show()
+        return self.comparison
+
+    def open_design(self, source):
+        """
+        Opens a design listed in the fleet browser, decoding it straight into a spacecraft
+        :param source: (path, None) for a SRD file, or (archive path, position) for a design in an archive
+        """
+        path, index = source
+        try:
+            if index is None:
+                spacecraft = self.fileloader.load_spacecraft(path)
+                title = os.path.basename(path)
+            else:
+                spacecraft = self.fileloader.decode_model(read_model(path, index))
+                title = "{} #{}".format(os.path.basename(path), index + 1)
+        except (OSError, ValueError, KeyError, IndexError) as error:
+            self.statusBar().showMessage("Error: couldn't open design - {!r}".format(error))
+            return
+
+        self.setWindowTitle("Imperium Shipyard - {}".format(title))
+        self.set_spacecraft(spacecraft)
+        self.clear_autosave()
+
+    def autosave(self):
+        """
+        Snapshots the current ship once edits have settled and hands it to the autosave thread
+        """
+        self.autosaver.submit(self.fileloader.encode_model(self.spacecraft))
+
+    def clear_autosave(self):
+        # Drops the recovery file once the ship matches a file on disk
+        self.autosave_timer.stop()
+        self.autosaver.discard()
+
+    def offer_recovery(self):
+        """
+        Handles offering to restore the ship a previous session left in the recovery file
+        """
+        if not self.autosaver.has_recovery():
+            return
+
+        answer = QMessageBox.question(self, "Recover Ship",
+                                      "Unsaved changes from a previous session were found. Recover them?")
+        if answer == QMessageBox.Yes:
+            self.fileloader.load_model(self.autosaver.path, self)
+            self.setWindowTitle("Imperium Shipyard - Recovered.srd")
+        else:
+            self.autosaver.discard()
+
+    def open_file(self):
+        """
+        # Handles the QtFileDialog for loading in ship formats, previewing the stats of the selected file
+        """
+        dlg = QFileDialog(self, 'Load File', 'shipyard/models/', SRD_FILTER)
+        dlg.setOption(QFileDialog.DontUseNativeDialog, True)
+        dlg.setFileMode(QFileDialog.ExistingFile)
+
+        # Preview column beside the file list, filled from the header of the file
+        preview = QLabel()
+        preview.setMinimumWidth(160)
+        preview.setAlignment(Qt.AlignTop)
+        layout = dlg.layout()
+        if isinstance(layout, QGridLayout):
+            layout.addWidget(preview, 0, layout.columnCount(), layout.rowCount(), 1)
+        dlg.currentChanged.connect(lambda path: preview.setText(self.describe_file(path)))
+
+        # Doing the interaction
+        if dlg.exec_() and dlg.selectedFiles():
+            filename = dlg.selectedFiles()[0]
+            self.setWindowTitle("Imperium Shipyard - {}".format(filename.split('/')[-1]))
+            self.fileloader.load_model(filename, self)
+            self.clear_autosave()
+
+    def describe_file(self, path):
+        """
+        Builds the preview text of a SRD file from its header
+        :param path: full path to the file
+        :return: multi-line summary, empty for anything that isn't a readable SRD file
+        """
+        if not is_srd(path) or not os.path.isfile(path):
+            return ""
+
+        try:
+            summary = summarize(read_header(path))
+        except (OSError, ValueError):
+            return ""
+        return "\n".join("{}: {}".format(key, value) for key, value in summary.items())
+
+    def save_file(self):
+        """
+        Handles the QtFileDialog for saving the current ship to a file
+        """
+        dlg = QFileDialog()
+
+        # Doing the interaction
+        filename = dlg.getSaveFileName(self, 'Save File', 'shipyard/models',
+                                       'Traveller SRD files (*.srd);;Compressed SRD files (*.srd.gz)')
+
+        if filename[0] != '':
+            self.setWindowTitle("Imperium Shipyard - {}".format(filename[0].split('/')[-1]))
+            self.fileloader.save_model(filename[0], self.spacecraft)
+            self.clear_autosave()
+
+    def reset_ship(self):
+        """
+        Handles getting the path to the default SRD file and resetting the GUI to a default ship
+        """
+        my_path = os.path.abspath(os.path.dirname(__file__))
+        filename = os.path.join(my_path, "../shipyard/models/default/default.srd")
+
+        self.setWindowTitle("Imperium Shipyard - Untitled.srd")
+        self.fileloader.load_model(filename, self)
+        self.clear_autosave()
+
+    def editing_widgets(self):
+        # Widgets whose signals write back into the spacecraft
+        return [
+            self.tonnage_box, self.fuel_line_edit, self.jump_line_edit, self.thrust_line_edit,
+            self.pplant_line_edit, self.hull_hp_line_edit, self.structure_hp_line_edit, self.discount,
+            self.bridge_check, self.reflec_check, self.seal_check, self.stealth_check, self.meson_screen,
+            self.nuclear_damper, self.fuel_scoop, self.hull_config_box, self.sensors, self.armor_combo_box,
+            self.computers, self.jump_control_spec, self.hardened_system, self.software_box, self.misc_box
+        ]
+
+    @contextmanager
+    def bulk_edit(self):
+        """
+        Context for making many changes at once, such as loading a ship. Widget signals are blocked
+        and repaints held off inside it, so changes are made to the spacecraft directly. Leaving the
+        outermost context syncs every widget from the spacecraft and repaints once
+        """
+        self.bulk_depth += 1
+        if self.bulk_depth == 1:
+            self.setUpdatesEnabled(False)
+            blocked = [(widget, widget.blockSignals(True)) for widget in self.editing_widgets()]
+
+        try:
+            yield self.spacecraft
+        finally:
+            if self.bulk_depth == 1:
+                for widget, was_blocked in blocked:
+                    widget.blockSignals(was_blocked)
+                self.sync_widgets()
+
+            self.bulk_depth -= 1
+            if self.bulk_depth == 0:
+                self.update_stats()
+                self.flush_stats()
+                self.setUpdatesEnabled(True)
+
+    def set_spacecraft(self, spacecraft):
+        """
+        Replaces the ship being edited, syncing the whole window to it in one pass
+        :param spacecraft: spacecraft object to edit
+        """
+        with self.bulk_edit():
+            self.spacecraft = spacecraft
+
+    @instrument.timed("gui.sync_widgets")
+    def sync_widgets(self):
+        """
+        Sets every widget from the state of the spacecraft, with signals blocked so nothing is
+        written back to it
+        """
+        spacecraft = self.spacecraft
+        blocked = [(widget, widget.blockSignals(True)) for widget in self.editing_widgets()]
+
+        # Base stats and drives
+        self.tonnage_box.setCurrentText(str(spacecraft.tonnage))
+        self.discount.setText(str(round(100 * (1 - spacecraft.discount))))
+        self.jump_label.setText(spacecraft.jdrive.drive_type if spacecraft.jdrive is not None else "-")
+        self.thrust_label.setText(spacecraft.mdrive.drive_type if spacecraft.mdrive is not None else "-")
+        self.pplant_label.setText(spacecraft.pplant.type if spacecraft.pplant is not None else "-")
+
+        # Hull config, options and screens
+        option_names = [option.name for option in spacecraft.hull_options]
+        for box in (self.reflec_check, self.seal_check, self.stealth_check):
+            box.setChecked(box.text() in option_names)
+
+        screen_names = [screen.name for screen in spacecraft.screens]
+        for box in (self.meson_screen, self.nuclear_damper):
+            box.setChecked(box.text() in screen_names)
+
+        self.bridge_check.setChecked(spacecraft.bridge)
+        self.hull_config_box.setCurrentText(spacecraft.hull_type.type)
+        self.fuel_scoop.setEnabled(spacecraft.hull_type.type != "Distributed")
+        self.fuel_scoop.setChecked(spacecraft.fuel_scoop)
+        self.sensors.setCurrentText(spacecraft.sensors.name)
+        self.armor_combo_box.setCurrentIndex(0)
+
+        # Computer
+        computer = spacecraft.computer
+        self.computers.setCurrentText(computer.model if computer is not None else "---")
+        self.jump_control_spec.setChecked(computer is not None and computer.bis)
+        self.hardened_system.setChecked(computer is not None and computer.fib)
+
+        # Software and misc boxes list what isn't installed yet
+        self.software_filter.set_excluded(software.type for software in spacecraft.software)
+        self.misc_filter.set_excluded(misc.name for misc in spacecraft.misc)
+
+        for widget, was_blocked in blocked:
+            widget.blockSignals(was_blocked)
+
+        # Installed parts
+        self.display_armor()
+        self.display_software()
+        self.display_misc_items()
+
+        # Hardpoints
+        self.total_hp.setText(str(spacecraft.num_hardpoints))
+        self.avail_hp.setText(str(spacecraft.num_hardpoints - len(spacecraft.hardpoints)))
+        self.hardpoint_model.set_spacecraft(spacecraft)
+
+    @instrument.counted("gui.update_stats")
+    def update_stats(self, *sections):
+        """
+        Requests the UI be updated with the current Spacecraft stats. Requests made within one turn
+        of the event loop, such as the many made while loading a file, collapse into one refresh_stats
+        Restarts the autosave countdown, as every edit passes through here
+        :param sections: sections of Spacecraft.get_components the edit changed, every section if none
+        """
+        self.stats_requests += 1
+        self.dirty_sections.update(sections or COMPONENT_SECTIONS)
+        if self.bulk_depth > 0:
+            return
+        self.autosave_timer.start()
+
+        if not self.stats_dirty:
+            self.stats_dirty = True
+            self.stats_timer.start()
+
+    def flush_stats(self):
+        # Performs a requested stats refresh now rather than waiting for the event loop
+        if self.stats_dirty:
+            self.refresh_stats()
+
+    @instrument.timed("gui.refresh_stats")
+    def refresh_stats(self):
+        """
+        Updates the UI with the current Spacecraft stats
+        """
+        self.stats_timer.stop()
+        self.stats_dirty = False
+        self.stats_refreshes += 1
+
+        # The comparison lists again only the parts of the ship changed since the last refresh
+        if self.comparison is not None:
+            self.comparison.refresh(self.spacecraft, self.dirty_sections)
+        self.dirty_sections = set()
+
+        cargo = self.spacecraft.get_remaining_cargo()
+        self.cargo_line_edit.setText(str(        cargo                              ))
+        self.fuel_line_edit.setText(str(         self.spacecraft.fuel_max           ))
+        self.fuel_label.setText(str(             self.spacecraft.fuel_jump          ))
+        self.jump_line_edit.setText(str(         self.spacecraft.jump               ))
+        self.thrust_line_edit.setText(str(       self.spacecraft.thrust             ))
+        self.pplant_line_edit.setText(str(       self.spacecraft.fuel_two_weeks     ))
+        self.hull_hp_line_edit.setText(str(      self.spacecraft.hull_hp            ))
+        self.structure_hp_line_edit.setText(str( self.spacecraft.structure_hp       ))
+        self.armour_line_edit.setText(str(       self.spacecraft.armour_total       ))
+        self.cost_line_edit.setText("{:0.3f}".format(self.spacecraft.get_total_cost()))
+
+        # Updating the hardpoint stats information
+        self.update_turret_stats()
+
+        # Set the cargo text to red when cargo going negative
+        if cargo < 0:
+            self.cargo_line_edit.setStyleSheet("color: red")
+        else:
+            self.cargo_line_edit.setStyleSheet("color: black")
+
+        # Set the PPlant text red if its underfit
+        validity = self.spacecraft.check_pplant_validity()
+        if type(validity) is bool:
+            self.pplant_line_edit.setStyleSheet("color: black")
+        elif type(validity) is str:
+            self.pplant_line_edit.setStyleSheet("color: red")
+            self.logger.setText(validity)
+
+        # Update computer rating
+        total_rating = "0" if self.spacecraft.computer is None else self.spacecraft.computer.rating
+        self.rating.setText("{}/{}".format(self.spacecraft.check_rating_ratio(), total_rating))
+
+    def update_turret_stats(self):
+        """
+        Updates turret column stats with appropriate
+        """
+        # Nothing to show until the panels are built
+        if self.model_dict is None:
+            return
+
+        self.active_hardpoints.setText(str(len(self.spacecraft.hardpoints)))
+
+        # Updating the number of turrets per model
+        turret_dict = dict()
+        for model in self.model_dict.keys():
+            turret_dict[model] = 0
+
+        for hardpoint in self.spacecraft.hardpoints:
+            if hardpoint.turret is not None:
+                name = hardpoint.turret.name
+                turret_dict[name] = turret_dict.get(name) + 1
+
+        for model in turret_dict.keys():
+            self.model_dict[model].setText(str(turret_dict.get(model)))
+
+        # Updating the number of turret weapons
+        wep_dict = dict()
+        for model in self.weapon_dict.keys():
+            wep_dict[model] = 0
+
+        for hardpoint in self.spacecraft.hardpoints:
+            if hardpoint.turret is not None:
+                for wep in hardpoint.turret.weapons:
+                    if wep is not None and hardpoint.turret.name != "Bay Weapon":
+                        name = wep.get("name")
+                        wep_dict[name] = wep_dict.get(name) + 1
+
+        for weapon in wep_dict.keys():
+            self.weapon_dict[weapon].setText(str(wep_dict.get(weapon)))
+
+        # Updating the number of bay weapons
+        wep_dict = dict()
+        for model in self.bay_dict.keys():
+            wep_dict[model] = 0
+
+        for hardpoint in self.spacecraft.hardpoints:
+            if hardpoint.turret is not None:
+                for wep in hardpoint.turret.weapons:
+                    if wep is not None and hardpoint.turret.name == "Bay Weapon":
+                        name = wep.get("name")
+                        wep_dict[name] = wep_dict.get(name) + 1
+
+        for weapon in wep_dict.keys():
+            self.bay_dict[weapon].setText(str(wep_dict.get(weapon)))
+
+        # Setting current total cost and tonnage
+        cost = 0
+        tonnage = 0
+        for hardpoint in self.spacecraft.hardpoints:
+            cost += hardpoint.get_cost()
+            tonnage += hardpoint.get_tonnage()
+        self.hardpoint_cost.setText(str(round(cost, 2)))
+        self.hardpoint_ton.setText(str(tonnage))
+
+    def edit_tonnage(self):
+        """
+        Update the spacecraft tonnage
+        Updates the Drives to the lowest available type at that tonnage level
+        """
+        new_tonnage = int(self.tonnage_box.currentText())
+
+        # Return if the tonnage is the same
+        if new_tonnage == self.spacecraft.tonnage:
+            return
+
+        # Set tonnage on the spacecraft object
+        self.spacecraft.set_tonnage(new_tonnage)
+
+        # Checks for updating the drive, if necessary
+        if new_tonnage != 0 and (self.spacecraft.jdrive is not None or self.spacecraft.mdrive is not None):
+            lowest_drive = self.spacecraft.get_lowest_drive()
+
+            if self.spacecraft.jdrive is not None:
+                self.jump_line_edit.setText(lowest_drive)
+                self.edit_jdrive()
+            if self.spacecraft.mdrive is not None:
+                self.thrust_line_edit.setText(lowest_drive)
+                self.edit_mdrive()
+            if self.spacecraft.pplant is not None and self.spacecraft.pplant.type != lowest_drive:
+                self.pplant_line_edit.setText(lowest_drive)
+                self.edit_pplant()
+
+        # Update hardpoint counter
+        self.total_hp.setText(str(self.spacecraft.num_hardpoints))
+        self.avail_hp.setText(str(self.spacecraft.num_hardpoints - len(self.spacecraft.hardpoints)))
+
+        # Update stats
+        self.update_stats()
+
+    def edit_discount(self):
+        """
+        Update the discount factor of the ship
+        """
+        val = int(self.discount.text())
+        self.spacecraft.set_discount(val)
+        self.update_stats("hull")
+
+    def edit_fuel(self):
+        """
+        Update the spacecraft max fuel
+        """
+        new_fuel = int(self.fuel_line_edit.text())
+        self.spacecraft.set_fuel(new_fuel)
+
+    def edit_jdrive(self):
+        """
+        Update the spacecraft jump drive
+        """
+        drive_type = self.jump_line_edit.text().upper()
+        if self.check_valid_type(drive_type):
+            new_jdrive = JDrive(drive_type)
+            result = self.spacecraft.add_jdrive(new_jdrive)
+            if type(result) is str:
+                self.logger.setText(result)
+            else:
+                self.jump_label.setText(drive_type)
+        self.update_stats("drives")
+
+    def edit_mdrive(self):
+        """
+        Update the spacecraft thrust drive
+        """
+        drive_type = self.thrust_line_edit.text().upper()
+        if self.check_valid_type(drive_type):
+            new_mdrive = MDrive(drive_type)
+            result = self.spacecraft.add_mdrive(new_mdrive)
+            if type(result) is str:
+                self.logger.setText(result)
+            else:
+                self.thrust_label.setText(drive_type)
+        self.update_stats("drives")
+
+    def edit_pplant(self):
+        """
+        Update the spacecraft pplant drive
+        """
+        pplant_type = self.pplant_line_edit.text().upper()
+        if self.check_valid_type(pplant_type):
+            new_pplant = PPlant(pplant_type)
+            result = self.spacecraft.add_pplant(new_pplant)
+            if type(result) is bool:
+                self.pplant_label.setText(pplant_type)
+            elif type(result) is str:
+                self.logger.setText(result)
+        self.update_stats("drives")
+
+    def check_valid_type(self, drive):
+        """
+        Checks whether input to the Drives is valid or not
+        :param type: Type input to check
+        :return: True iff it meets all criterion
+        """
+        return drive.isalpha() and len(drive) == 1 and drive != "I" and drive != "O"
+
+    def edit_armor(self):
+        """
+        Add a new armor piece to the ship, creating a new button in the grid and adjusting values
+        """
+        armor_type = self.armor_combo_box.currentText()
+        self.armor_combo_box.setCurrentIndex(0)
+
+        # Error checking for invalid ship states
+        if armor_type == "---":
+            self.display_armor()
+            return
+
+        # Creating new armor object and adding to ship
+        armor = Armour(armor_type)
+        self.spacecraft.add_armour(armor)
+
+        # Button to handle removing the piece of armor
+        self.display_armor()
+
+    def remove_armor(self, armor):
+        """
+        Handles removing a piece of armor from the ship, as well as updating GUI to reflect changes
+        :param armor: armour object to remove
+        """
+        self.spacecraft.remove_armour(armor)
+        self.display_armor()
+
+    @instrument.timed("gui.display_armor")
+    def display_armor(self):
+        """ Handles reconciling the armor column with the armour on the ship """
+        self.armor_rows.reconcile(self.spacecraft.armour)
+        self.update_stats("armour")
+
+    def build_armor_row(self, armor):
+        """
+        Creates the button for a piece of armor, which removes it on click
+        :param armor: armour object
+        :return: row of (widget, column, column span)
+        """
+        button = QPushButton()
+        button.setCheckable(True)
+        button.setText("{} - Protect: {}".format(armor.type, armor.protection))
+        self.connect_armor(armor, button)
+        return [(button, 0, -1)]
+
+    def connect_armor(self, armor, button):
+        """ Helper function for the lambda button connections"""
+        button.clicked.connect(lambda: self.remove_armor(armor))
+
+    def edit_hull_config(self):
+        """
+        Handles editing the hull config with a new one, adjusting the GUI and values
+        """
+        text = self.hull_config_box.currentText()
+        config = Config(text)
+        self.spacecraft.edit_hull_config(config)
+
+        # Distributed hulls can't have fuel scoops
+        if config.type == "Distributed":
+            self.fuel_scoop.setDisabled(True)
+        else:
+            self.fuel_scoop.setEnabled(True)
+
+        # Streamlined hulls have scoops built in. Set fuel scoops to unchecked on config swap
+        if config.type == "Streamlined":
+            self.fuel_scoop.setChecked(True)
+        else:
+            self.fuel_scoop.setChecked(False)
+
+        self.update_stats("hull")
+
+    def check_bridge(self):
+        # Handles bridge checkbox
+        self.spacecraft.set_bridge()
+        self.update_stats("hull")
+
+    def modify_hull_option(self, box):
+        # Handles adding/removing a hull option
+        opt_type = box.text()
+
+        option = Option(opt_type)
+        self.spacecraft.modify_hull_option(option)
+        self.update_stats("options")
+
+    def modify_screen(self, box):
+        # Handles adding/removing a screen
+        screen_type = box.text()
+
+        screen = Screen(screen_type)
+        self.spacecraft.modify_screen(screen)
+        self.update_stats("screens")
+
+    def edit_sensors(self):
+        # Handles adding sensor suite to ships
+        sensor_type = self.sensors.currentText()
+        sensor = Sensor(sensor_type)
+
+        self.spacecraft.add_sensors(sensor)
+        self.update_stats("hull")
+
+    """ COMPUTER/SOFTWARE FUNCTIONS """
+    def edit_computer(self):
+        # Handles adding/removing computers to a ship
+        computer_type = self.computers.currentText()
+
+        # Checking for whether the computer was removed or not
+        if computer_type == "---":
+            computer = None
+        else:
+            computer = Computer(computer_type)
+
+        # Uncheck customization options
+        self.jump_control_spec.setChecked(False)
+        self.hardened_system.setChecked(False)
+
+        # Adding computer to ship, updating stats
+        self.spacecraft.add_computer(computer)
+        self.update_stats("computer")
+
+    def modify_computer_addon(self, name):
+        # Handles modifying the spacecraft's computer addon
+        if self.spacecraft.computer is not None:
+            self.spacecraft.computer.modify_addon(name)
+        self.update_stats("computer")
+
+    def add_software(self, box):
+        """
+        Handles adding new software to the GUI
+        :param box: software box of the GUI, self.software_box
+        """
+        # If there are no items left
+        if box.count() == 0 or box.currentText() == "---":
+            return
+
+        # Get software to add and add base level to ship
+        software_name = box.currentText()
+        software = Software(software_name, self.catalog.base_levels.get(software_name))
+        self.spacecraft.modify_software(software)
+
+        # Remove software from combobox
+        self.software_filter.set_excluded(software.type for software in self.spacecraft.software)
+        box.setCurrentIndex(0)
+
+        # Add ship, display software, update stats
+        self.display_software()
+        self.update_stats("software")
+
+    def remove_software(self, label):
+        """
+        Handles removing the GUI elements on "Remove" button click
+        :param label: QLabel of that row
+        """
+        software_name = label.text()
+        self.spacecraft.remove_software(software_name)
+
+        # Redisplay software
+        self.display_software()
+
+        # Adding item back to combobox
+        self.software_filter.set_excluded(software.type for software in self.spacecraft.software)
+        self.update_stats("software")
+
+    @instrument.timed("gui.display_software")
+    def display_software(self):
+        """ Handles reconciling the software rows with the software on the ship """
+        self.software_rows.reconcile(self.spacecraft.software)
+
+    def build_software_row(self, software):
+        """
+        Creates the GUI elements for a newly added piece of software
+        :param software: software object
+        :return: row of (widget, column, column span)
+        """
+        software_name = software.type
+        software_label = QLabel(software_name)
+        software_combobox = QComboBox()
+        software_button = QPushButton("Remove")
+
+        # Connect software func
+        self.connect_software_func(software, software_combobox, software_name, software_label, software_button)
+        return [(software_label, 0, 1), (software_combobox, 1, 1), (software_button, 2, 1)]
+
+    @staticmethod
+    def update_software_row(software, cells):
+        # Sets the level box of a kept software row without writing back to the ship
+        combobox = cells[1][0]
+        if combobox.currentText() != str(software.level):
+            was_blocked = combobox.blockSignals(True)
+            combobox.setCurrentText(str(software.level))
+            combobox.blockSignals(was_blocked)
+
+    def connect_software_func(self, software, combobox, name, label, button):
+        """ Helper function to connect lambdas to GUI """
+        # Build the combobox
+        combobox.setModel(self.catalog.levels.get(name))
+
+        # Set currentText to level of the software and connect combobox functionality
+        combobox.setCurrentText(str(software.level))
+        self.connect_software_modify(combobox, name, label)
+
+        # Button functionality
+        button.clicked.connect(lambda: self.remove_software(label))
+
+    def connect_software_modify(self, combobox, name, label):
+        """ Helper to the helper for connecting the software level combobox """
+        combobox.currentTextChanged.connect(lambda: self.modify_software_level(label, combobox))
+
+    def modify_software_level(self, label, box):
+        """
+        Modifies the level of an already added software piece, removing if the level is '-'
+        :param label: QLabel of that row
+        :param box: QComboBox of that software
+        """
+        # Get software name/level
+        software_level = box.currentText()
+        software_name = label.text()
+
+        # Create software, add it to ship
+        software = Software(software_name, software_level)
+        self.spacecraft.modify_software(software)
+
+        self.update_stats("software")
+
+    """ MISC FUNCTIONS """
+    def add_misc(self, box):
+        """
+        Handles adding new misc items to the GUI
+        :param box: misc box of the GUI, self.misc_box
+        """
+        # If there are no items left or trying to add invalid item
+        invalids = [" ", "--- Living ---", "--- Vehicles ---", "--- Drones ---"]
+        if box.count() == 0 or box.currentText() in invalids:
+            return
+
+        # Removing item from misc list, adding to ship
+        misc_name = box.currentText()
+        self.spacecraft.modify_misc(Misc(misc_name, 1))
+        self.misc_filter.set_excluded(misc.name for misc in self.spacecraft.misc)
+
+        # Display misc items, set box index to 0
+        self.display_misc_items()
+        self.misc_box.setCurrentIndex(0)
+        self.update_stats("misc")
+
+    def remove_misc(self, label):
+        """
+        Handles removing the misc item from the GUI on button click
+        :param label: QLabel
+        """
+        misc_name = label.text()
+
+        # Remove item from spacecraft
+        self.spacecraft.remove_misc(misc_name)
+
+        # Redisplay misc items
+        self.display_misc_items()
+
+        # Adding item back to combobox, in its catalog place
+        self.misc_filter.set_excluded(misc.name for misc in self.spacecraft.misc)
+        self.update_stats("misc")
+
+    def modify_misc_item(self, label, line):
+        """
+        Handles altering the spacecraft with updated misc item on item change
+        :param label: QLabel of misc item
+        :param line: QLineEdit, quantity of item
+        """
+        name = label.text()
+        num_misc = line.text()
+
+        # Create item, add to ship
+        misc = Misc(name, int(num_misc))
+        self.spacecraft.modify_misc(misc)
+        self.update_stats("misc")
+
+    @instrument.timed("gui.display_misc_items")
+    def display_misc_items(self):
+        """ Function that handles reconciling the misc GUI elements with the misc items on the ship """
+        self.misc_rows.reconcile(self.spacecraft.misc)
+
+    def build_misc_row(self, misc):
+        """
+        Creates the GUI elements for a misc item
+        :param misc: misc object
+        :return: row of (widget, column, column span)
+        """
+        label = QLabel(misc.name)
+
+        line_edit = QLineEdit()
+        line_edit.setFixedWidth(25)
+        line_edit.setValidator(QIntValidator(line_edit))
+        line_edit.validator().setBottom(0)
+        line_edit.setText(str(misc.num))
+
+        button = QPushButton("Remove")
+
+        # Connecting functionality
+        self.connect_misc_item(label, line_edit, button)
+        return [(label, 0, 1), (line_edit, 1, 1), (button, 2, 1)]
+
+    @staticmethod
+    def update_misc_row(misc, cells):
+        # Sets the quantity of a kept misc row
+        line_edit = cells[1][0]
+        if line_edit.text() != str(misc.num):
+            line_edit.setText(str(misc.num))
+
+    def connect_misc_item(self, label, line_edit, button):
+        """ Helper function that handle connecting the lambda functions for GUI elements """
+        line_edit.editingFinished.connect(lambda: self.modify_misc_item(label, line_edit))
+        button.clicked.connect(lambda: self.remove_misc(label))
+
+    def modify_fuel_scoops(self):
+        # Flips the fuel scoop box
+        self.spacecraft.modify_fuel_scoops()
+        self.update_stats("hull")
+
+    """ HARDPOINT/TURRET FUNCTIONS """
+    def add_hardpoint(self):
+        """
+        Handles adding a hardpoint to the ship as a new row of the hardpoint table
+        """
+        name = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(5))
+        self.hardpoint_model.add_hardpoint(Hardpoint(name))
+
+        # Update stats
+        self.avail_hp.setText(str(self.spacecraft.num_hardpoints - len(self.spacecraft.hardpoints)))
+
+    def remove_hardpoint(self, hardpoint):
+        """
+        Handles the functionality of removing a single hardpoint from the ship and table
+        :param hardpoint: hardpoint class
+        """
+        self.hardpoint_model.remove_hardpoint(hardpoint)
+
+        # Update stats
+        self.avail_hp.setText(str(self.spacecraft.num_hardpoints - len(self.spacecraft.hardpoints)))
+
+    def remove_selected_hardpoints(self):
+        # Removes the hardpoints of the rows selected in the table
+        rows = self.hardpoint_view.selectionModel().selectedRows()
+        hardpoints = [self.spacecraft.hardpoints[self.hardpoint_proxy.mapToSource(row).row()] for row in rows]
+        for hardpoint in hardpoints:
+            self.remove_hardpoint(hardpoint)
+
+
+def main(argv=None):
+    """
+    Opens the shipyard window and runs the Qt event loop
+    :param argv: command line arguments for Qt, defaults to sys.argv
+    :return: exit code of the event loop
+    """
+    app = QApplication(sys.argv if argv is None else argv)
+    window = Window()
+
+    # Different checking needed depending on local build or executable run
+    if os.path.exists("IS-logo.png"):
+        window.setWindowIcon(QIcon('IS-logo.png'))
+    else:
+        window.setWindowIcon(QIcon('images/IS-logo.png'))
+    window.show()
+    window.offer_recovery()
+    return app.exec_()
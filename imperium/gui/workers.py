@@ -0,0 +1,80 @@
+"""
+@file workers.py
+
+Running the jobs of imperium.shipyard.jobs on a thread pool, handing their results to the GUI thread
+"""
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+# Seconds between batches of results handed from a worker to the GUI thread
+WORKER_INTERVAL = 0.05
+
+
+class WorkerSignals(QObject):
+    """ Signals of a Worker. They are emitted on the pool thread and delivered on the GUI thread """
+    results  = pyqtSignal(list)         # batch of results
+    progress = pyqtSignal(int, int)     # results so far and the expected total, 0 if unknown
+    error    = pyqtSignal(str)
+    finished = pyqtSignal(bool)         # whether the job ran to its end
+
+
+class Worker(QRunnable):
+    """
+    Runs a job generator from imperium.shipyard.jobs on a thread pool thread. Results are handed to
+    the GUI thread in batches at most every interval seconds, so a job of any length only costs the
+    event loop a few signals a second. Cancelling stops the job before its next step
+
+    :param job: generator function yielding one result per step
+    :param args: arguments for the job
+    :param total: expected number of results, 0 if unknown
+    :param interval: seconds between batches
+    """
+    def __init__(self, job, *args, total=0, interval=WORKER_INTERVAL):
+        super(Worker, self).__init__()
+        self.job        = job
+        self.args       = args
+        self.total      = total
+        self.interval   = interval
+        self.signals    = WorkerSignals()
+        self._cancelled = threading.Event()
+
+        # The window keeps the worker until it finishes, rather than the pool deleting it
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        # Asks the job to stop before its next step
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        done = 0
+        batch = list()
+        last = time.monotonic()
+        completed = False
+
+        try:
+            for result in self.job(*self.args):
+                done += 1
+                batch.append(result)
+                if self._cancelled.is_set():
+                    break
+
+                now = time.monotonic()
+                if now - last >= self.interval:
+                    self.signals.results.emit(batch)
+                    self.signals.progress.emit(done, self.total)
+                    batch = list()
+                    last = now
+            else:
+                completed = True
+        except Exception as error:
+            self.signals.error.emit("Error: {} failed - {!r}".format(self.job.__name__, error))
+
+        if batch:
+            self.signals.results.emit(batch)
+            self.signals.progress.emit(done, self.total)
+        self.signals.finished.emit(completed)
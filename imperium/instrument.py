@@ -0,0 +1,151 @@
+"""
+@file instrument.py
+
+Opt-in counters and timers on the hot paths: catalog reads, ship totals, the window's stats refresh
+and list rebuilds, widgets built and deleted, and SRD loads and saves. Set IMPERIUM_INSTRUMENT to
+turn them on; the totals are printed to stderr as the program exits, or written to the file the
+variable names (as JSON if it ends in .json)
+
+Instrumentation is decided once, as this module is imported. While it is off the decorators hand
+back the function unchanged and counting is a single flag test, so the hot paths pay nothing
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+
+# Environment variable that turns instrumentation on, "1" to print on exit or a file to write to
+INSTRUMENT_ENV = "IMPERIUM_INSTRUMENT"
+
+ENABLED = os.environ.get(INSTRUMENT_ENV, "") not in ("", "0")
+
+# Counts by name, and timers by name as [calls, total seconds, longest seconds]
+counters = dict()
+timers = dict()
+
+
+def count(name, amount=1):
+    """
+    Adds to a counter, doing nothing while instrumentation is off
+    :param name: counter name, "area.what" by convention
+    :param amount: amount to add
+    """
+    if ENABLED:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def record(name, seconds):
+    # Adds a timing to a timer
+    timer = timers.get(name)
+    if timer is None:
+        timers[name] = [1, seconds, seconds]
+    else:
+        timer[0] += 1
+        timer[1] += seconds
+        if seconds > timer[2]:
+            timer[2] = seconds
+
+
+def counted(name):
+    """
+    Counts the calls of a function while instrumentation is on
+    :param name: counter name
+    :return: decorator, which leaves the function untouched while instrumentation is off
+    """
+    def decorate(funct):
+        if not ENABLED:
+            return funct
+
+        @functools.wraps(funct)
+        def wrapper(*args, **kwargs):
+            counters[name] = counters.get(name, 0) + 1
+            return funct(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed(name):
+    """
+    Counts and times the calls of a function while instrumentation is on
+    :param name: timer name
+    :return: decorator, which leaves the function untouched while instrumentation is off
+    """
+    def decorate(funct):
+        if not ENABLED:
+            return funct
+
+        @functools.wraps(funct)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return funct(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """
+    Copies the counters and timers as they stand
+    :return: dictionary of counters, and of timers with their calls, total, mean and longest in seconds
+    """
+    return {
+        "counters": dict(sorted(counters.items())),
+        "timers": {name: {"calls": calls, "total": total, "mean": total / calls, "max": longest}
+                   for name, (calls, total, longest) in sorted(timers.items())}
+    }
+
+
+def reset():
+    # Zeroes every counter and timer
+    counters.clear()
+    timers.clear()
+
+
+def format_report(state, limit=None):
+    """
+    Formats counters and timers as a table, timers slowest in total first
+    :param state: dictionary from snapshot
+    :param limit: most rows of each kind to list, None for all
+    :return: list of lines
+    """
+    lines = ["{:<44} {:>8} {:>10} {:>10} {:>10}".format("timer", "calls", "total ms", "mean ms", "max ms")]
+    ranked = sorted(state['timers'].items(), key=lambda item: item[1]['total'], reverse=True)
+    for name, timer in ranked[:limit]:
+        lines.append("{:<44} {:>8} {:>10.2f} {:>10.3f} {:>10.2f}".format(
+            name, timer['calls'], timer['total'] * 1000, timer['mean'] * 1000, timer['max'] * 1000))
+
+    lines.append("{:<44} {:>8}".format("counter", "count"))
+    ranked = sorted(state['counters'].items(), key=lambda item: item[1], reverse=True)
+    for name, value in ranked[:limit]:
+        lines.append("{:<44} {:>8}".format(name, value))
+    return lines
+
+
+def dump(target=None):
+    """
+    Writes out the counters and timers, as registered to run on exit
+    :param target: file to write, JSON if it ends in .json, or None for the file IMPERIUM_INSTRUMENT
+                   names, printing to stderr if it only turns instrumentation on
+    """
+    if target is None:
+        target = os.environ.get(INSTRUMENT_ENV, "")
+        if target == "1":
+            target = None
+
+    state = snapshot()
+    if target is None:
+        print("\n".join(["Instrumentation:"] + format_report(state)), file=sys.stderr)
+    elif target.endswith(".json"):
+        with open(target, 'w') as f:
+            json.dump(state, f, indent=1)
+    else:
+        with open(target, 'w') as f:
+            f.write("\n".join(format_report(state)) + "\n")
+
+
+if ENABLED:
+    atexit.register(dump)
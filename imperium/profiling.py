@@ -0,0 +1,138 @@
+"""
+@file profiling.py
+
+Profiling a whole run of the shipyard or one of its tools, chosen with --profile on the command line.
+cProfile gives exact call counts and times as a pstats file; the sampler reads every thread's stack
+on a timer instead, costing far less, and writes collapsed stacks for flame graph tools such as
+flamegraph.pl or speedscope
+"""
+import cProfile
+import collections
+import os
+import pstats
+import sys
+import threading
+import time
+
+# Profilers --profile chooses between, cProfile being the default
+PROFILE_MODES = ("cprofile", "sample")
+
+# Seconds between samples of the sampling profiler
+SAMPLE_INTERVAL = 0.001
+
+# Files whose functions only wait, so a thread stopped in one of them is idle rather than busy
+IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+# Rows of the summary printed once a profile is written
+SUMMARY_ROWS = 20
+
+
+def frame_label(frame):
+    # Names a stack frame as flame graphs show it, function then file and line it starts on
+    code = frame.f_code
+    return "{} ({}:{})".format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+
+
+class Sampler:
+    """
+    Sampling profiler reading the stack of every other thread each interval from a thread of its own
+    Stacks are counted root first, under the name of their thread, so worker jobs show apart from
+    the GUI thread. Threads waiting on a lock or queue are left out unless idle is set, as they
+    would otherwise outweigh the work in a flame graph
+
+    :param interval: seconds between samples
+    :param idle: whether to count the stacks of waiting threads
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL, idle=False):
+        self.interval = interval
+        self.idle     = idle
+        self.stacks   = collections.Counter()   # (thread name, frame labels...) -> samples
+        self.samples  = 0                       # number of times the threads were read
+        self.running  = threading.Event()
+        self.thread   = None
+
+    def start(self):
+        # Starts sampling in the background
+        self.running.set()
+        self.thread = threading.Thread(target=self.run, name="imperium-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        # Stops sampling, waiting for the last sample to be taken
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join()
+
+    def run(self):
+        own = threading.get_ident()
+        while self.running.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (not self.idle and os.path.basename(frame.f_code.co_filename) in IDLE_FILES):
+                    continue
+                labels = list()
+                while frame is not None:
+                    labels.append(frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, "thread-{}".format(ident)))
+                self.stacks[tuple(reversed(labels))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def write_collapsed(self, path):
+        """
+        Writes the stacks in the collapsed format of flamegraph.pl, a line of frames joined by ";" and
+        the number of samples per stack
+        :param path: file to write
+        """
+        with open(path, 'w') as f:
+            for stack, samples in sorted(self.stacks.items()):
+                f.write("{} {}\n".format(";".join(label.replace(";", ":") for label in stack), samples))
+
+    def leaves(self):
+        """
+        Totals the samples of each innermost frame, where the time was spent
+        :return: list of (frame label, samples), most sampled first
+        """
+        leaves = collections.Counter()
+        for stack, samples in self.stacks.items():
+            leaves[stack[-1]] += samples
+        return leaves.most_common()
+
+
+def profile_call(funct, mode="cprofile", output="profile", out=None):
+    """
+    Runs a function under a profiler, writing the profile when it returns or raises
+    :param funct: function taking no arguments
+    :param mode: "cprofile" to write output.pstats, "sample" to write output.collapsed
+    :param output: path of the profile without its extension
+    :param out: stream the summary and file name are printed to, stderr if None
+    :return: what the function returns
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError("Error: unknown profile mode {}, expected one of {}".format(mode, ", ".join(PROFILE_MODES)))
+    out = out or sys.stderr
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return funct()
+        finally:
+            profiler.disable()
+            path = output + ".pstats"
+            profiler.dump_stats(path)
+            print("Profile written to {}".format(path), file=out)
+            pstats.Stats(path, stream=out).sort_stats("cumulative").print_stats(SUMMARY_ROWS)
+
+    sampler = Sampler()
+    sampler.start()
+    try:
+        return funct()
+    finally:
+        sampler.stop()
+        path = output + ".collapsed"
+        sampler.write_collapsed(path)
+        print("Profile written to {}, {} samples".format(path, sampler.samples), file=out)
+        for label, samples in sampler.leaves()[:SUMMARY_ROWS]:
+            print("  {:>6} {}".format(samples, label), file=out)
@@ -0,0 +1,227 @@
+"""
+@file scenarios.py
+
+Scripted sessions in the shipyard, run the same way every time so profiles and timings taken on
+different versions compare like for like. A scenario is a function of a Steps timer and a scratch
+directory, either one of the built in scenarios or a run(steps, directory) function in a .py file
+
+    python -m imperium --profile scenario defaults
+    python -m imperium scenario my_session.py --repeat 5
+"""
+import argparse
+import os
+import random
+import runpy
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from imperium.classes.hardpoint import Hardpoint
+from imperium.classes.json_reader import get_file_data
+from imperium.classes.turrets import Turret
+from imperium.shipyard.fileloader import FileLoader
+
+DEFAULT_MODELS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shipyard/models/default")
+
+# Hardpoints added to every ship by the built in scenarios, and the turret fitted to them
+ADDED_HARDPOINTS = 10
+ADDED_TURRET = "Triple Turret"
+
+# Seed of the random ids given to new hardpoints, so every run builds the same ships
+SEED = 0
+
+# The application of the GUI scenarios, created on first use and kept for the later runs
+_app = None
+
+
+class Steps:
+    """
+    Times the named steps of a scenario, totalling the steps repeated per ship
+    """
+    def __init__(self):
+        self.times = dict()     # step name -> [calls, total seconds]
+
+    @contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            step = self.times.setdefault(name, [0, 0.0])
+            step[0] += 1
+            step[1] += elapsed
+
+    def report(self):
+        """
+        Formats the steps as a table in the order they were first taken
+        :return: list of lines
+        """
+        lines = ["{:<20} {:>8} {:>10}".format("step", "calls", "total ms")]
+        for name, (calls, total) in self.times.items():
+            lines.append("{:<20} {:>8} {:>10.2f}".format(name, calls, total * 1000))
+        return lines
+
+
+def default_ships():
+    # Paths of the default designs, in name order
+    return [os.path.join(DEFAULT_MODELS, filename) for filename in sorted(os.listdir(DEFAULT_MODELS))
+            if filename.endswith(".srd")]
+
+
+def next_tonnage(tonnage):
+    """
+    Finds the next hull size up, or the one below for the largest hull, so every ship changes size
+    :param tonnage: current tonnage
+    :return: tonnage of the next hull size
+    """
+    sizes = sorted(hull.get("tonnage") for hull in get_file_data("hull_data.json").values())
+    larger = [size for size in sizes if size > tonnage]
+    if larger:
+        return larger[0]
+    return max(size for size in sizes if size < tonnage)
+
+
+def armed_hardpoint(name):
+    # A new hardpoint with a turret, as added by the scenarios
+    hardpoint = Hardpoint(name)
+    hardpoint.add_turret(Turret(ADDED_TURRET))
+    return hardpoint
+
+
+def defaults(steps, directory):
+    """
+    Loads every default ship, moves it to the next hull size, adds ten turreted hardpoints, totals it
+    and saves it, through the classes the GUI drives
+    :param steps: Steps timer
+    :param directory: scratch directory the ships are saved to
+    """
+    fileloader = FileLoader()
+    for path in default_ships():
+        with steps("load"):
+            spacecraft = fileloader.load_spacecraft(path)
+        with steps("edit tonnage"):
+            spacecraft.set_tonnage(next_tonnage(spacecraft.tonnage))
+        with steps("add hardpoints"):
+            for idx in range(ADDED_HARDPOINTS):
+                spacecraft.add_hardpoint(armed_hardpoint("ADD{:02d}".format(idx)))
+        with steps("totals"):
+            spacecraft.get_total_cost()
+            spacecraft.get_remaining_cargo()
+        with steps("save"):
+            fileloader.save_model(os.path.join(directory, os.path.basename(path)), spacecraft)
+
+
+def defaults_gui(steps, directory):
+    """
+    The defaults scenario through the window's own handlers, with the stats refreshed after each
+    step as the event loop would. Runs on Qt's offscreen platform unless another is chosen, keeping
+    the window's recovery file in the scratch directory
+    :param steps: Steps timer
+    :param directory: scratch directory the ships are saved to
+    """
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from imperium.gui.window import Window
+
+    if QApplication.instance() is None:
+        _app = QApplication([sys.argv[0]])
+    app = QApplication.instance()
+    with steps("window"):
+        window = Window()
+        window.build_panels()
+
+    # Opening a design discards the recovery file, which must not be the user's own
+    window.autosaver.path = os.path.join(directory, "recovery.srd")
+
+    try:
+        for path in default_ships():
+            with steps("load"):
+                window.open_design((path, None))
+                window.flush_stats()
+            with steps("edit tonnage"):
+                window.tonnage_box.setCurrentText(str(next_tonnage(window.spacecraft.tonnage)))
+                window.edit_tonnage()
+                window.flush_stats()
+            with steps("add hardpoints"):
+                for _ in range(ADDED_HARDPOINTS):
+                    window.add_hardpoint()
+                window.flush_stats()
+            with steps("save"):
+                window.fileloader.save_model(os.path.join(directory, os.path.basename(path)), window.spacecraft)
+            app.processEvents()
+    finally:
+        window.close()
+
+
+# Built in scenarios by name, with their help line
+SCENARIOS = {
+    "defaults": (defaults, "load, resize, arm, total and save every default ship"),
+    "defaults-gui": (defaults_gui, "the defaults scenario through the shipyard window"),
+}
+
+
+def get_scenario(name):
+    """
+    Finds a scenario by name, or loads run() from a .py file
+    :param name: built in scenario name or path to a Python file
+    :return: scenario function
+    """
+    if name in SCENARIOS:
+        return SCENARIOS[name][0]
+    if name.endswith(".py") and os.path.isfile(name):
+        scenario = runpy.run_path(name).get("run")
+        if not callable(scenario):
+            raise ValueError("Error: {} has no run(steps, directory) function".format(name))
+        return scenario
+    raise ValueError("Error: unknown scenario '{}', expected one of {} or a .py file".format(
+        name, ", ".join(SCENARIOS)))
+
+
+def run_scenario(scenario, repeat=1, directory=None):
+    """
+    Runs a scenario, reseeding the random ids before every run
+    :param scenario: scenario function
+    :param repeat: number of runs
+    :param directory: directory the scenario saves to, a temporary one removed afterwards if None
+    :return: Steps timer totalled over the runs
+    """
+    steps = Steps()
+    with tempfile.TemporaryDirectory() as scratch:
+        for _ in range(repeat):
+            random.seed(SEED)
+            scenario(steps, directory or scratch)
+    return steps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scripted shipyard session, such as for profiling")
+    parser.add_argument("scenario", nargs="?", default="defaults",
+                        help="built in scenario or .py file with a run(steps, directory) function")
+    parser.add_argument("--repeat", type=int, default=1, help="number of runs")
+    parser.add_argument("--out", help="directory to save the ships to, a temporary one by default")
+    parser.add_argument("--list", action="store_true", help="list the built in scenarios and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, description) in SCENARIOS.items():
+            print("{:<14} {}".format(name, description))
+        return 0
+
+    try:
+        scenario = get_scenario(args.scenario)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    steps = run_scenario(scenario, args.repeat, args.out)
+    print("\n".join(steps.report()))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
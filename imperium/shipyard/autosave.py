@@ -0,0 +1,111 @@
+"""
+@file autosave.py
+
+Background autosave of the ship being edited. Snapshots are written to a recovery file on a
+worker thread so saving never holds up the GUI, and can be offered back on the next start
+"""
+from imperium.shipyard.fileloader import ENCODER, atomic_write
+import os
+import threading
+
+# Environment variable that overrides where recovery files are kept
+RECOVERY_DIR_ENV = "IMPERIUM_RECOVERY_DIR"
+
+
+def get_recovery_path():
+    """
+    Gets the path of the recovery file, under ~/.imperium-shipyard unless overridden by
+    the IMPERIUM_RECOVERY_DIR environment variable
+    :return: full path to the recovery file
+    """
+    directory = os.environ.get(RECOVERY_DIR_ENV)
+    if directory is None:
+        directory = os.path.join(os.path.expanduser("~"), ".imperium-shipyard")
+    return os.path.join(directory, "recovery.srd")
+
+
+class AutoSaver:
+    """
+    Writes SRD snapshots to a recovery file on a background thread
+    A snapshot submitted while another is waiting replaces it, so rapid edits coalesce into one write
+
+    :param path: full path to the recovery file, defaults to get_recovery_path()
+    """
+    def __init__(self, path=None):
+        self.path       = path if path is not None else get_recovery_path()
+        self.saves      = 0         # number of snapshots written
+        self.failures   = 0         # number of snapshots that failed to write
+        self._pending   = None      # latest snapshot waiting to be written
+        self._busy      = False     # whether a snapshot is being written
+        self._running   = True
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, model):
+        """
+        Queues a snapshot to be written, replacing any snapshot still waiting
+        :param model: SRD dictionary of the ship
+        """
+        with self._condition:
+            self._pending = model
+            self._condition.notify_all()
+
+    def _run(self):
+        # Worker loop, writing the latest snapshot whenever one is waiting
+        while True:
+            with self._condition:
+                while self._pending is None and self._running:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+
+                model = self._pending
+                self._pending = None
+                self._busy = True
+
+            written = False
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                atomic_write(self.path, ENCODER.encode(model))
+                written = True
+            except OSError as error:
+                print("Error: autosave to {} failed - {}".format(self.path, error))
+
+            with self._condition:
+                self._busy = False
+                if written:
+                    self.saves += 1
+                else:
+                    self.failures += 1
+                self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every submitted snapshot has been written
+        :param timeout: maximum seconds to wait
+        :return: True if nothing is left to write
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def stop(self):
+        # Finishes writing what was submitted, then shuts the worker thread down
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join()
+
+    def has_recovery(self):
+        # Checks whether a recovery file was left behind
+        return os.path.exists(self.path)
+
+    def discard(self):
+        # Drops any waiting snapshot and removes the recovery file
+        with self._condition:
+            self._pending = None
+        self.flush()
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
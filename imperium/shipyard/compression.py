@@ -0,0 +1,141 @@
+"""
+@file compression.py
+
+Optional compression of SRD files and fleet archives with the stdlib gzip, bz2 and lzma codecs
+Files are read and written through the codecs' streaming file objects, so nothing has to be held
+in memory whole. The codec of a file being read is detected from its leading magic bytes, and the
+codec of a file being written is taken from its extension unless one is given
+
+Compressed files keep their usual name with the codec's extension added, e.g. Corsair.srd.gz
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+
+# Codec names to their leading magic bytes, module and file extension
+CODECS = {
+    "gzip": (b"\x1f\x8b", gzip, ".gz"),
+    "bz2": (b"BZh", bz2, ".bz2"),
+    "lzma": (b"\xfd7zXZ\x00", lzma, ".xz")
+}
+
+# Compression level used for each codec when writing, chosen for streaming speed over size. bz2
+# sets its block size by level, so level 1 also keeps its buffers to 100k rather than 900k
+LEVELS = {
+    "gzip": 6,
+    "bz2": 1,
+    "lzma": 6
+}
+
+# Bytes needed to tell the codecs apart
+MAGIC_SIZE = 6
+
+
+def codec_from_path(path):
+    """
+    Gets the codec named by a file's extension
+    :param path: file path or name
+    :return: codec name, or None for an uncompressed file
+    """
+    for codec, (_, _, extension) in CODECS.items():
+        if path.endswith(extension):
+            return codec
+    return None
+
+
+def codec_from_magic(magic):
+    """
+    Gets the codec whose magic bytes lead the given data
+    :param magic: leading bytes of a file
+    :return: codec name, or None for uncompressed data
+    """
+    for codec, (signature, _, _) in CODECS.items():
+        if magic.startswith(signature):
+            return codec
+    return None
+
+
+def detect_codec(path):
+    """
+    Detects the codec of a file from its leading bytes, whatever it is named
+    :param path: full path to the file
+    :return: codec name, or None for an uncompressed file
+    """
+    with open(path, 'rb') as f:
+        return codec_from_magic(f.read(MAGIC_SIZE))
+
+
+def strip_extension(filename):
+    # Removes a codec extension from a filename, e.g. Corsair.srd.gz -> Corsair.srd
+    codec = codec_from_path(filename)
+    if codec is None:
+        return filename
+    return filename[:-len(CODECS[codec][2])]
+
+
+def is_srd(filename):
+    # Checks whether a filename is a SRD file, compressed or not
+    return strip_extension(filename).endswith(".srd")
+
+
+def srd_stem(filename):
+    # Gets the name of a SRD file without its directory or extensions, e.g. Corsair
+    return os.path.splitext(strip_extension(os.path.basename(filename)))[0]
+
+
+def open_codec(codec, target, mode):
+    # Opens a codec's streaming file object on a path or binary file object
+    module = CODECS[codec][1]
+    if codec == "lzma":
+        if 'r' in mode:
+            return module.open(target, mode)
+        return module.open(target, mode, preset=LEVELS[codec])
+    if 'r' in mode:
+        return module.open(target, mode)
+    return module.open(target, mode, compresslevel=LEVELS[codec])
+
+
+def open_file(path, mode='r', codec=None):
+    """
+    Opens a file that may be compressed, like open(). Reading detects the codec from the file's
+    contents, writing uses the codec given or else the one named by the extension
+    :param path: full path to the file
+    :param mode: 'r', 'w', 'rb' or 'wb'
+    :param codec: codec to write with, None to go by the extension
+    :return: file object, in text mode unless 'b' is in the mode
+    """
+    if 'r' in mode:
+        codec = detect_codec(path)
+    elif codec is None:
+        codec = codec_from_path(path)
+
+    if codec is None:
+        return open(path, mode)
+
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+    return open_codec(codec, path, mode)
+
+
+def open_stream(fileobj, mode='r', codec=None):
+    """
+    Wraps a binary stream such as stdin or stdout in a text stream, decompressing or compressing
+    it on the way. Reading detects the codec from the stream's leading bytes without consuming them
+    :param fileobj: buffered binary file object
+    :param mode: 'r' or 'w'
+    :param codec: codec to write with, None to write uncompressed
+    :return: text file object. Closing it finishes the compressed stream
+    """
+    if 'r' in mode:
+        if not isinstance(fileobj, io.BufferedReader):
+            fileobj = io.BufferedReader(fileobj)
+        codec = codec_from_magic(fileobj.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+
+    if codec is None:
+        stream = fileobj
+    else:
+        stream = open_codec(codec, fileobj, mode[0] + 'b')
+
+    return io.TextIOWrapper(stream, encoding='utf-8')
@@ -0,0 +1,340 @@
+"""
+@file diff.py
+
+Structural diff between two designs. Both ships are broken down into their components with
+Spacecraft.get_components, keyed by section and name (hardpoints by their id), and the two maps are
+compared key by key in linear time. Each change carries its cost, cargo and fuel impact
+
+Libraries can be diffed in bulk, pairing designs by name between two directories of .srd files or
+two .jsonl archives, and writing one JSON change set per line
+
+Usage:
+    python -m imperium.shipyard.diff <old> <new>
+"""
+from imperium.classes.spacecraft import COMPONENT_SECTIONS
+from imperium.shipyard.compression import detect_codec, is_srd, open_file, srd_stem
+from imperium.shipyard.fileloader import DECODER, ENCODER, FileLoader
+from imperium.shipyard.header import read_header
+from imperium.shipyard.schema import hash_model, upgrade
+import argparse
+import json
+import os
+import sys
+
+# Stats compared between designs, taken from Spacecraft.get_stats
+DIFF_STATS = ("tonnage", "cost", "cargo", "fuel", "fuel_jump", "jump", "thrust", "armour", "hardpoints")
+
+# Resources that make up the impact of a change
+IMPACTS = ("cost", "cargo", "fuel")
+
+
+def diff_fields(old, new, prefix=""):
+    """
+    Lists the fields that differ between two nested values, such as a hardpoint and its turret
+    :param old: old value
+    :param new: new value
+    :param prefix: dotted path of the values
+    :return: dictionary of dotted paths to [old, new] pairs
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        fields = dict()
+        for key in sorted(old.keys() | new.keys(), key=str):
+            path = "{}.{}".format(prefix, key) if prefix else str(key)
+            fields.update(diff_fields(old.get(key), new.get(key), path))
+        return fields
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        fields = dict()
+        for idx, (old_item, new_item) in enumerate(zip(old, new)):
+            fields.update(diff_fields(old_item, new_item, "{}.{}".format(prefix, idx)))
+        return fields
+
+    if old != new:
+        return {prefix: [old, new]}
+    return dict()
+
+
+def diff_components(old, new):
+    """
+    Compares two component maps from Spacecraft.get_components
+    Components whose value is unchanged but whose share of the totals moved, such as armour after a
+    tonnage change, are reported as repriced so the impacts always add up to the change in totals
+    :param old: component map of the old design
+    :param new: component map of the new design
+    :return: list of change dictionaries
+    """
+    def change(kind, section, key, old_entry, new_entry):
+        record = {
+            "change": kind,
+            "section": section,
+            "key": key,
+            "old": old_entry['value'] if old_entry is not None else None,
+            "new": new_entry['value'] if new_entry is not None else None,
+            "impact": {
+                name: round((new_entry[name] if new_entry is not None else 0) -
+                            (old_entry[name] if old_entry is not None else 0), 3)
+                for name in IMPACTS
+            }
+        }
+        if kind == "changed" and section == "hardpoints":
+            record['fields'] = diff_fields(old_entry['value'], new_entry['value'])
+        return record
+
+    changes = list()
+    for (section, key), old_entry in old.items():
+        new_entry = new.get((section, key))
+        if new_entry is None:
+            changes.append(change("removed", section, key, old_entry, None))
+        elif old_entry['value'] != new_entry['value']:
+            changes.append(change("changed", section, key, old_entry, new_entry))
+        elif any(round(old_entry[name] - new_entry[name], 6) != 0 for name in IMPACTS):
+            changes.append(change("repriced", section, key, old_entry, new_entry))
+
+    for (section, key), new_entry in new.items():
+        if (section, key) not in old:
+            changes.append(change("added", section, key, None, new_entry))
+
+    return changes
+
+
+def diff_spacecraft(old, new):
+    """
+    Builds the change set between two spacecraft
+    :param old: spacecraft object of the old design
+    :param new: spacecraft object of the new design
+    :return: dictionary of the design names, differing stats and list of changes
+    """
+    return {
+        "old": old.name,
+        "new": new.name,
+        "stats": diff_stats(old.get_stats(), new.get_stats()),
+        "changes": diff_components(old.get_components(), new.get_components())
+    }
+
+
+def diff_stats(old_stats, new_stats):
+    """
+    Compares the DIFF_STATS of two designs
+    :param old_stats: stats dictionary of the old design
+    :param new_stats: stats dictionary of the new design
+    :return: dictionary of the stats that differ to their old and new values and the change
+    """
+    return {
+        stat: {"old": old_stats[stat], "new": new_stats[stat],
+               "delta": round(new_stats[stat] - old_stats[stat], 3)}
+        for stat in DIFF_STATS if old_stats[stat] != new_stats[stat]
+    }
+
+
+class ComponentCache:
+    """
+    Component map of a ship being edited, kept section by section so that after an edit only the
+    sections it touched are listed again. The discount depends on every other section, so is
+    repriced each time from the cached sections
+
+    :param spacecraft: spacecraft object being edited
+    """
+    def __init__(self, spacecraft):
+        self.spacecraft = spacecraft
+        self.sections   = dict()                    # section to its part of the component map
+        self.dirty      = set(COMPONENT_SECTIONS)   # sections to list again
+        self.listed     = 0                         # number of sections listed, for measuring
+
+    def invalidate(self, sections=None):
+        """
+        Marks sections as changed, so they are listed again by the next components call
+        :param sections: iterable of section names, None for every section
+        """
+        self.dirty.update(COMPONENT_SECTIONS if sections is None else sections)
+
+    def set_spacecraft(self, spacecraft):
+        # Points the cache at another ship, every section being listed again
+        self.spacecraft = spacecraft
+        self.invalidate()
+
+    def components(self):
+        """
+        Gets the component map of the ship, listing only the sections changed since the last call
+        :return: component map matching Spacecraft.get_components, and the set of sections listed again
+        """
+        dirty, self.dirty = self.dirty, set()
+        if dirty:
+            for section in dirty:
+                self.sections[section] = dict()
+            for key, entry in self.spacecraft.get_components(dirty).items():
+                self.sections[key[0]][key] = entry
+            self.listed += len(dirty)
+
+        components = dict()
+        for section in COMPONENT_SECTIONS:
+            if section == "hardpoints":
+                components[("hull", "discount")] = {"value": self.spacecraft.discount,
+                                                    "cost": self.spacecraft.get_discount_cost(components),
+                                                    "cargo": 0, "fuel": 0}
+            components.update(self.sections[section])
+        return components, dirty
+
+    def stats(self, components):
+        """
+        Gets the DIFF_STATS of the ship, summing the cost and cargo from its component map rather
+        than walking the ship again
+        :param components: component map from components
+        :return: dictionary of stat names to values, matching Spacecraft.get_stats
+        """
+        spacecraft = self.spacecraft
+        return {
+            "tonnage": spacecraft.tonnage,
+            "cost": round(sum(entry['cost'] for entry in components.values()), 3),
+            "cargo": round(sum(entry['cargo'] for entry in components.values()), 2),
+            "fuel": spacecraft.fuel_max,
+            "fuel_jump": spacecraft.fuel_jump,
+            "jump": spacecraft.jump,
+            "thrust": spacecraft.thrust,
+            "armour": spacecraft.armour_total,
+            "hardpoints": len(spacecraft.hardpoints)
+        }
+
+
+def diff_models(old, new):
+    """
+    Builds the change set between two SRD dictionaries of any supported version
+    :param old: SRD dictionary of the old design
+    :param new: SRD dictionary of the new design
+    :return: change set dictionary from diff_spacecraft
+    """
+    fileloader = FileLoader()
+    return diff_spacecraft(fileloader.decode_model(old), fileloader.decode_model(new))
+
+
+def diff_files(old_path, new_path):
+    """
+    Builds the change set between two SRD files
+    :param old_path: full path to the old file
+    :param new_path: full path to the new file
+    :return: change set dictionary from diff_spacecraft
+    """
+    fileloader = FileLoader()
+    return diff_spacecraft(fileloader.load_spacecraft(old_path), fileloader.load_spacecraft(new_path))
+
+
+def index_source(path):
+    """
+    Indexes the designs in a directory of .srd files or a .jsonl archive by name without keeping
+    them in memory. Archives are indexed by the byte offset of each line, except compressed archives
+    which can't be seeked cheaply and keep each design's line instead
+    Unnamed designs are named after their file, or their position in an archive as the fleet browser lists them
+    :param path: directory or .jsonl file, either of which may be compressed
+    :return: dictionary of design names to (content hash, loader) tuples, where loader reads the design
+    """
+    index = dict()
+
+    def add(name, entry):
+        # Two designs of one name can't be paired, so neither is silently dropped
+        if name in index:
+            raise ValueError("Error: {} holds more than one design named {}".format(path, name))
+        index[name] = entry
+
+    if os.path.isdir(path):
+        for filename in sorted(os.listdir(path)):
+            if not is_srd(filename):
+                continue
+
+            full_path = os.path.join(path, filename)
+            header = read_header(full_path)
+            name = header.get('name', "Ship")
+            if name == "Ship":
+                name = srd_stem(filename)
+
+            def load(full_path=full_path):
+                with open_file(full_path) as f:
+                    return json.load(f)
+
+            content_hash = header.get('hash')
+            if content_hash is None or header.get('version') is None:
+                content_hash = hash_model(upgrade(load()))
+            add(name, (content_hash, load))
+        return index
+
+    compressed = detect_codec(path) is not None
+    with open_file(path, 'rb') as f:
+        offset = 0
+        position = 0
+        for line in f:
+            start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+
+            model = DECODER.decode(line.decode())
+            model.pop('computed', None)
+            position += 1
+
+            def load(start=start, line=line if compressed else None):
+                if line is None:
+                    with open(path, 'rb') as archive:
+                        archive.seek(start)
+                        line = archive.readline()
+                loaded = DECODER.decode(line.decode())
+                loaded.pop('computed', None)
+                return loaded
+
+            name = model.get('name', "Ship")
+            add("Ship {}".format(position) if name == "Ship" else name, (hash_model(upgrade(model)), load))
+    return index
+
+
+def diff_libraries(old_path, new_path):
+    """
+    Diffs two versions of a library or archive, pairing designs by name
+    Designs with matching content hashes are skipped without being decoded
+    :param old_path: directory or .jsonl file of the old version
+    :param new_path: directory or .jsonl file of the new version
+    :return: generator of dictionaries with the design name, its status and, for changed designs, its change set
+    """
+    old_index = index_source(old_path)
+    new_index = index_source(new_path)
+
+    for name, (new_hash, new_load) in new_index.items():
+        old = old_index.get(name)
+        if old is None:
+            yield {"name": name, "status": "added"}
+            continue
+
+        old_hash, old_load = old
+        if old_hash == new_hash:
+            continue
+
+        changeset = diff_models(old_load(), new_load())
+        if changeset['changes'] or changeset['stats']:
+            yield {"name": name, "status": "changed", "diff": changeset}
+
+    for name in old_index:
+        if name not in new_index:
+            yield {"name": name, "status": "removed"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two SRD files, or two libraries or .jsonl archives of them")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args(argv)
+
+    try:
+        if os.path.isfile(args.old) and is_srd(args.old):
+            sys.stdout.write(ENCODER.encode(diff_files(args.old, args.new)))
+            sys.stdout.write("\n")
+        else:
+            for record in diff_libraries(args.old, args.new):
+                sys.stdout.write(ENCODER.encode(record))
+                sys.stdout.write("\n")
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+    except OSError as error:
+        print("Error: {}".format(error), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -4,274 +4,282 @@
 
 Class that handles interacting with and saving a ship's state into a file for later use
 """
+from imperium.classes.armour import Armour
+from imperium.classes.computer import Computer
+from imperium.classes.config import Config
+from imperium.classes.drives import JDrive, MDrive
 from imperium.classes.hardpoint import Hardpoint
+from imperium.classes.option import Option
+from imperium.classes.pplant import PPlant
+from imperium.classes.screens import Screen
+from imperium.classes.sensors import Sensor
 from imperium.classes.software import Software
 from imperium.classes.spacecraft import Spacecraft
 from imperium.classes.turrets import Turret
 from imperium.classes.misc import Misc
+from imperium.shipyard.compression import codec_from_path, open_codec, open_file
+from imperium.shipyard.schema import SRD_VERSION, hash_model, upgrade
+from imperium import instrument
 import json
 import os
+import stat
+import tempfile
+
+# Shared encoder/decoder for SRD data, built once and kept on the C fast path
+ENCODER = json.JSONEncoder(separators=(',', ':'))
+DECODER = json.JSONDecoder()
+
+
+def atomic_write(path, text, codec=None):
+    """
+    Writes text to a file by way of a temporary file in the same directory that is renamed over
+    the target, so readers only ever see the old or the new contents. A file being replaced keeps
+    its permissions
+    :param path: full path to the file
+    :param text: contents to write
+    :param codec: compression codec to write with, None for plain text
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if codec is None:
+                f.write(text.encode())
+            else:
+                with open_codec(codec, f, 'wb') as compressed:
+                    compressed.write(text.encode())
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            # mkstemp creates files readable only by their owner
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
 
 
 class FileLoader:
     def __init__(self):
         self.savepath = "models/"
 
-    def save_model(self, outpath, spacecraft):
+    @instrument.timed("srd.save")
+    def save_model(self, outpath, spacecraft, codec=None):
         """
         Handles the saving of a model by outputting the contents of the spacecraft into
         a formatted SRD file
         :param outpath: full path to the saved file
         :param spacecraft: spacecraft object to save
+        :param codec: compression codec, defaulting to the one named by the extension (e.g. .srd.gz)
         """
-        # Loading in the model template for ships
-        my_path = os.path.abspath(os.path.dirname(__file__))
-        path = os.path.join(my_path, "model_template.json")
-        with open(path, 'r') as f:
-            template = json.load(f)
-
-        # Putting into stats
-        template['stats']['tonnage'] = spacecraft.tonnage
-        template['stats']['cost'] = round(spacecraft.get_total_cost(), 3)
-        template['stats']['cargo'] = spacecraft.get_remaining_cargo()
-        template['stats']['fuel'] = spacecraft.fuel_max
-        template['stats']['discount'] = spacecraft.discount
-
-        # Adding drives
-        if spacecraft.jdrive is not None:
-            template['drives']['jdrive'] = spacecraft.jdrive.drive_type
-        if spacecraft.mdrive is not None:
-            template['drives']['mdrive'] = spacecraft.mdrive.drive_type
-        if spacecraft.pplant is not None:
-            template['drives']['pplant'] = spacecraft.pplant.type
-
-        # Adding config options
-        template['config']['bridge'] = spacecraft.bridge
-
-        for option in spacecraft.hull_options:
-            if option.name == "Reflec":
-                template['config']['options'][0] = True
-            elif option.name == "Self-Sealing":
-                template['config']['options'][1] = True
-            elif option.name == "Stealth":
-                template['config']['options'][2] = True
-
-        for screen in spacecraft.screens:
-            if screen.name == "Meson Screen":
-                template['config']['screens'][0] = True
-            elif screen.name == "Nuclear Damper":
-                template['config']['screens'][1] = True
-
-        template['config']['fuel_scoop'] = spacecraft.fuel_scoop
-        template['config']['hull_type'] = spacecraft.hull_type.type
-        template['config']['sensors'] = spacecraft.sensors.name
-
-        for armor in spacecraft.armour:
-            template['config']['armour'].append(armor.type)
-
-        # Adding computer and software
-        if spacecraft.computer is not None:
-            template['computer']['model'] = spacecraft.computer.model
-            template['computer']['jump_control_spec'] = spacecraft.computer.bis
-            template['computer']['hardened_system'] = spacecraft.computer.fib
-        else:
-            template['computer']['model'] = "---"
-
-        for software in spacecraft.software:
-            template['computer']['software'].append((software.type, software.level))
-
-        # Adding in all misc objects
-        for misc in spacecraft.misc:
-            template['misc']['misc'].append((misc.name, misc.num))
-
-        # Adding in hardpoints
+        # Saving model to srd file
+        with open_file(outpath, 'w', codec) as f:
+            f.write(ENCODER.encode(self.encode_model(spacecraft)))
+
+    def save_many(self, ships, buffer_size=1 << 16):
+        """
+        Handles saving a batch of models, each to its own SRD file, through large write buffers
+        Files named with a codec extension (e.g. .srd.gz) are compressed
+        :param ships: iterable of (outpath, spacecraft) pairs
+        :param buffer_size: size of the write buffer per file, in bytes
+        :return: number of models saved
+        """
+        count = 0
+        for outpath, spacecraft in ships:
+            text = ENCODER.encode(self.encode_model(spacecraft))
+            if codec_from_path(outpath) is None:
+                f = open(outpath, 'w', buffering=buffer_size)
+            else:
+                f = open_file(outpath, 'w')
+            with f:
+                f.write(text)
+            count += 1
+        return count
+
+    def encode_model(self, spacecraft):
+        """
+        Handles converting the contents of a spacecraft into the dictionary layout of a SRD file,
+        following the schema of model_template.json at the current SRD version
+        The version, name, stats, drives and content hash lead the file as a summary header, so listings
+        can read them without parsing the rest of the file
+        :param spacecraft: spacecraft object to encode
+        :return: SRD dictionary of the ship
+        """
+        # Computer and its customizations
+        computer = spacecraft.computer
+        computer_model = computer.model if computer is not None else "---"
+
+        # Hardpoints and their turrets
+        hardpoints = list()
         for hardpoint in spacecraft.hardpoints:
-            hp = {
+            turret = hardpoint.turret
+            if turret is not None:
+                turret = {
+                    "type": turret.name,
+                    "weapons": turret.weapon_refs(),
+                    "missiles": turret.missiles,
+                    "sandcaster_barrels": turret.sandcaster_barrels
+                }
+            hardpoints.append({
                 "id": hardpoint.id,
                 "popup": hardpoint.popup,
                 "fixed": hardpoint.fixed,
-                "turret": None
-            }
-            if hardpoint.turret is not None:
-                hp["turret"] = {
-                    "type": hardpoint.turret.name,
-                    "weapons": hardpoint.turret.weapons,
-                    "missiles": hardpoint.turret.missiles,
-                    "sandcaster_barrels": hardpoint.turret.sandcaster_barrels
-                }
-            template['hardpoints'].append(hp)
-
-        # Saving model to srd file
-        with open(outpath, 'w') as f:
-            json.dump(template, f)
-
-    def load_model(self, path, window):
+                "turret": turret
+            })
+
+        model = {
+            "version": SRD_VERSION,
+            "name": spacecraft.name,
+            "stats": {
+                "tonnage": spacecraft.tonnage,
+                "cost": round(spacecraft.get_total_cost(), 3),
+                "cargo": spacecraft.get_remaining_cargo(),
+                "fuel": spacecraft.fuel_max,
+                "discount": spacecraft.discount,
+                "jump": spacecraft.jump,
+                "thrust": spacecraft.thrust,
+                "armour": spacecraft.armour_total,
+                "hardpoints": len(spacecraft.hardpoints)
+            },
+            "drives": {
+                "jdrive": spacecraft.jdrive.drive_type if spacecraft.jdrive is not None else None,
+                "mdrive": spacecraft.mdrive.drive_type if spacecraft.mdrive is not None else None,
+                "pplant": spacecraft.pplant.type if spacecraft.pplant is not None else None
+            },
+            "hash": None,
+            "config": {
+                "bridge": spacecraft.bridge,
+                "options": [option.name for option in spacecraft.hull_options],
+                "screens": [screen.name for screen in spacecraft.screens],
+                "fuel_scoop": spacecraft.fuel_scoop,
+                "hull_type": spacecraft.hull_type.type,
+                "sensors": spacecraft.sensors.name,
+                "armour": [armour.type for armour in spacecraft.armour]
+            },
+            "computer": {
+                "model": computer_model,
+                "jump_control_spec": computer.bis if computer is not None else False,
+                "hardened_system": computer.fib if computer is not None else False,
+                "software": [(software.type, software.level) for software in spacecraft.software]
+            },
+            "misc": {
+                "misc": [(misc.name, misc.num) for misc in spacecraft.misc]
+            },
+            "hardpoints": hardpoints
+        }
+
+        model['hash'] = hash_model(model)
+        return model
+
+    @instrument.timed("srd.load")
+    def load_spacecraft(self, path):
         """
-        Handles loading in a model from a SRD file and setting both the backend and front end to the
-        contents of the file
-        :param path: full path to the file
-        :param window: QMainWindow object to interact with
+        Handles loading in a model from a SRD file without a GUI attached
+        :param path: full path to the file, which may be compressed
+        :return: Spacecraft object of the model
         """
-        # Loading in the model template for ships
-        with open(path, 'r') as f:
+        with open_file(path) as f:
             model = json.load(f)
 
-        # Wiping out the active turret box
-        for i in reversed(range(0, window.turret_config_layout.count())):
-            window.turret_config_layout.itemAt(i).widget().setParent(None)
-
-        # Setting hull option flags to False initially
-        window.reflec_check.setChecked(False)
-        window.stealth_check.setChecked(False)
-        window.seal_check.setChecked(False)
-        window.fuel_scoop.setChecked(False)
-
-        # Setting screen option flags to False initially
-        window.meson_screen.setChecked(False)
-        window.nuclear_damper.setChecked(False)
-
-        # Adding software labels back to box
-        my_path = os.path.abspath(os.path.dirname(__file__))
-        path = os.path.join(my_path, "../resources/hull_software.json")
-        with open(path) as f:
-            data = json.load(f)
-
-        window.software_box.clear()
-        window.software_box.addItem("---")
-        for item in data.keys():
-            window.software_box.addItem(item)
-
-        # Adding misc labels back to box
-        my_path = os.path.abspath(os.path.dirname(__file__))
-        path = os.path.join(my_path, "../resources/hull_misc.json")
-        with open(path) as f:
-            data = json.load(f)
-
-        window.misc_dict = {}
-        idx = 1
-        window.misc_box.clear()
-        window.misc_box.addItem(" ")
-        for item in data.keys():
-            window.misc_dict[item] = idx
-            window.misc_box.addItem(item)
-            idx += 1
-
-        # Setting spacecraft to new template
-        window.spacecraft = Spacecraft(100)
+        return self.decode_model(model)
 
-        # Setting stats
-        window.tonnage_box.setCurrentText(str(model['stats']['tonnage']))
-        window.edit_tonnage()
-
-        window.fuel_line_edit.setText(str(model['stats']['fuel']))
-        window.edit_fuel()
+    def decode_model(self, model):
+        """
+        Handles building a spacecraft from a SRD dictionary, matching the state the GUI ends
+        up in after load_model
+        :param model: SRD dictionary of the ship, of any supported version
+        :return: Spacecraft object of the model
+        """
+        model = upgrade(model)
+        spacecraft = Spacecraft(model['stats']['tonnage'])
+        spacecraft.name = model.get('name', spacecraft.name)
 
-        window.discount.setText(str(round(100 * (1 - model['stats']['discount']))))
-        window.edit_discount()
+        # Setting stats
+        spacecraft.set_fuel(model['stats']['fuel'])
+        spacecraft.set_discount(round(100 * (1 - model['stats']['discount'])))
 
         # Setting drives
-        window.jump_label.setText("-")
-        window.thrust_label.setText("-")
-        window.pplant_label.setText("-")
-
         if model['drives']['jdrive'] is not None:
-            window.jump_line_edit.setText(model['drives']['jdrive'])
-            window.edit_jdrive()
-
+            spacecraft.add_jdrive(JDrive(model['drives']['jdrive']))
         if model['drives']['mdrive'] is not None:
-            window.thrust_line_edit.setText(model['drives']['mdrive'])
-            window.edit_mdrive()
-
+            spacecraft.add_mdrive(MDrive(model['drives']['mdrive']))
         if model['drives']['pplant'] is not None:
-            window.pplant_line_edit.setText(model['drives']['pplant'])
-            window.edit_pplant()
+            spacecraft.add_pplant(PPlant(model['drives']['pplant']))
 
         # Setting configs
-        window.bridge_check.setChecked(model['config']['bridge'])
-        window.check_bridge()
-
-        options = model['config']['options']
-        if options[0] is True:
-            window.reflec_check.setChecked(True)
-
-        if options[1] is True:
-            window.seal_check.setChecked(True)
+        spacecraft.bridge = model['config']['bridge']
 
-        if options[2] is True:
-            window.stealth_check.setChecked(True)
+        for name in model['config']['options']:
+            spacecraft.modify_hull_option(Option(name))
 
-        screens = model['config']['screens']
-        if screens[0] is True:
-            window.meson_screen.setChecked(True)
+        for name in model['config']['screens']:
+            spacecraft.modify_screen(Screen(name))
 
-        if screens[1] is True:
-            window.nuclear_damper.setChecked(True)
+        # Streamlined hulls have scoops built in, distributed hulls can't have them
+        hull_type = model['config']['hull_type']
+        spacecraft.edit_hull_config(Config(hull_type))
+        if hull_type == "Streamlined":
+            spacecraft.fuel_scoop = True
+        elif hull_type != "Distributed":
+            spacecraft.fuel_scoop = model['config']['fuel_scoop']
 
-        window.hull_config_box.setCurrentText(model['config']['hull_type'])
-        window.edit_hull_config()
+        spacecraft.add_sensors(Sensor(model['config']['sensors']))
 
-        # Check for checked fuel scoops when standard config
-        if model['config']['hull_type'] not in ['Distributed', 'Streamlined']:
-            window.fuel_scoop.setChecked(model['config']['fuel_scoop'])
-
-        window.sensors.setCurrentText(model['config']['sensors'])
-        window.edit_sensors()
-
-        # Redisplaying armour before adding rest
-        window.edit_armor()
         for armour in model['config']['armour']:
-            window.armor_combo_box.setCurrentText(armour)
-            window.edit_armor()
-
-        # Editing computer/software
-        window.computers.setCurrentText(model['computer']['model'])
-        window.edit_computer()
+            spacecraft.add_armour(Armour(armour))
 
-        window.jump_control_spec.setChecked(model['computer']['jump_control_spec'])
-        window.hardened_system.setChecked(model['computer']['hardened_system'])
+        # Setting computer/software
+        if model['computer']['model'] not in (None, "---"):
+            computer = Computer(model['computer']['model'])
+            computer.bis = model['computer']['jump_control_spec']
+            computer.fib = model['computer']['hardened_system']
+            spacecraft.add_computer(computer)
 
         for sname, slevel in model['computer']['software']:
-            window.spacecraft.modify_software(Software(sname, slevel))
-            window.software_box.setCurrentText(sname)
-            window.software_box.removeItem(window.software_box.currentIndex())
-
-        window.software_box.setCurrentIndex(0)
-        window.display_software()
+            spacecraft.modify_software(Software(sname, slevel))
 
         # Adding all misc items
         for mname, mnumber in model['misc']['misc']:
-            window.spacecraft.modify_misc(Misc(mname, mnumber))
-        window.display_misc_items()
+            spacecraft.modify_misc(Misc(mname, mnumber))
 
         # Adding hardpoints and turrets
         for hardpoint in model['hardpoints']:
-            # Making hp object
-            hp = Hardpoint(hardpoint['id'])
-
-            # Modifying its addons
-            if hardpoint['popup']:
-                hp.modify_addon('Pop-up Turret')
-            if hardpoint['fixed']:
-                hp.modify_addon('Fixed Mounting')
-
-            # Making turret and adding it
-            turret_dict = hardpoint['turret']
-            if turret_dict is not None:
-                turret = Turret(turret_dict['type'])
-                turret.weapons = turret_dict['weapons']
-                turret.missiles = turret_dict['missiles']
-                turret.sandcaster_barrels = turret_dict['sandcaster_barrels']
-                hp.add_turret(turret)
-
-            window.spacecraft.add_hardpoint(hp)
-
-        # Resetting HP total/avail
-        window.total_hp.setText(str(window.spacecraft.num_hardpoints))
-        window.avail_hp.setText(str(window.spacecraft.num_hardpoints - len(window.spacecraft.hardpoints)))
-
-        # Setting active hardpoint to None, displaying new hardpoints
-        window.active_hp_id = None
-        window.display_hardpoints()
-
-        # Updating stats at end
-        window.update_stats()
+            spacecraft.add_hardpoint(self.decode_hardpoint(hardpoint))
+
+        return spacecraft
+
+    def decode_hardpoint(self, hardpoint):
+        """
+        Handles building a hardpoint and its turret from a SRD hardpoint dictionary
+        :param hardpoint: dictionary of a single hardpoint
+        :return: Hardpoint object
+        """
+        # Making hp object
+        hp = Hardpoint(hardpoint['id'])
+
+        # Modifying its addons
+        if hardpoint['popup']:
+            hp.modify_addon('Pop-up Turret')
+        if hardpoint['fixed']:
+            hp.modify_addon('Fixed Mounting')
+
+        # Making turret and adding it
+        turret_dict = hardpoint['turret']
+        if turret_dict is not None:
+            turret = Turret(turret_dict['type'])
+            for idx, ref in enumerate(turret_dict['weapons'][:turret.max_wep]):
+                turret.load_weapon(ref, idx)
+            turret.missiles = turret_dict['missiles']
+            turret.sandcaster_barrels = turret_dict['sandcaster_barrels']
+            hp.add_turret(turret)
+
+        return hp
+
+    def load_model(self, path, window):
+        """
+        Handles loading in a model from a SRD file and setting both the backend and front end to the
+        contents of the file. The ship is decoded headlessly and handed to the window in one bulk edit
+        :param path: full path to the file
+        :param window: QMainWindow object to interact with
+        """
+        window.set_spacecraft(self.load_spacecraft(path))
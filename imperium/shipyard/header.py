@@ -0,0 +1,157 @@
+"""
+@file header.py
+
+Reads the summary header at the start of SRD files (version, name, stats, drives and content hash) with a
+bounded read, without decoding the config, computer, misc and hardpoint sections that follow it
+
+Usage:
+    python -m imperium.shipyard.header <directory>
+"""
+from imperium.shipyard.compression import is_srd, open_file
+from imperium.shipyard.fileloader import DECODER
+import argparse
+import json
+import os
+import re
+
+# Keys that make up the summary header, in the order they lead a SRD file
+HEADER_KEYS = ("version", "name", "stats", "drives", "hash")
+
+# Bytes read for the first attempt at a header, and the most read before parsing the whole file
+HEADER_READ_SIZE = 2048
+MAX_HEADER_SIZE = 65536
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def parse_header(text):
+    """
+    Parses the header keys from the start of a SRD file's text, stopping at the first key that
+    isn't part of the header
+    :param text: leading text of the file, possibly cut off part way through
+    :return: dictionary of header keys, or None if the text ends before the header does
+    """
+    header = dict()
+    try:
+        idx = WHITESPACE.match(text, 0).end()
+        if text[idx] != '{':
+            return None
+        idx += 1
+
+        while True:
+            idx = WHITESPACE.match(text, idx).end()
+            if text[idx] == '}':
+                return header
+
+            key, idx = DECODER.raw_decode(text, idx)
+            idx = WHITESPACE.match(text, idx).end()
+            if text[idx] != ':':
+                return None
+            if key not in HEADER_KEYS:
+                return header
+
+            idx = WHITESPACE.match(text, idx + 1).end()
+            header[key], idx = DECODER.raw_decode(text, idx)
+
+            idx = WHITESPACE.match(text, idx).end()
+            if text[idx] == '}':
+                return header
+            idx += 1
+    except (ValueError, IndexError):
+        return None
+
+
+def read_header(path):
+    """
+    Reads the summary header of a SRD file, reading more of the file only if the header runs
+    past the first block. Files whose header keys don't lead the file are parsed in full
+    Compressed files are decompressed only as far as the header
+    :param path: full path to the file
+    :return: dictionary of the header keys present in the file
+    """
+    with open_file(path, 'rb') as f:
+        data = f.read(HEADER_READ_SIZE)
+        header = parse_header(data.decode('utf-8', 'ignore'))
+
+        while header is None and len(data) < MAX_HEADER_SIZE:
+            chunk = f.read(len(data))
+            if not chunk:
+                break
+            data += chunk
+            header = parse_header(data.decode('utf-8', 'ignore'))
+
+    if header is None or "stats" not in header:
+        with open_file(path) as f:
+            model = json.load(f)
+        header = {key: model[key] for key in HEADER_KEYS if key in model}
+
+    return header
+
+
+def summarize(header):
+    """
+    Flattens a header into the fields shown in listings, with '-' for anything missing
+    :param header: dictionary from read_header
+    :return: dictionary of display names to values
+    """
+    stats = header.get('stats', dict())
+    drives = header.get('drives', dict())
+
+    def drive(key):
+        return drives.get(key) or "-"
+
+    return {
+        "Name": header.get('name', "-"),
+        "Tonnage": stats.get('tonnage', "-"),
+        "Cost": stats.get('cost', "-"),
+        "Cargo": stats.get('cargo', "-"),
+        "Jump": stats.get('jump', "-"),
+        "Thrust": stats.get('thrust', "-"),
+        "Drives": "{}/{}/{}".format(drive('jdrive'), drive('mdrive'), drive('pplant'))
+    }
+
+
+def list_directory(directory):
+    """
+    Reads the headers of every .srd file in a directory, compressed or not
+    :param directory: path holding .srd files
+    :return: list of (filename, header) tuples, sorted by filename
+    """
+    listing = list()
+    for filename in sorted(os.listdir(directory)):
+        if is_srd(filename):
+            listing.append((filename, read_header(os.path.join(directory, filename))))
+    return listing
+
+
+def format_listing(listing):
+    """
+    Formats a directory listing as a text table
+    :param listing: list of (filename, header) tuples
+    :return: table string
+    """
+    rows = [dict(summarize(header), File=filename) for filename, header in listing]
+    columns = ["File", "Tonnage", "Cost", "Cargo", "Jump", "Thrust", "Drives"]
+
+    widths = {column: len(column) for column in columns}
+    for row in rows:
+        for column in columns:
+            widths[column] = max(widths[column], len(str(row[column])))
+
+    lines = ["  ".join(column.ljust(widths[column]) for column in columns)]
+    for row in rows:
+        lines.append("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the SRD files in a directory with their stats")
+    parser.add_argument("directory")
+    args = parser.parse_args(argv)
+
+    print(format_listing(list_directory(args.directory)))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
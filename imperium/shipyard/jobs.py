@@ -0,0 +1,144 @@
+"""
+@file jobs.py
+
+Long running computations over designs, such as validating a library or sweeping the variants of a
+design. Jobs are generators yielding one result per step, so whatever runs them can report progress
+and stop them between steps. The GUI runs them on a worker thread so the editor stays responsive
+order_rows is a plain function instead, taking one step over columns that are already built
+"""
+from imperium.classes.drives import JDrive, MDrive
+from imperium.classes.json_reader import get_file_data
+from imperium.classes.pplant import PPlant
+from imperium.shipyard.compression import is_srd, open_file, srd_stem
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.header import read_header
+from imperium.shipyard.migrate import find_files, validate
+from imperium.shipyard.schema import upgrade
+from imperium.shipyard.stream import read_models
+from itertools import product
+import argparse
+import copy
+import json
+import os
+
+# Stats listed for each design when browsing a fleet, after its name
+FLEET_STATS = ["tonnage", "cost", "cargo", "jump", "thrust", "armour"]
+
+
+def validate_files(paths):
+    """
+    Checks every SRD file given upgrades to the current schema and decodes into a spacecraft
+    Files are only read, never rewritten
+    :param paths: list of file or directory paths
+    :return: generator of (path, errors) tuples, errors being empty for valid files
+    """
+    for path in find_files(paths):
+        try:
+            with open_file(path) as f:
+                model = upgrade(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            yield path, ["Error: {!r}".format(error)]
+            continue
+
+        yield path, validate(model)
+
+
+def sweep_drives(model, letters=None):
+    """
+    Tries every combination of jump drive, manoeuvre drive and power plant on a design, skipping
+    drives the hull can't take and power plants rated below either drive
+    :param model: SRD dictionary of the design, which is left unchanged
+    :param letters: drive letters to try, defaults to every drive letter
+    :return: generator of ((jump drive, manoeuvre drive, power plant), stats) tuples
+    """
+    if letters is None:
+        letters = list(get_file_data("hull_performance.json").keys())
+
+    spacecraft = FileLoader().decode_model(upgrade(copy.deepcopy(model)))
+    for jdrive, mdrive, pplant in product(letters, repeat=3):
+        if pplant < max(jdrive, mdrive):
+            continue
+        if spacecraft.add_jdrive(JDrive(jdrive)) is not None or spacecraft.add_mdrive(MDrive(mdrive)) is not None:
+            continue
+
+        spacecraft.add_pplant(PPlant(pplant))
+        yield (jdrive, mdrive, pplant), spacecraft.get_stats()
+
+
+def scan_fleet(path):
+    """
+    Lists the name and stats of every design in a library folder or a fleet archive. Folders are
+    listed from the summary header of each .srd file, and archives one line at a time
+    :param path: folder of .srd files, or fleet archive such as fleet.jsonl.gz
+    :return: generator of (values, source) tuples, values being the name followed by the FLEET_STATS
+             (None where a file doesn't record one), and source being (path, None) for a file or
+             (archive path, position) for a design in an archive
+    """
+    def row(model, default):
+        stats = model.get('stats', dict())
+        name = model.get('name', "Ship")
+        return [default if name == "Ship" else name] + [stats.get(stat) for stat in FLEET_STATS]
+
+    if os.path.isdir(path):
+        for filename in sorted(os.listdir(path)):
+            if not is_srd(filename):
+                continue
+
+            # Unreadable files are left out, Validate Folder being where they are reported
+            source = os.path.join(path, filename)
+            try:
+                header = read_header(source)
+            except (OSError, ValueError):
+                continue
+            yield row(header, srd_stem(filename)), (source, None)
+        return
+
+    with open_file(path, 'rb') as f:
+        for idx, model in enumerate(read_models(f)):
+            yield row(model, "Ship {}".format(idx + 1)), (path, idx)
+
+
+def order_rows(columns, folded, count, sort=None, descending=False, text=""):
+    """
+    Works out which rows of a fleet listing are shown and in what order, from columns built up
+    front so nothing is decoded. Rows missing the sorted stat go last whichever way it sorts
+    :param columns: list of columns, the names followed by one per stat in FLEET_STATS
+    :param folded: casefolded names, for matching the filter text
+    :param count: number of rows to order, the columns may be longer
+    :param sort: index of the column to sort by, or None to keep the listing order
+    :param descending: whether to sort from the highest value down
+    :param text: text the names shown must contain, ignoring case
+    :return: list of row indices shown, in order
+    """
+    text = text.casefold()
+    if text:
+        rows = [row for row in range(count) if text in folded[row]]
+    else:
+        rows = list(range(count))
+
+    if sort is not None:
+        values = columns[sort]
+        known = [row for row in rows if values[row] is not None]
+        known.sort(key=values.__getitem__, reverse=descending)
+        rows = known + [row for row in rows if values[row] is None]
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check SRD files load, without rewriting them")
+    parser.add_argument("paths", nargs="+", help=".srd files or directories holding them")
+    args = parser.parse_args(argv)
+
+    checked = failed = 0
+    for path, errors in validate_files(args.paths):
+        checked += 1
+        if errors:
+            failed += 1
+            print("{}: {}".format(path, "; ".join(errors)))
+
+    print("Validated {} SRD files, {} failed".format(checked, failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,237 @@
+"""
+@file library.py
+
+SQLite-backed library of ship designs. Each design is stored as its SRD alongside denormalized,
+indexed stat columns so that whole collections can be searched without loading every ship
+"""
+from imperium.classes.json_reader import get_catalog_digest
+from imperium.shipyard.compression import is_srd, open_file, srd_stem
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.schema import upgrade
+import json
+import os
+import sqlite3
+
+# Stat columns stored per design, filled from Spacecraft.get_stats()
+STAT_COLUMNS = ["tonnage", "cost", "cargo", "fuel", "fuel_jump", "jump", "thrust",
+                "armour", "hardpoints", "hull_hp", "structure_hp"]
+
+# Stat columns that get an index for range queries and sorting
+INDEXED_COLUMNS = ["tonnage", "cost", "cargo", "jump", "thrust", "armour", "hardpoints"]
+
+# Statement writing a row from make_row, replacing any design imported from the same source
+INSERT_SQL = "INSERT OR REPLACE INTO ships ({}) VALUES ({})".format(
+    ", ".join(["name", "source", "mtime", "catalog", "srd"] + STAT_COLUMNS),
+    ", ".join("?" for _ in range(5 + len(STAT_COLUMNS))))
+
+
+class LibraryEntry:
+    """
+    A single design returned from a library query, holding its indexed stats
+    The Spacecraft object is only built from the stored SRD on first access
+
+    :param library: ShipLibrary the entry belongs to
+    :param row: sqlite3.Row of the design
+    """
+    def __init__(self, library, row):
+        self.library        = library
+        self.id             = row['id']     # row id within the library
+        self.name           = row['name']   # name of the design
+        self.source         = row['source'] # path the design was imported from, if any
+        self._spacecraft    = None
+
+        for column in STAT_COLUMNS:
+            setattr(self, column, row[column])
+
+    @property
+    def spacecraft(self):
+        # Hydrates the spacecraft from its stored SRD the first time it is asked for
+        if self._spacecraft is None:
+            self._spacecraft = self.library.get_spacecraft(self.id)
+        return self._spacecraft
+
+
+class ShipLibrary:
+    """
+    Collection of ship designs backed by a SQLite database
+
+    :param path: path to the database file, defaults to an in-memory library
+    """
+    def __init__(self, path=":memory:"):
+        self.fileloader = FileLoader()
+        self.catalog = get_catalog_digest()
+
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.create_schema()
+
+    def create_schema(self):
+        """
+        Handles creating the designs table and its stat indexes if they don't exist yet
+        """
+        columns = ", ".join("{} REAL".format(column) for column in STAT_COLUMNS)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS ships ("
+                "id INTEGER PRIMARY KEY, name TEXT, source TEXT UNIQUE, mtime REAL, "
+                "catalog TEXT, srd TEXT NOT NULL, {})".format(columns))
+            for column in INDEXED_COLUMNS:
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS ships_{0} ON ships ({0})".format(column))
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM ships").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def make_row(self, model, source=None, mtime=None):
+        """
+        Handles building the values of a table row from a SRD dictionary, computing its stats
+        :param model: SRD dictionary of the ship, of any supported version
+        :param source: path the design was loaded from
+        :param mtime: modification time of the source file
+        :return: tuple of column values, storing the design upgraded to the current version
+        """
+        model = upgrade(model)
+        spacecraft = self.fileloader.decode_model(model)
+        stats = spacecraft.get_stats()
+
+        name = spacecraft.name
+        if source is not None and name == "Ship":
+            name = srd_stem(source)
+
+        values = [name, source, mtime, self.catalog, json.dumps(model)]
+        values.extend(stats[column] for column in STAT_COLUMNS)
+        return tuple(values)
+
+    def insert_rows(self, rows):
+        """
+        Handles writing a batch of rows within a single transaction, replacing designs
+        imported from the same source
+        :param rows: list of row tuples from make_row
+        """
+        with self.connection:
+            self.connection.executemany(INSERT_SQL, rows)
+
+    def add(self, spacecraft):
+        """
+        Adds a single spacecraft to the library
+        :param spacecraft: spacecraft object to store
+        :return: id of the new design
+        """
+        row = self.make_row(self.fileloader.encode_model(spacecraft))
+        with self.connection:
+            return self.connection.execute(INSERT_SQL, row).lastrowid
+
+    def import_directory(self, directory, batch_size=1000):
+        """
+        Imports every .srd file under a directory, compressed or not, committing in batches
+        Files that haven't changed since their last import are skipped
+        :param directory: path to search for .srd files
+        :param batch_size: number of designs written per transaction
+        :return: number of designs imported
+        """
+        known = dict(self.connection.execute("SELECT source, mtime FROM ships WHERE source IS NOT NULL"))
+
+        imported = 0
+        rows = list()
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                if not is_srd(filename):
+                    continue
+
+                path = os.path.abspath(os.path.join(root, filename))
+                mtime = os.path.getmtime(path)
+                if known.get(path) == mtime:
+                    continue
+
+                with open_file(path) as f:
+                    model = json.load(f)
+                rows.append(self.make_row(model, path, mtime))
+
+                if len(rows) >= batch_size:
+                    self.insert_rows(rows)
+                    imported += len(rows)
+                    rows = list()
+
+        self.insert_rows(rows)
+        return imported + len(rows)
+
+    def reindex(self, force=False, batch_size=1000):
+        """
+        Recomputes the stats of designs indexed against an older version of the parts catalog
+        :param force: whether to recompute every design regardless of catalog version
+        :param batch_size: number of designs updated per transaction
+        :return: number of designs reindexed
+        """
+        if force:
+            cursor = self.connection.execute("SELECT id, srd FROM ships")
+        else:
+            cursor = self.connection.execute("SELECT id, srd FROM ships WHERE catalog IS NOT ?", (self.catalog,))
+        stale = cursor.fetchall()
+
+        sql = "UPDATE ships SET catalog = ?, {} WHERE id = ?".format(
+            ", ".join("{} = ?".format(column) for column in STAT_COLUMNS))
+
+        for start in range(0, len(stale), batch_size):
+            rows = list()
+            for row_id, srd in stale[start:start + batch_size]:
+                stats = self.fileloader.decode_model(json.loads(srd)).get_stats()
+                rows.append([self.catalog] + [stats[column] for column in STAT_COLUMNS] + [row_id])
+
+            with self.connection:
+                self.connection.executemany(sql, rows)
+
+        return len(stale)
+
+    def query(self, order_by="cost", descending=False, limit=None, **filters):
+        """
+        Searches the library by stat ranges, e.g. query(min_jump=2, max_cost=100, min_cargo=150)
+        Bounds are inclusive and the results are read lazily from the cursor
+        :param order_by: stat column to sort the results on
+        :param descending: whether to sort highest first
+        :param limit: maximum number of results
+        :param filters: min_<stat>/max_<stat> keyword bounds, or name for an exact name match
+        :return: generator of LibraryEntry objects
+        """
+        if order_by not in STAT_COLUMNS + ["name"]:
+            raise ValueError("Error: cannot order ships by '{}'".format(order_by))
+
+        clauses = list()
+        params = list()
+        for key, value in filters.items():
+            if key == "name":
+                clauses.append("name = ?")
+            elif key[:4] in ("min_", "max_") and key[4:] in STAT_COLUMNS:
+                clauses.append("{} {} ?".format(key[4:], ">=" if key[:4] == "min_" else "<="))
+            else:
+                raise ValueError("Error: unknown library filter '{}'".format(key))
+            params.append(value)
+
+        sql = "SELECT * FROM ships"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY {} {}".format(order_by, "DESC" if descending else "ASC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for row in self.connection.execute(sql, params):
+            yield LibraryEntry(self, row)
+
+    def get_spacecraft(self, row_id):
+        """
+        Builds the spacecraft of a stored design
+        :param row_id: id of the design
+        :return: Spacecraft object, or None if no such design
+        """
+        row = self.connection.execute("SELECT srd FROM ships WHERE id = ?", (row_id,)).fetchone()
+        if row is None:
+            return None
+        return self.fileloader.decode_model(json.loads(row['srd']))
+
+    def remove(self, row_id):
+        # Removes a design from the library
+        with self.connection:
+            self.connection.execute("DELETE FROM ships WHERE id = ?", (row_id,))
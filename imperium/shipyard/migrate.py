@@ -0,0 +1,178 @@
+"""
+@file migrate.py
+
+Batch migration of SRD libraries to the current schema version. Files are streamed through a pool
+of worker processes, each upgraded with the migrations registered in schema.py, validated by
+decoding the result, and written back in place atomically
+
+Usage:
+    python -m imperium.shipyard.migrate <directory or file> [...] [--workers N]
+"""
+from imperium.classes.json_reader import get_file_data
+from imperium.shipyard.compression import detect_codec, is_srd, open_file
+from imperium.shipyard.fileloader import ENCODER, FileLoader, atomic_write
+from imperium.shipyard.schema import HULL_OPTIONS, SCREENS, SRD_VERSION, get_version, upgrade
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import argparse
+import json
+import os
+
+# Top level sections every SRD file must hold
+SECTIONS = ("stats", "drives", "config", "computer", "misc", "hardpoints")
+
+# Results of migrating a single file, alongside error messages
+UPGRADED = "upgraded"
+CURRENT = "current"
+
+
+def validate(model):
+    """
+    Checks an upgraded SRD dictionary is well formed and decodes into a spacecraft
+    :param model: SRD dictionary of the current version
+    :return: list of error messages, empty if the model is valid
+    """
+    errors = list()
+    if get_version(model) != SRD_VERSION:
+        errors.append("Error: version {} is not {}".format(get_version(model), SRD_VERSION))
+
+    missing = [section for section in SECTIONS if section not in model]
+    if missing:
+        errors.append("Error: missing sections {}".format(", ".join(missing)))
+        return errors
+
+    for name in model['config'].get('options', []):
+        if name not in HULL_OPTIONS:
+            errors.append("Error: unknown hull option {}".format(name))
+    for name in model['config'].get('screens', []):
+        if name not in SCREENS:
+            errors.append("Error: unknown screen {}".format(name))
+
+    # Weapons named but not in the catalog would be lost on loading
+    data = get_file_data("hull_turrets.json")
+    for hardpoint in model['hardpoints']:
+        turret = hardpoint.get('turret')
+        if turret is None:
+            continue
+        catalog = data.get("bayweapons" if turret.get('type') == "Bay Weapon" else "weapons")
+        for wep in turret.get('weapons', []):
+            if isinstance(wep, str) and wep not in catalog:
+                errors.append("Error: unknown weapon {} on hardpoint {}".format(wep, hardpoint.get('id')))
+    if errors:
+        return errors
+
+    try:
+        FileLoader().decode_model(model)
+    except Exception as error:
+        errors.append("Error: does not decode - {!r}".format(error))
+    return errors
+
+
+def migrate_file(path):
+    """
+    Upgrades a single SRD file in place, leaving files already at the current version untouched
+    The file is only rewritten if the upgraded design validates, keeping its compression
+    :param path: full path to the file
+    :return: tuple of (path, result) where result is "upgraded", "current" or an error message
+    """
+    try:
+        codec = detect_codec(path)
+        with open_file(path) as f:
+            model = json.load(f)
+        if get_version(model) == SRD_VERSION:
+            return path, CURRENT
+
+        model = upgrade(model)
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        return path, "Error: {!r}".format(error)
+
+    errors = validate(model)
+    if errors:
+        return path, "; ".join(errors)
+
+    try:
+        atomic_write(path, ENCODER.encode(model), codec)
+    except OSError as error:
+        return path, "Error: {!r}".format(error)
+    return path, UPGRADED
+
+
+def find_files(paths):
+    """
+    Lazily lists the SRD files given, searching directories for .srd files
+    :param paths: list of file or directory paths
+    :return: generator of file paths
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if is_srd(filename):
+                    yield os.path.join(root, filename)
+
+
+def migrate_library(paths, workers=None, window=64):
+    """
+    Streams every SRD file given through migrate_file on a pool of worker processes
+    Only a bounded window of files is in flight at once, so libraries of any size can be migrated
+    :param paths: list of file or directory paths
+    :param workers: number of worker processes, defaults to the CPU count. 1 migrates in this process
+    :param window: most files submitted to the pool and not yet finished
+    :return: generator of (path, result) tuples in completion order
+    """
+    files = find_files(paths)
+    if workers == 1:
+        for path in files:
+            yield migrate_file(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for path in files:
+            pending.add(executor.submit(migrate_file, path))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in pending:
+            yield future.result()
+
+
+def migrate_paths(paths, workers=None):
+    """
+    Migrates every SRD file given, printing any that failed to validate
+    :param paths: list of file or directory paths
+    :param workers: number of worker processes
+    :return: tuple of (files checked, files rewritten, files failed)
+    """
+    checked = 0
+    rewritten = 0
+    failed = 0
+    for path, result in migrate_library(paths, workers=workers):
+        checked += 1
+        if result == UPGRADED:
+            rewritten += 1
+        elif result != CURRENT:
+            failed += 1
+            print("{}: {}".format(path, result))
+
+    return checked, rewritten, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate SRD files to schema version {}".format(SRD_VERSION))
+    parser.add_argument("paths", nargs="+", help=".srd files or directories holding them")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    checked, rewritten, failed = migrate_paths(args.paths, workers=args.workers)
+    print("Migrated {} of {} SRD files, {} failed".format(rewritten, checked, failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""
+@file schema.py
+
+Versions of the SRD file layout and the registry of migrations between them. Every loaded file is
+upgraded to the current version first, so the rest of the loader only ever sees one layout
+
+Versions:
+    1 - original layout, with no version field and turret weapons embedded as catalog copies
+    2 - turret weapons stored by catalog name, or as a copy if no longer in the catalog
+    3 - hull options and screens stored as lists of names instead of positional flags
+"""
+import copy
+import hashlib
+import json
+
+from imperium.classes.json_reader import get_file_data
+
+# Version written by the current encoder
+SRD_VERSION = 3
+
+# Order of the positional hull option and screen flags used before version 3
+HULL_OPTIONS = ["Reflec", "Self-Sealing", "Stealth"]
+SCREENS = ["Meson Screen", "Nuclear Damper"]
+
+# Key-order independent encoder used for content hashes
+HASH_ENCODER = json.JSONEncoder(separators=(',', ':'), sort_keys=True)
+
+# Functions upgrading a SRD dictionary from a version to the next, keyed by the version they upgrade from
+MIGRATIONS = dict()
+
+
+def hash_model(model):
+    """
+    Hashes the contents of a SRD dictionary, ignoring any hash it already holds
+    :param model: SRD dictionary of the ship
+    :return: hex digest of the design
+    """
+    content = {key: value for key, value in model.items() if key != "hash"}
+    return hashlib.sha1(HASH_ENCODER.encode(content).encode()).hexdigest()
+
+
+def migration(version):
+    """
+    Registers a function that upgrades a SRD dictionary in place from the given version to the next
+    :param version: version the function upgrades from
+    :return: decorator registering the function
+    """
+    def register(funct):
+        MIGRATIONS[version] = funct
+        return funct
+    return register
+
+
+def get_version(model):
+    # Gets the layout version of a SRD dictionary, files from before versioning being version 1
+    return model.get('version', 1)
+
+
+def upgrade(model):
+    """
+    Upgrades a SRD dictionary to the current version by running each migration in turn
+    Older dictionaries are migrated as a copy, so the caller's is left as it was and can be upgraded again
+    :param model: SRD dictionary of any supported version
+    :return: SRD dictionary of the current version, with the version leading the file
+    """
+    version = get_version(model)
+    if version > SRD_VERSION:
+        raise ValueError("Error: SRD version {} is newer than the supported version {}".format(version, SRD_VERSION))
+    if version == SRD_VERSION:
+        return model
+
+    model = copy.deepcopy(model)
+    while version < SRD_VERSION:
+        MIGRATIONS[version](model)
+        version += 1
+
+    upgraded = {"version": version}
+    upgraded.update((key, value) for key, value in model.items() if key != "version")
+    if "hash" in upgraded:
+        upgraded['hash'] = hash_model(upgraded)
+    return upgraded
+
+
+@migration(1)
+def weapons_by_name(model):
+    """
+    Replaces embedded weapon dictionaries with their catalog names
+    Copies of weapons no longer in the catalog are kept, as the name alone would lose them
+    Files written before versioning may already hold names, which are left as they are
+    """
+    data = get_file_data("hull_turrets.json")
+    for hardpoint in model['hardpoints']:
+        turret = hardpoint['turret']
+        if turret is None:
+            continue
+
+        catalog = data.get("bayweapons" if turret['type'] == "Bay Weapon" else "weapons")
+        for idx, wep in enumerate(turret['weapons']):
+            if isinstance(wep, dict) and wep.get("name") in catalog:
+                turret['weapons'][idx] = wep.get("name")
+
+
+@migration(2)
+def named_flags(model):
+    """
+    Replaces the positional hull option and screen flags with the names of those installed
+    """
+    config = model['config']
+    config['options'] = [name for name, flag in zip(HULL_OPTIONS, config['options']) if flag is True]
+    config['screens'] = [name for name, flag in zip(SCREENS, config['screens']) if flag is True]
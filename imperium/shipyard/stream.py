@@ -0,0 +1,186 @@
+"""
+@file stream.py
+
+Line-delimited streaming codec for fleets. Each line holds one SRD design, so any number of ships
+can be piped between tools through a file object, stdin or stdout while only one is held in memory
+Compressed archives are read and written through the streaming codecs in compression.py
+
+Usage:
+    python -m imperium.shipyard.stream export <directory> [--stats] [--codec gzip] > fleet.jsonl.gz
+    python -m imperium.shipyard.stream import <directory> [--codec gzip] < fleet.jsonl.gz
+"""
+from imperium.shipyard.compression import CODECS, is_srd, open_file, open_stream, srd_stem
+from imperium.shipyard.fileloader import DECODER, ENCODER, FileLoader
+from imperium.shipyard.schema import hash_model, upgrade
+import argparse
+import json
+import os
+import sys
+
+
+def write_models(models, f):
+    """
+    Writes SRD dictionaries to a file object, one per line
+    :param models: iterable of SRD dictionaries
+    :param f: text file object to write to
+    :return: number of designs written
+    """
+    count = 0
+    for model in models:
+        f.write(ENCODER.encode(model))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def read_models(f):
+    """
+    Reads SRD dictionaries from a file object one line at a time, skipping blank lines
+    :param f: text or binary file object to read from
+    :return: generator of SRD dictionaries
+    """
+    for line in f:
+        if isinstance(line, bytes):
+            line = line.decode()
+        line = line.strip()
+        if line:
+            yield DECODER.decode(line)
+
+
+def read_model(path, index):
+    """
+    Reads a single design from a fleet archive, decoding only its own line
+    :param path: path to the archive, compressed or not
+    :param index: position of the design in the archive, blank lines not counting
+    :return: SRD dictionary of the design
+    """
+    with open_file(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if index == 0:
+                return DECODER.decode(line.decode())
+            index -= 1
+
+    raise IndexError("Error: {} holds no design at that position".format(path))
+
+
+def write_fleet(ships, f, stats=False):
+    """
+    Writes spacecraft to a file object, one design per line
+    :param ships: iterable of spacecraft objects
+    :param f: text file object to write to
+    :param stats: whether to add the computed stats of each ship to its record
+    :return: number of designs written
+    """
+    fileloader = FileLoader()
+
+    def encode(spacecraft):
+        model = fileloader.encode_model(spacecraft)
+        if stats:
+            model['computed'] = spacecraft.get_stats()
+        return model
+
+    return write_models((encode(spacecraft) for spacecraft in ships), f)
+
+
+def read_fleet(f):
+    """
+    Reads spacecraft from a file object one line at a time
+    :param f: text or binary file object to read from
+    :return: generator of spacecraft objects
+    """
+    fileloader = FileLoader()
+    for model in read_models(f):
+        yield fileloader.decode_model(model)
+
+
+def export_directory(directory, f, stats=False):
+    """
+    Streams every .srd file in a directory, compressed or not, out to a file object
+    Designs are written upgraded to the current version, and those without a name are named after their file
+    and rehashed
+    :param directory: path holding .srd files
+    :param f: text file object to write to
+    :param stats: whether to add the computed stats of each ship to its record
+    :return: number of designs written
+    """
+    fileloader = FileLoader()
+
+    def models():
+        for filename in sorted(os.listdir(directory)):
+            if not is_srd(filename):
+                continue
+
+            with open_file(os.path.join(directory, filename)) as srd:
+                model = upgrade(json.load(srd))
+
+            if model.get('name', "Ship") == "Ship":
+                model['name'] = srd_stem(filename)
+            # The hash is of the design as written, so it covers the name given but not the stats
+            model['hash'] = hash_model(model)
+            if stats:
+                model['computed'] = fileloader.decode_model(model).get_stats()
+            yield model
+
+    return write_models(models(), f)
+
+
+def import_directory(f, directory, codec=None):
+    """
+    Writes each design read from a file object into its own .srd file, named after the design
+    :param f: text or binary file object to read from
+    :param directory: path to write .srd files into
+    :param codec: compression codec for the written files, None for plain .srd files
+    :return: number of designs written
+    """
+    extension = ".srd" + (CODECS[codec][2] if codec is not None else "")
+    os.makedirs(directory, exist_ok=True)
+
+    count = 0
+    for model in read_models(f):
+        model.pop('computed', None)
+        model['hash'] = hash_model(model)
+
+        # Finding a free filename for the design
+        name = model.get('name', "Ship").replace(os.sep, "_")
+        path = os.path.join(directory, name + extension)
+        idx = 1
+        while os.path.exists(path):
+            path = os.path.join(directory, "{} ({}){}".format(name, idx, extension))
+            idx += 1
+
+        with open_file(path, 'w', codec) as srd:
+            srd.write(ENCODER.encode(model))
+        count += 1
+
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream fleets of SRD designs as JSON lines")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    export_parser = commands.add_parser("export", help="write a directory of .srd files to stdout")
+    export_parser.add_argument("directory")
+    export_parser.add_argument("--stats", action="store_true", help="include computed stats per ship")
+    export_parser.add_argument("--codec", choices=sorted(CODECS), help="compress the stream")
+
+    import_parser = commands.add_parser("import", help="write designs read from stdin into a directory")
+    import_parser.add_argument("directory")
+    import_parser.add_argument("--codec", choices=sorted(CODECS), help="compress the written .srd files")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        with open_stream(sys.stdout.buffer, 'w', args.codec) as f:
+            export_directory(args.directory, f, stats=args.stats)
+    else:
+        # Compressed input is detected from the stream itself
+        with open_stream(sys.stdin.buffer, 'r') as f:
+            import_directory(f, args.directory, args.codec)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,14 @@
+"""
+@file conftest.py
+
+Shared fixtures for the unit tests
+"""
+import pytest
+from imperium.shipyard.autosave import RECOVERY_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def recovery_dir(tmp_path, monkeypatch):
+    """ Keeps autosave recovery files out of the home directory during tests """
+    monkeypatch.setenv(RECOVERY_DIR_ENV, str(tmp_path / "recovery"))
+    yield str(tmp_path / "recovery")
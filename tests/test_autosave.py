@@ -0,0 +1,84 @@
+"""
+@file test_autosave.py
+
+Unit tests for the background autosave of ships
+"""
+import os
+import pytest
+from imperium.classes.spacecraft import Spacecraft
+from imperium.shipyard.autosave import AutoSaver, get_recovery_path
+from imperium.shipyard.fileloader import FileLoader, atomic_write
+
+
+def test_recovery_path(recovery_dir):
+    """ Tests the recovery location follows the environment override """
+    assert get_recovery_path() == os.path.join(recovery_dir, "recovery.srd")
+
+
+def test_atomic_write(tmp_path):
+    """ Tests atomic writes replace the file and leave no temporary files behind """
+    path = str(tmp_path / "ship.srd")
+    atomic_write(path, "first")
+    atomic_write(path, "second")
+
+    with open(path) as f:
+        assert f.read() == "second"
+    assert os.listdir(str(tmp_path)) == ["ship.srd"]
+
+
+def test_autosave_and_recover():
+    """ Tests snapshots are written in the background and can be recovered """
+    fileloader = FileLoader()
+    autosaver = AutoSaver()
+    assert autosaver.has_recovery() is False
+
+    # Submitting a burst of edits, only the last needs to land
+    for tonnage in range(100, 1100, 100):
+        autosaver.submit(fileloader.encode_model(Spacecraft(tonnage)))
+    assert autosaver.flush(timeout=5) is True
+    assert 1 <= autosaver.saves <= 10
+    assert autosaver.failures == 0
+
+    assert autosaver.has_recovery() is True
+    assert fileloader.load_spacecraft(autosaver.path).tonnage == 1000
+
+    # Discarding removes the recovery file
+    autosaver.discard()
+    assert autosaver.has_recovery() is False
+    autosaver.stop()
+
+
+def test_autosave_failure(tmp_path, capsys):
+    """ Tests a snapshot that can't be written is counted as a failure rather than a save """
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory")
+    autosaver = AutoSaver(str(blocker / "recovery.srd"))
+
+    autosaver.submit(FileLoader().encode_model(Spacecraft(100)))
+    assert autosaver.flush(timeout=5) is True
+    assert autosaver.saves == 0
+    assert autosaver.failures == 1
+    assert "Error: autosave to" in capsys.readouterr().out
+    autosaver.stop()
+
+
+def test_window_autosave(qtbot):
+    """ Tests the window snapshots its ship once edits settle """
+    from imperium.gui.window import Window
+    window = Window()
+    qtbot.addWidget(window)
+    assert window.autosave_timer.isActive() is False
+
+    # An edit starts the countdown, firing it writes the recovery file
+    window.tonnage_box.setCurrentIndex(1)
+    window.edit_tonnage()
+    assert window.autosave_timer.isActive() is True
+
+    window.autosave_timer.stop()
+    window.autosave()
+    assert window.autosaver.flush(timeout=5) is True
+    assert window.fileloader.load_spacecraft(window.autosaver.path).tonnage == 200
+
+    # Resetting the ship drops the recovery file
+    window.reset_ship()
+    assert window.autosaver.has_recovery() is False
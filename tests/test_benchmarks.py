@@ -0,0 +1,122 @@
+"""
+@file test_benchmarks.py
+
+Smoke tests for the benchmark suite, checking every benchmark is found and results are written
+"""
+import json
+import subprocess
+import sys
+
+RUNNER = "benchmarks/run.py"
+
+
+def run(*args):
+    # Runs the benchmark runner in a fresh interpreter, as it is started
+    return subprocess.run([sys.executable, RUNNER] + list(args), capture_output=True, text=True)
+
+
+def test_list():
+    """ Tests every group of benchmarks is registered """
+    process = run("--list")
+    assert process.returncode == 0, process.stderr
+    names = process.stdout.split()
+    assert {name.split(".")[0] for name in names} == {"components", "compression", "fileloader", "gui", "scenario",
+                                                      "spacecraft"}
+    assert "spacecraft.total_cost_max" in names and "gui.update_stats" in names
+
+
+def test_results(tmp_path):
+    """ Tests results are written as JSON with the samples and their statistics """
+    path = tmp_path / "results.json"
+    process = run("-k", "spacecraft.total_cost", "--repeat", "3", "--min-time", "0", "--json", str(path))
+    assert process.returncode == 0, process.stderr
+
+    document = json.loads(path.read_text())
+    assert document['environment']['python']
+    assert [result['name'] for result in document['benchmarks']] == ["spacecraft.total_cost_small",
+                                                                    "spacecraft.total_cost_max"]
+    for result in document['benchmarks']:
+        assert len(result['samples']) == 3
+        assert result['min'] <= result['median'] <= result['max']
+
+    assert run("-k", "nonsense").returncode == 1
+
+
+def test_summarize(monkeypatch):
+    """ Tests the quartiles of samples match those statistics.quantiles gives on newer Pythons """
+    monkeypatch.syspath_prepend("benchmarks")
+    from harness import quartiles, summarize
+
+    assert quartiles([1, 2, 3, 4, 5, 6, 7, 8]) == [2.25, 4.5, 6.75]
+    assert quartiles([1, 2]) == [0.75, 1.5, 2.25]
+    summary = summarize([3.0, 1.0, 2.0, 4.0])
+    assert summary['mean'] == 2.5 and summary['median'] == 2.5 and summary['iqr'] == 2.5
+    assert summarize([1.0])['iqr'] == 0.0
+
+
+def test_welch(monkeypatch):
+    """ Tests the t-test's tail against tabulated values of Student's t distribution """
+    monkeypatch.syspath_prepend("benchmarks")
+    from compare import incomplete_beta, welch_test
+
+    for t, df, tail in ((2.228, 10, 0.025), (12.706, 1, 0.025), (2.576, 1e6, 0.005), (0.0, 5, 0.5)):
+        assert abs(0.5 * incomplete_beta(df / 2, 0.5, df / (df + t * t)) - tail) < 1e-4
+
+    _, _, p = welch_test([1.0, 1.1, 0.9, 1.0], [2.0, 2.1, 1.9, 2.0])
+    assert p < 0.001
+    _, _, p = welch_test([2.0, 2.1, 1.9, 2.0], [1.0, 1.1, 0.9, 1.0])
+    assert p > 0.999
+
+
+def test_compare(tmp_path):
+    """ Tests a run compared with its own results is unchanged, and a slowed copy regressed """
+    baseline = tmp_path / "baseline.json"
+    process = run("-k", "spacecraft.total_cost_small", "--repeat", "5", "--min-time", "0", "--rounds", "3",
+                  "--json", str(baseline))
+    assert process.returncode == 0, process.stderr
+    document = json.loads(baseline.read_text())
+    assert len(document['benchmarks'][0]['rounds']) == 3
+    assert len(document['benchmarks'][0]['samples']) == 15
+
+    def compare(*args):
+        return subprocess.run([sys.executable, "benchmarks/compare.py", "--baseline", str(baseline)] + list(args),
+                              capture_output=True, text=True)
+
+    process = compare("--results", str(baseline))
+    assert process.returncode == 0, process.stderr
+    assert "unchanged" in process.stdout and "No regressions in 1 benchmarks" in process.stdout
+
+    # Three times slower, spread as the baseline was
+    result = document['benchmarks'][0]
+    for key in ("samples", "rounds"):
+        result[key] = [seconds * 3 for seconds in result[key]]
+    result['median'] *= 3
+    slowed = tmp_path / "slowed.json"
+    slowed.write_text(json.dumps(document))
+    process = compare("--results", str(slowed))
+    assert process.returncode == 1
+    assert "regressed" in process.stdout and "+200.0%" in process.stdout
+
+    # A threshold above the slowdown lets it through
+    assert compare("--results", str(slowed), "--threshold", "3").returncode == 0
+    assert compare("--baseline", str(tmp_path / "missing.json")).returncode == 2
+
+
+def test_memory(tmp_path):
+    """ Tests the memory harness sizes fleets by part and site, and fails a budget too small """
+    path = tmp_path / "memory.json"
+    process = subprocess.run([sys.executable, "benchmarks/memory.py", "--ships", "24", "12", "--json", str(path)],
+                             capture_output=True, text=True)
+    assert process.returncode == 0, process.stderr
+    assert "each further ship holds" in process.stdout
+
+    document = json.loads(path.read_text())
+    assert [fleet['ships'] for fleet in document['fleets']] == [12, 24]
+    largest = document['fleets'][-1]
+    assert 0 < largest['per_ship'] <= document['budget']
+    assert largest['parts']['hardpoints'] > 0 and largest['sites']
+
+    process = subprocess.run([sys.executable, "benchmarks/memory.py", "--ships", "12", "--budget", "100"],
+                             capture_output=True, text=True)
+    assert process.returncode == 1
+    assert "OVER" in process.stdout
@@ -0,0 +1,49 @@
+"""
+@file test_cli.py
+
+Unit tests for the command line front door, checking the headless tools never import PyQt5
+"""
+import subprocess
+import sys
+import pytest
+from imperium.cli import COMMANDS, main
+
+MODELS = "imperium/shipyard/models/default"
+
+
+def run(*args):
+    """
+    Runs python in a fresh interpreter, as the tools are started
+    :param args: arguments for python
+    :return: completed process
+    """
+    return subprocess.run([sys.executable] + list(args), capture_output=True, text=True)
+
+
+@pytest.mark.parametrize("argv", [["list", MODELS], ["validate", MODELS], ["diff", "tests/testship.srd", "tests/testship.srd"]])
+def test_headless_without_qt(argv):
+    """ Tests headless subcommands run without PyQt5 being imported """
+    code = ("import sys\nfrom imperium.cli import main\nstatus = main({!r})\n"
+            "assert not [name for name in sys.modules if name.startswith('PyQt5')], 'PyQt5 imported'\n"
+            "sys.exit(status)").format(argv)
+    process = run("-c", code)
+    assert process.returncode == 0, process.stderr
+
+
+def test_importtime():
+    """ Tests -X importtime shows no PyQt5 or GUI module imported by a headless run """
+    process = run("-X", "importtime", "-m", "imperium", "list", MODELS)
+    assert process.returncode == 0
+    assert "imperium.shipyard.header" in process.stderr
+    assert "PyQt5" not in process.stderr
+    assert "imperium.gui" not in process.stderr
+
+
+def test_usage(capsys):
+    """ Tests the help lists every subcommand and unknown ones are refused """
+    assert main(["--help"]) == 0
+    out = capsys.readouterr().out
+    assert all(name in out for name in COMMANDS)
+
+    assert main(["nonsense"]) == 2
+    assert "Error: unknown command 'nonsense'" in capsys.readouterr().err
@@ -0,0 +1,88 @@
+"""
+@file test_compression.py
+
+Unit tests for compressed SRD files and fleet archives
+"""
+import io
+import os
+import shutil
+import pytest
+from imperium.shipyard.compression import (CODECS, codec_from_magic, codec_from_path, detect_codec, is_srd,
+                                           open_file, open_stream, srd_stem)
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.header import list_directory, read_header
+from imperium.shipyard.migrate import migrate_file
+from imperium.shipyard.schema import SRD_VERSION
+from imperium.shipyard.stream import export_directory, import_directory, read_fleet, write_fleet
+
+
+def test_names():
+    """ Tests codec extensions are recognised on SRD filenames """
+    assert codec_from_path("Corsair.srd.gz") == "gzip"
+    assert codec_from_path("fleet.jsonl.xz") == "lzma"
+    assert codec_from_path("Corsair.srd") is None
+    assert is_srd("Corsair.srd.bz2")
+    assert not is_srd("fleet.jsonl.gz")
+    assert srd_stem("/ships/Corsair.srd.gz") == "Corsair"
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_save_and_load(tmp_path, codec):
+    """ Tests a compressed SRD file round trips and its codec is detected whatever it is named """
+    fileloader = FileLoader()
+    spacecraft = fileloader.load_spacecraft("tests/testship.srd")
+
+    path = str(tmp_path / ("testship.srd" + CODECS[codec][2]))
+    fileloader.save_model(path, spacecraft)
+    assert detect_codec(path) == codec
+
+    renamed = str(tmp_path / "renamed.srd")
+    shutil.copy(path, renamed)
+    for loaded in (fileloader.load_spacecraft(path), fileloader.load_spacecraft(renamed)):
+        assert loaded.get_total_cost() == spacecraft.get_total_cost()
+        assert loaded.get_remaining_cargo() == spacecraft.get_remaining_cargo()
+
+    assert read_header(path)['stats']['cost'] == 383.725
+    assert [filename for filename, _ in list_directory(str(tmp_path))] == sorted(os.listdir(str(tmp_path)))
+
+
+def test_migrate_keeps_codec(tmp_path):
+    """ Tests migrating a compressed file upgrades it and keeps it compressed """
+    path = str(tmp_path / "testship.srd.gz")
+    with open("tests/testship.srd") as f, open_file(path, 'w') as out:
+        out.write(f.read())
+
+    _, result = migrate_file(path)
+    assert result == "upgraded"
+    assert detect_codec(path) == "gzip"
+    assert read_header(path)['version'] == SRD_VERSION
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_stream(codec):
+    """ Tests fleets stream through a compressed archive """
+    ships = [FileLoader().load_spacecraft("tests/testship.srd") for _ in range(3)]
+
+    buffer = io.BytesIO()
+    with open_stream(buffer, 'w', codec) as f:
+        assert write_fleet(ships, f) == 3
+    assert codec_from_magic(buffer.getvalue()) == codec
+
+    with open_stream(io.BytesIO(buffer.getvalue()), 'r') as f:
+        loaded = list(read_fleet(f))
+    assert len(loaded) == 3
+    assert loaded[0].get_total_cost() == ships[0].get_total_cost()
+
+
+def test_directory_codec(tmp_path):
+    """ Tests importing an archive into compressed files and exporting them back """
+    buffer = io.StringIO()
+    export_directory("imperium/shipyard/models/default", buffer)
+
+    directory = str(tmp_path / "ships")
+    count = import_directory(io.StringIO(buffer.getvalue()), directory, codec="bz2")
+    assert count == len(os.listdir(directory))
+    assert all(filename.endswith(".srd.bz2") for filename in os.listdir(directory))
+
+    exported = io.StringIO()
+    assert export_directory(directory, exported) == count
@@ -0,0 +1,187 @@
+"""
+@file test_diff.py
+
+Unit tests for the structural diff between designs
+"""
+import json
+import shutil
+import pytest
+from imperium.classes.armour import Armour
+from imperium.classes.hardpoint import Hardpoint
+from imperium.classes.misc import Misc
+from imperium.classes.spacecraft import Spacecraft
+from imperium.classes.turrets import Turret
+from imperium.shipyard.diff import ComponentCache, diff_libraries, diff_spacecraft, diff_files, main
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.stream import write_fleet
+
+
+def load():
+    return FileLoader().load_spacecraft("tests/testship.srd")
+
+
+def find(changeset, section, key):
+    for change in changeset['changes']:
+        if change['section'] == section and change['key'] == key:
+            return change
+    return None
+
+
+def test_components_sum_to_totals():
+    """ Tests component shares add up to the ship's cost and cargo """
+    spacecraft = load()
+    components = spacecraft.get_components()
+    assert round(sum(entry['cost'] for entry in components.values()), 6) == round(spacecraft.get_total_cost(), 6)
+    assert round(sum(entry['cargo'] for entry in components.values()), 2) == spacecraft.get_remaining_cargo()
+
+
+def test_identical():
+    """ Tests a design has no changes against itself """
+    changeset = diff_files("tests/testship.srd", "tests/testship.srd")
+    assert changeset['changes'] == []
+    assert changeset['stats'] == {}
+
+
+def test_component_changes():
+    """ Tests added, removed and changed components carry their impact """
+    old = load()
+    new = load()
+    new.modify_misc(Misc("Low Passage Berths", 4))
+    new.remove_hardpoint(new.hardpoints[-1])
+    new.add_armour(Armour(new.armour[0].type))
+
+    changeset = diff_spacecraft(old, new)
+    berths = find(changeset, "misc", "Low Passage Berths")
+    assert berths['change'] == "added"
+    assert berths['new'] == 4
+    assert berths['impact']['cargo'] < 0
+
+    removed = find(changeset, "hardpoints", old.hardpoints[-1].id)
+    assert removed['change'] == "removed"
+    assert removed['impact']['cost'] == -round(old.hardpoints[-1].get_cost(), 3)
+
+    armour = find(changeset, "armour", old.armour[0].type)
+    assert armour['change'] == "changed"
+    assert armour['new'] == armour['old'] + 1
+
+    # Impacts add up to the change in totals
+    assert round(sum(change['impact']['cost'] for change in changeset['changes']), 3) == changeset['stats']['cost']['delta']
+    assert round(sum(change['impact']['cargo'] for change in changeset['changes']), 3) == changeset['stats']['cargo']['delta']
+
+
+def test_turret_fields():
+    """ Tests a turret change is matched by hardpoint id and reported field by field """
+    old = load()
+    new = load()
+    hardpoint = new.hardpoints[0]
+    hardpoint.turret.modify_weapon("---", 1)
+    hardpoint.turret.modify_sandcaster_barrel(hardpoint.turret.sandcaster_barrels + 1)
+
+    change = find(diff_spacecraft(old, new), "hardpoints", hardpoint.id)
+    assert change['change'] == "changed"
+    assert change['fields']['turret.weapons.1'] == ["Beam Laser", None]
+    assert "turret.sandcaster_barrels" in change['fields']
+    assert len(change['fields']) == 2
+
+
+def test_tonnage_reprices():
+    """ Tests components priced off the hull are reported as repriced after a tonnage change """
+    old = load()
+    new = load()
+    new.set_tonnage(old.tonnage + 100)
+
+    changeset = diff_spacecraft(old, new)
+    assert find(changeset, "hull", "tonnage")['change'] == "changed"
+    assert any(change['change'] == "repriced" for change in changeset['changes'])
+    assert round(sum(change['impact']['cost'] for change in changeset['changes']), 3) == changeset['stats']['cost']['delta']
+
+
+def test_component_cache():
+    """ Tests the component cache lists only the sections marked as changed and matches a full listing """
+    spacecraft = load()
+    cache = ComponentCache(spacecraft)
+    components, listed = cache.components()
+    assert components == spacecraft.get_components()
+    assert cache.stats(components) == {stat: spacecraft.get_stats()[stat] for stat in cache.stats(components)}
+
+    # Adding armour leaves the other sections alone, though the discount is repriced
+    spacecraft.add_armour(Armour("Titanium Steel"))
+    cache.invalidate(["armour"])
+    components, listed = cache.components()
+    assert listed == {"armour"}
+    assert components == spacecraft.get_components()
+    assert cache.stats(components)['cost'] == round(spacecraft.get_total_cost(), 3)
+
+    # Nothing is listed again without a change
+    assert cache.components()[1] == set()
+
+
+def test_diff_libraries(tmp_path):
+    """ Tests diffing a directory against an archive pairs designs by name """
+    directory = tmp_path / "library"
+    directory.mkdir()
+    shutil.copy("tests/testship.srd", str(directory / "Same.srd"))
+    shutil.copy("tests/testship.srd", str(directory / "Edited.srd"))
+    shutil.copy("tests/testship.srd", str(directory / "Gone.srd"))
+
+    ships = list()
+    for name in ("Same", "Edited", "New"):
+        spacecraft = load()
+        spacecraft.name = name
+        ships.append(spacecraft)
+    ships[1].add_hardpoint(Hardpoint(99))
+    ships[1].hardpoints[-1].add_turret(Turret("Single Turret"))
+
+    archive = tmp_path / "fleet.jsonl"
+    with open(str(archive), 'w') as f:
+        write_fleet(ships, f)
+
+    records = {record['name']: record for record in diff_libraries(str(directory), str(archive))}
+    assert set(records.keys()) == {"Edited", "New", "Gone"}
+    assert records['New']['status'] == "added"
+    assert records['Gone']['status'] == "removed"
+    assert records['Edited']['status'] == "changed"
+    assert find(records['Edited']['diff'], "hardpoints", 99)['change'] == "added"
+
+    # Change sets are machine readable
+    json.dumps(records)
+
+
+def test_archive_names(tmp_path):
+    """ Tests unnamed archive designs are paired by position and duplicate names are refused """
+    archive = tmp_path / "fleet.jsonl"
+    with open(str(archive), 'w') as f:
+        write_fleet([Spacecraft(100), Spacecraft(200), Spacecraft(300)], f)
+    edited = tmp_path / "edited.jsonl"
+    with open(str(edited), 'w') as f:
+        write_fleet([Spacecraft(100), Spacecraft(400), Spacecraft(300)], f)
+
+    records = list(diff_libraries(str(archive), str(edited)))
+    assert [(record['name'], record['status']) for record in records] == [("Ship 2", "changed")]
+
+    twins = list()
+    for _ in range(2):
+        twins.append(Spacecraft(100))
+        twins[-1].name = "Twin"
+    with open(str(edited), 'w') as f:
+        write_fleet(twins, f)
+    with pytest.raises(ValueError):
+        list(diff_libraries(str(archive), str(edited)))
+
+
+def test_main_exit_codes(tmp_path, capsys):
+    """ Tests the command returns 0 on success and 2 for missing files or clashing names """
+    assert main(["tests/testship.srd", "tests/testship.srd"]) == 0
+    assert main(["tests/testship.srd", str(tmp_path / "missing.srd")]) == 2
+    assert capsys.readouterr().err.startswith("Error: ")
+
+    with open(str(tmp_path / "twins.jsonl"), 'w') as f:
+        write_fleet([Spacecraft(100), Spacecraft(100)], f)
+    assert main([str(tmp_path / "twins.jsonl"), str(tmp_path / "twins.jsonl")]) == 0
+    twins = [Spacecraft(100), Spacecraft(200)]
+    for spacecraft in twins:
+        spacecraft.name = "Twin"
+    with open(str(tmp_path / "clash.jsonl"), 'w') as f:
+        write_fleet(twins, f)
+    assert main([str(tmp_path / "twins.jsonl"), str(tmp_path / "clash.jsonl")]) == 2
+    assert "Error" in capsys.readouterr().err
@@ -0,0 +1,68 @@
+"""
+@file test_header.py
+
+Unit tests for reading the summary header of SRD files
+"""
+import json
+import pytest
+from imperium.classes.spacecraft import Spacecraft
+from imperium.shipyard.fileloader import FileLoader, hash_model
+from imperium.shipyard.header import format_listing, list_directory, parse_header, read_header
+
+
+def test_read_header(tmp_path):
+    """ Tests the header of a saved ship matches the full file """
+    path = str(tmp_path / "testship.srd")
+    fileloader = FileLoader()
+    fileloader.save_model(path, fileloader.load_spacecraft("tests/testship.srd"))
+
+    header = read_header(path)
+    assert list(header.keys()) == ["version", "name", "stats", "drives", "hash"]
+    assert header['stats']['cost'] == 383.725
+    assert header['stats']['jump'] == 1
+    assert header['drives']['jdrive'] == "C"
+
+    with open(path) as f:
+        assert header['hash'] == hash_model(json.load(f))
+
+
+def test_parse_header_bounded():
+    """ Tests parsing stops at the body and asks for more text when cut off """
+    text = '{"name": "Ship", "stats": {"tonnage": 100}, "drives": {}, "config": {"broken'
+    assert parse_header(text) == {"name": "Ship", "stats": {"tonnage": 100}, "drives": {}}
+
+    # Cut off inside the header
+    assert parse_header(text[:30]) is None
+    assert parse_header('{"name": "Ship", "stats": {"tonnage": 10') is None
+
+
+def test_long_and_legacy_headers(tmp_path):
+    """ Tests headers longer than the first read and files from before the header layout """
+    ship = Spacecraft(200)
+    ship.name = "X" * 5000
+    path = str(tmp_path / "long.srd")
+    FileLoader().save_model(path, ship)
+    assert read_header(path)['name'] == ship.name
+
+    # Older files carry no hash or jump, but still lead with their stats
+    header = read_header("tests/testship.srd")
+    assert "hash" not in header
+    assert header['stats']['tonnage'] == 500
+
+    # Files with the stats after the body are parsed in full
+    path = str(tmp_path / "reordered.srd")
+    with open("tests/testship.srd") as f:
+        model = json.load(f)
+    with open(path, 'w') as f:
+        json.dump({"hardpoints": model['hardpoints'], "stats": model['stats']}, f)
+    assert read_header(path) == {"stats": model['stats']}
+
+
+def test_listing():
+    """ Tests listing the default ships """
+    listing = list_directory("imperium/shipyard/models/default")
+    assert len(listing) == 12
+
+    table = format_listing(listing).splitlines()
+    assert len(table) == 13
+    assert table[0].split() == ["File", "Tonnage", "Cost", "Cargo", "Jump", "Thrust", "Drives"]
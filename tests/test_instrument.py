@@ -0,0 +1,73 @@
+"""
+@file test_instrument.py
+
+Unit tests for the opt-in instrumentation counters and timers
+"""
+import json
+import os
+import subprocess
+import sys
+import pytest
+from imperium import instrument
+from imperium.classes.spacecraft import Spacecraft
+
+
+@pytest.fixture()
+def enabled(monkeypatch):
+    """ Turns instrumentation on for functions decorated within the test, with zeroed totals """
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    monkeypatch.setattr(instrument, "counters", dict())
+    monkeypatch.setattr(instrument, "timers", dict())
+    yield instrument
+
+
+def test_disabled_untouched():
+    """ Tests the hot paths are left undecorated while instrumentation is off """
+    assert not instrument.ENABLED
+    assert not hasattr(Spacecraft.get_total_cost, "__wrapped__")
+
+    instrument.count("nothing")
+    assert "nothing" not in instrument.counters
+
+
+def test_counters_and_timers(enabled):
+    """ Tests decorated functions are counted and timed, and the totals reported """
+    @instrument.timed("test.add")
+    def add(a, b):
+        return a + b
+
+    @instrument.counted("test.called")
+    def called():
+        return None
+
+    assert add(1, 2) == 3
+    add(3, 4)
+    called()
+    instrument.count("test.bytes", 100)
+
+    state = instrument.snapshot()
+    assert state['counters'] == {"test.bytes": 100, "test.called": 1}
+    assert state['timers']['test.add']['calls'] == 2
+    assert state['timers']['test.add']['max'] >= state['timers']['test.add']['mean'] > 0
+
+    lines = instrument.format_report(state)
+    assert lines[1].split()[:2] == ["test.add", "2"]
+    assert any(line.split() == ["test.bytes", "100"] for line in lines)
+
+
+def test_dump_on_exit(tmp_path):
+    """ Tests IMPERIUM_INSTRUMENT turns instrumentation on and writes the totals on exit """
+    path = tmp_path / "totals.json"
+    code = ("from imperium.shipyard.fileloader import FileLoader\n"
+            "spacecraft = FileLoader().load_spacecraft('tests/testship.srd')\n"
+            "spacecraft.get_total_cost()\nspacecraft.get_remaining_cargo()\n")
+    env = dict(os.environ, **{instrument.INSTRUMENT_ENV: str(path)})
+    process = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert process.returncode == 0, process.stderr
+
+    state = json.loads(path.read_text())
+    assert state['timers']['srd.load']['calls'] == 1
+    assert state['timers']['spacecraft.get_total_cost']['calls'] >= 1
+    assert state['counters']['catalog.parsed.hull_turrets.json'] == 1
+    assert state['counters']['catalog.bytes.hull_turrets.json'] == os.path.getsize("imperium/resources/hull_turrets.json")
+    assert state['counters']['catalog.get_file_data'] > state['counters']['catalog.parsed.hull_turrets.json']
@@ -0,0 +1,69 @@
+"""
+@file test_jobs.py
+
+Unit tests for the background jobs run over designs
+"""
+import json
+import os
+import shutil
+from imperium.shipyard.jobs import order_rows, scan_fleet, sweep_drives, validate_files
+from imperium.shipyard.stream import export_directory
+
+
+def test_validate_files(tmp_path):
+    """ Tests validating a folder finds the files that don't load, leaving the rest alone """
+    directory = str(tmp_path / "ships")
+    shutil.copytree("imperium/shipyard/models/default", directory)
+    shutil.copy("tests/testship.srd", directory)
+    with open(os.path.join(directory, "broken.srd"), 'w') as f:
+        f.write("{not json")
+    before = {filename: os.path.getmtime(os.path.join(directory, filename)) for filename in os.listdir(directory)}
+
+    results = dict(validate_files([directory]))
+    assert len(results) == len(before)
+    assert [os.path.basename(path) for path, errors in results.items() if errors] == ["broken.srd"]
+    assert results[os.path.join(directory, "testship.srd")] == []
+
+    # Older files are upgraded in memory only
+    after = {filename: os.path.getmtime(os.path.join(directory, filename)) for filename in os.listdir(directory)}
+    assert after == before
+
+
+def test_sweep_drives():
+    """ Tests sweeping drives only yields combinations the hull can take """
+    with open("tests/testship.srd") as f:
+        model = json.load(f)
+    original = json.dumps(model)
+
+    variants = list(sweep_drives(model, letters=["A", "B", "C", "D"]))
+    assert json.dumps(model) == original
+    assert len(variants) > 0
+
+    for (jdrive, mdrive, pplant), stats in variants:
+        assert pplant >= max(jdrive, mdrive)
+        assert stats['tonnage'] == 500
+
+    # Bigger drives on the same hull leave less cargo
+    cargo = {letters: stats['cargo'] for letters, stats in variants}
+    assert cargo[("C", "C", "C")] > cargo[("D", "D", "D")]
+
+
+def test_scan_fleet(tmp_path):
+    """ Tests a folder and an archive of it list the same designs, and rows order without decoding """
+    directory = "imperium/shipyard/models/default"
+    archive = str(tmp_path / "fleet.jsonl")
+    with open(archive, 'w') as f:
+        export_directory(directory, f)
+
+    listed = list(scan_fleet(directory))
+    archived = list(scan_fleet(archive))
+    assert [values for values, _ in listed] == [values for values, _ in archived]
+    assert listed[0] == (["Corsair", 400, 160.16, 162.0, 2, 3, 0], (os.path.join(directory, "Corsair.srd"), None))
+    assert archived[2][1] == (archive, 2)
+
+    # Sorting by cost, with a filter on the name
+    columns = [list(column) for column in zip(*(values for values, _ in listed))]
+    folded = [name.casefold() for name in columns[0]]
+    rows = order_rows(columns, folded, len(folded), sort=2, descending=True, text="TRADER")
+    assert [columns[0][row] for row in rows] == ["Far Trader", "Free Trader Type-A"]
+    assert [columns[0][row] for row in order_rows(columns, folded, 3)] == columns[0][:3]
@@ -0,0 +1,102 @@
+"""
+@file test_library.py
+
+Unit tests for the SQLite-backed ship library
+"""
+import json
+import shutil
+import pytest
+from imperium.classes.spacecraft import Spacecraft
+from imperium.shipyard.library import ShipLibrary
+from imperium.shipyard.schema import SRD_VERSION
+
+DEFAULT_MODELS = "imperium/shipyard/models/default"
+
+
+@pytest.fixture()
+def library():
+    """ Before all for the tests, building a library of the default ships """
+    library = ShipLibrary()
+    library.import_directory(DEFAULT_MODELS)
+    yield library
+    library.close()
+
+
+def test_import_directory(library):
+    """ Tests bulk importing and re-importing a directory of ships """
+    assert len(library) == 12
+
+    # Unchanged files are skipped on a second import
+    assert library.import_directory(DEFAULT_MODELS) == 0
+    assert len(library) == 12
+
+
+def test_query(library):
+    """ Tests searching the library on stat ranges """
+    names = [entry.name for entry in library.query(min_jump=2, max_cost=100, min_cargo=20, order_by="cost")]
+    assert names == ["Seeker Miner Ship", "Far Trader"]
+
+    largest = next(library.query(order_by="tonnage", descending=True, limit=1))
+    assert largest.name == "Heavy Freighter"
+    assert largest.tonnage == 1000
+    assert largest.cargo == 556
+
+    with pytest.raises(ValueError):
+        list(library.query(min_colour=2))
+
+
+def test_lazy_spacecraft(library):
+    """ Tests the spacecraft of an entry is only built when accessed """
+    entry = next(library.query(name="Far Trader"))
+    assert entry._spacecraft is None
+
+    spacecraft = entry.spacecraft
+    assert spacecraft.tonnage == 200
+    assert round(spacecraft.get_total_cost(), 3) == entry.cost
+    assert entry.spacecraft is spacecraft
+
+
+def test_add_and_reindex(library):
+    """ Tests adding a design directly and reindexing designs from an older catalog """
+    ship = Spacecraft(300)
+    ship.name = "Hauler"
+    row_id = library.add(ship)
+    assert library.get_spacecraft(row_id).tonnage == 300
+    assert next(library.query(name="Hauler")).cargo == 300
+
+    # Nothing is stale against the current catalog
+    assert library.reindex() == 0
+
+    # Mark every design as indexed against an old catalog
+    with library.connection:
+        library.connection.execute("UPDATE ships SET catalog = 'old', cost = 0")
+    assert library.reindex() == 13
+    assert next(library.query(name="Hauler")).cost == 12.0
+
+    library.remove(row_id)
+    assert len(library) == 12
+
+
+def test_import_legacy(tmp_path):
+    """ Tests a version 1 file is stored upgraded and keeps its parts through a reindex """
+    shutil.copy("tests/testship.srd", str(tmp_path / "testship.srd"))
+    library = ShipLibrary()
+    assert library.import_directory(str(tmp_path)) == 1
+
+    entry = next(library.query())
+    srd = json.loads(library.connection.execute("SELECT srd FROM ships").fetchone()['srd'])
+    assert srd['version'] == SRD_VERSION
+    assert srd['config']['options'] == ["Reflec", "Self-Sealing", "Stealth"]
+
+    spacecraft = entry.spacecraft
+    assert [option.name for option in spacecraft.hull_options] == ["Reflec", "Self-Sealing", "Stealth"]
+    assert len(spacecraft.screens) == 2
+    assert round(spacecraft.get_total_cost(), 3) == entry.cost == 383.725
+
+    assert library.reindex(force=True) == 1
+    assert [entry.name for entry in library.query(min_cost=383, max_cost=384)] == [entry.name]
+
+    # The id returned is the row just written
+    row_id = library.add(Spacecraft(100))
+    assert library.get_spacecraft(row_id).tonnage == 100
+    library.close()
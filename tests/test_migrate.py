@@ -0,0 +1,165 @@
+"""
+@file test_migrate.py
+
+Unit tests for the SRD schema migrations and the batch migrator
+"""
+import json
+import os
+import shutil
+import stat
+import pytest
+from imperium.shipyard import migrate
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.migrate import UPGRADED, migrate_file, migrate_library, migrate_paths, validate
+from imperium.shipyard.schema import MIGRATIONS, SRD_VERSION, get_version, hash_model, upgrade
+
+
+def test_registry():
+    """ Tests there is a migration from every old version """
+    assert sorted(MIGRATIONS.keys()) == list(range(1, SRD_VERSION))
+
+
+def test_upgrade():
+    """ Tests a legacy file is upgraded through every version """
+    with open("tests/testship.srd") as f:
+        model = json.load(f)
+    assert get_version(model) == 1
+
+    model = upgrade(model)
+    assert list(model.keys())[0] == "version"
+    assert model['version'] == SRD_VERSION
+    assert model['hardpoints'][0]['turret']['weapons'] == ["Sandcaster", "Beam Laser"]
+    assert model['config']['options'] == ["Reflec", "Self-Sealing", "Stealth"]
+    assert model['config']['screens'] == ["Meson Screen", "Nuclear Damper"]
+    assert validate(model) == []
+
+    # Upgrading twice changes nothing
+    assert upgrade(model) is model
+
+
+def test_upgrade_leaves_input():
+    """ Tests upgrading leaves the given dictionary untouched, so decoding it twice gives the same ship """
+    with open("tests/testship.srd") as f:
+        model = json.load(f)
+    original = json.dumps(model)
+
+    fileloader = FileLoader()
+    first = fileloader.decode_model(model)
+    assert json.dumps(model) == original
+    second = fileloader.decode_model(model)
+    assert second.get_total_cost() == first.get_total_cost()
+    assert [option.name for option in second.hull_options] == [option.name for option in first.hull_options]
+    assert [screen.name for screen in second.screens] == [screen.name for screen in first.screens]
+
+
+def test_retired_weapon_kept(tmp_path):
+    """ Tests a weapon copy no longer in the catalog survives upgrading, loading, saving and migrating """
+    with open("tests/testship.srd") as f:
+        model = json.load(f)
+    retired = dict(model['hardpoints'][0]['turret']['weapons'][1], name="Retired Laser", cost=2.5)
+    model['hardpoints'][0]['turret']['weapons'][1] = retired
+
+    upgraded = upgrade(model)
+    assert upgraded['hardpoints'][0]['turret']['weapons'] == ["Sandcaster", retired]
+    assert validate(upgraded) == []
+
+    fileloader = FileLoader()
+    spacecraft = fileloader.decode_model(model)
+    assert spacecraft.hardpoints[0].turret.weapons[1] == retired
+    saved = fileloader.encode_model(spacecraft)
+    assert saved['hardpoints'][0]['turret']['weapons'] == ["Sandcaster", retired]
+    assert fileloader.decode_model(saved).get_total_cost() == spacecraft.get_total_cost()
+
+    path = str(tmp_path / "retired.srd")
+    with open(path, 'w') as f:
+        json.dump(model, f)
+    assert migrate_file(path)[1] == UPGRADED
+    assert fileloader.load_spacecraft(path).hardpoints[0].turret.weapons[1] == retired
+
+
+def test_unknown_weapon_name(tmp_path):
+    """ Tests a weapon stored only by a name the catalog lacks fails validation rather than being dropped """
+    with open("tests/testship.srd") as f:
+        model = upgrade(json.load(f))
+    model['hardpoints'][0]['turret']['weapons'][1] = "Retired Laser"
+    assert validate(model) == ["Error: unknown weapon Retired Laser on hardpoint 0KSQJ"]
+
+    legacy = dict(model, version=2)
+    legacy['config'] = dict(model['config'], options=[True, True, True], screens=[True, True])
+    path = str(tmp_path / "unknown.srd")
+    with open(path, 'w') as f:
+        json.dump(legacy, f)
+    assert "unknown weapon Retired Laser" in migrate_file(path)[1]
+    with open(path) as f:
+        assert get_version(json.load(f)) == 2
+
+
+def test_upgrade_flags():
+    """ Tests positional option and screen flags become names """
+    model = {"config": {"options": [True, False, True], "screens": [False, True]}, "hardpoints": [], "hash": None}
+    model = upgrade(model)
+    assert model['config']['options'] == ["Reflec", "Stealth"]
+    assert model['config']['screens'] == ["Nuclear Damper"]
+    assert model['hash'] == hash_model(model)
+
+
+def test_upgrade_newer():
+    """ Tests files from a newer version are refused """
+    with pytest.raises(ValueError):
+        upgrade({"version": SRD_VERSION + 1})
+
+
+def test_migrate_file_invalid(tmp_path):
+    """ Tests a file that fails validation is left as it was """
+    path = str(tmp_path / "broken.srd")
+    with open("tests/testship.srd") as f:
+        model = json.load(f)
+    model['drives']['jdrive'] = "Not A Drive"
+    with open(path, 'w') as f:
+        json.dump(model, f)
+
+    _, result = migrate_file(path)
+    assert result.startswith("Error")
+    with open(path) as f:
+        assert get_version(json.load(f)) == 1
+
+
+def test_migrate_file_keeps_mode(tmp_path):
+    """ Tests a file migrated in place keeps its permissions """
+    path = str(tmp_path / "testship.srd")
+    shutil.copy("tests/testship.srd", path)
+    os.chmod(path, 0o644)
+
+    assert migrate_file(path) == (path, UPGRADED)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+def test_migrate_file_write_error(tmp_path, monkeypatch):
+    """ Tests a file that can't be written back is reported rather than raised """
+    path = str(tmp_path / "testship.srd")
+    shutil.copy("tests/testship.srd", path)
+
+    def read_only(*args):
+        raise PermissionError("read-only file system")
+    monkeypatch.setattr(migrate, "atomic_write", read_only)
+
+    _, result = migrate_file(path)
+    assert result.startswith("Error: PermissionError")
+    with open(path) as f:
+        assert get_version(json.load(f)) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_migrate_library(tmp_path, workers):
+    """ Tests migrating a directory in place keeps every ship intact """
+    for idx in range(5):
+        shutil.copy("tests/testship.srd", str(tmp_path / "testship{}.srd".format(idx)))
+
+    results = list(migrate_library([str(tmp_path)], workers=workers, window=2))
+    assert len(results) == 5
+    assert all(result == UPGRADED for _, result in results)
+    assert migrate_paths([str(tmp_path)], workers=workers) == (5, 0, 0)
+
+    spacecraft = FileLoader().load_spacecraft(str(tmp_path / "testship0.srd"))
+    assert spacecraft.get_total_cost() == 383.725
+    assert spacecraft.get_remaining_cargo() == 62
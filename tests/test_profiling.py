@@ -0,0 +1,117 @@
+"""
+@file test_profiling.py
+
+Unit tests for the --profile option, the sampling profiler and the scripted scenarios
+"""
+import os
+import pstats
+import subprocess
+import sys
+import time
+import pytest
+from imperium.cli import main, split_options
+from imperium.profiling import Sampler, profile_call
+from imperium.scenarios import ADDED_HARDPOINTS, default_ships, get_scenario, next_tonnage, run_scenario
+from imperium.shipyard.fileloader import FileLoader
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def busy(seconds):
+    # Spins for a while so the sampler catches it
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+def test_split_options():
+    """ Tests the profiling options are taken off the front of the arguments only """
+    assert split_options(["list", "--profile"]) == (None, None, ["list", "--profile"])
+    assert split_options(["--profile", "list"]) == ("cprofile", None, ["list"])
+    assert split_options(["--profile=sample", "--profile-out", "out", "diff", "a"]) == ("sample", "out", ["diff", "a"])
+    with pytest.raises(ValueError):
+        split_options(["--profiles"])
+
+
+def test_cprofile(tmp_path, capsys):
+    """ Tests a cProfile run returns the result and writes stats naming the function """
+    output = str(tmp_path / "run")
+    assert profile_call(lambda: busy(0.01), "cprofile", output) == "done"
+
+    stats = pstats.Stats(output + ".pstats")
+    assert any(function == "busy" for _, _, function in stats.stats)
+    assert "Profile written to" in capsys.readouterr().err
+
+    with pytest.raises(ValueError):
+        profile_call(lambda: None, "nonsense", output)
+
+
+def test_sampler(tmp_path):
+    """ Tests the sampler writes collapsed stacks rooted at the thread name, skipping idle threads """
+    sampler = Sampler(interval=0.001)
+    sampler.start()
+    busy(0.2)
+    sampler.stop()
+    assert sampler.samples > 0
+
+    path = str(tmp_path / "run.collapsed")
+    sampler.write_collapsed(path)
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    assert lines
+    for line in lines:
+        stack, samples = line.rsplit(" ", 1)
+        assert int(samples) > 0
+        assert stack.startswith("MainThread;")
+    assert any("busy (test_profiling.py" in line for line in lines)
+
+
+def test_scenario_defaults(tmp_path):
+    """ Tests the defaults scenario saves every default ship resized and armed, the same each run """
+    steps = run_scenario(get_scenario("defaults"), repeat=2, directory=str(tmp_path))
+    assert steps.times["load"][0] == 2 * len(default_ships())
+    assert [line.split()[0] for line in steps.report()[1:]] == ["load", "edit", "add", "totals", "save"]
+
+    fileloader = FileLoader()
+    for path in default_ships():
+        original = fileloader.load_spacecraft(path)
+        saved = fileloader.load_spacecraft(str(tmp_path / os.path.basename(path)))
+        assert saved.tonnage == next_tonnage(original.tonnage)
+        assert len(saved.hardpoints) == len(original.hardpoints) + ADDED_HARDPOINTS
+
+    with pytest.raises(ValueError):
+        get_scenario("nonsense")
+
+
+def test_scenario_file(tmp_path, capsys):
+    """ Tests a scenario can be given as a Python file """
+    script = tmp_path / "session.py"
+    script.write_text("def run(steps, directory):\n    with steps('nap'):\n        pass\n")
+    assert main(["scenario", str(script), "--repeat", "3"]) == 0
+    assert "nap" in capsys.readouterr().out
+
+
+def test_profile_command(tmp_path):
+    """ Tests --profile on a headless command writes both kinds of profile, still without PyQt5 """
+    for mode, extension in (("cprofile", ".pstats"), ("sample", ".collapsed")):
+        output = str(tmp_path / mode)
+        code = ("import sys\nfrom imperium.cli import main\n"
+                "status = main(['--profile={}', '--profile-out', {!r}, 'scenario', 'defaults'])\n"
+                "assert not [name for name in sys.modules if name.startswith('PyQt5')], 'PyQt5 imported'\n"
+                "sys.exit(status)").format(mode, output)
+        process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+        assert process.returncode == 0, process.stderr
+        assert "save" in process.stdout
+        assert os.path.getsize(output + extension) > 0
+
+
+def test_scenario_gui(tmp_path):
+    """ Tests the GUI scenario runs offscreen and leaves the recovery file alone """
+    process = subprocess.run([sys.executable, "-m", "imperium", "scenario", "defaults-gui", "--out", str(tmp_path)],
+                             capture_output=True, text=True, cwd=ROOT,
+                             env=dict(os.environ, QT_QPA_PLATFORM="offscreen"))
+    assert process.returncode == 0, process.stderr
+    assert "add hardpoints" in process.stdout
+    assert len([name for name in os.listdir(str(tmp_path)) if name.endswith(".srd")]) == len(default_ships())
@@ -3,8 +3,17 @@
 
 Holds the unit tests for shipyard.py, which is mainly PyQT interactions
 """
+import json
+import os
+import shutil
+import threading
 import pytest
-from shipbuilder import Window
+from PyQt5.QtCore import Qt
+from imperium import instrument
+from imperium.gui.fleet import FleetModel
+from imperium.gui.window import Window
+from imperium.classes.option import Option
+from imperium.shipyard.fileloader import FileLoader
 
 
 @pytest.fixture()
@@ -15,6 +24,11 @@ def window(qtbot):
     yield window
 
 
+def cell(model, row, name):
+    """ Index of a named column of the hardpoint table """
+    return model.index(row, model.column(name))
+
+
 def test_base_stats_init(window):
     """ Tests for a base init of the Base Stats """
     assert window is not None
@@ -72,9 +86,236 @@ def test_edit_tonnage(window):
     assert window.spacecraft.tonnage == 200
     assert window.spacecraft.get_remaining_cargo() == 190
     assert window.spacecraft.get_total_cost() == 9.0
+    window.flush_stats()
     assert window.cost_line_edit.text() == "9.000"
 
 
+def test_stats_coalesced(window, qtbot):
+    """ Tests stats requests made within one turn of the event loop collapse into one refresh """
+    requests, refreshes = window.stats_requests, window.stats_refreshes
+    window.tonnage_box.setCurrentIndex(1)
+    window.edit_tonnage()
+    for _ in range(3):
+        window.add_hardpoint()
+    assert window.stats_requests - requests == 4
+    assert window.stats_refreshes == refreshes
+
+    qtbot.waitUntil(lambda: window.stats_refreshes == refreshes + 1)
+    assert window.stats_dirty is False
+    assert window.cost_line_edit.text() == "{:0.3f}".format(window.spacecraft.get_total_cost())
+
+
+def test_bulk_edit(window):
+    """ Tests loading and bulk edits sync every widget with a single refresh """
+    refreshes = window.stats_refreshes
+    window.fileloader.load_model("tests/testship.srd", window)
+    assert window.stats_refreshes == refreshes + 1
+    assert window.stats_dirty is False
+
+    # Widgets match the loaded ship straight away
+    assert window.tonnage_box.currentText() == "500"
+    assert window.jump_label.text() == "C"
+    assert window.reflec_check.isChecked() is True
+    assert window.nuclear_damper.isChecked() is True
+    assert window.computers.currentText() == "Model 4"
+    assert window.cost_line_edit.text() == "383.725"
+    for software in window.spacecraft.software:
+        assert window.software_box.findText(software.type) == -1
+    for misc in window.spacecraft.misc:
+        assert window.misc_box.findText(misc.name) == -1
+
+    # Changes made directly to the ship inside a bulk edit show once it ends
+    with window.bulk_edit() as spacecraft:
+        spacecraft.set_bridge()
+        spacecraft.modify_hull_option(Option("Reflec"))
+        assert window.reflec_check.isChecked() is True
+    assert window.stats_refreshes == refreshes + 2
+    assert window.bridge_check.isChecked() is False
+    assert window.reflec_check.isChecked() is False
+    assert len(window.spacecraft.hull_options) == 2
+    assert window.cost_line_edit.text() == "{:0.3f}".format(window.spacecraft.get_total_cost())
+
+
+def test_hardpoint_model(window):
+    """ Tests the hardpoint table only reports the rows and cells an edit touches """
+    window.tonnage_box.setCurrentText("2000")
+    window.edit_tonnage()
+    model = window.hardpoint_model
+
+    inserted = list()
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    for count in range(20):
+        window.add_hardpoint()
+    assert inserted == [(row, row) for row in range(20)]
+    assert model.rowCount() == 20
+
+    # Arming a turret reports the weapon cell and the cost and tonnage of its row
+    changed = list()
+    model.dataChanged.connect(lambda first, last: changed.append((first.row(), first.column(), last.column())))
+    assert model.setData(cell(model, 7, "Turret"), "Double Turret")
+    del changed[:]
+    assert model.setData(cell(model, 7, "Wep 2"), "Pulse Laser")
+    assert changed == [(7, model.column("Wep 2"), model.column("Wep 2")),
+                       (7, model.column("Cost"), model.column("Tons"))]
+
+    # Slots past the turret's weapons and unknown weapons can't be set
+    assert not model.setData(cell(model, 7, "Wep 3"), "Pulse Laser")
+    assert not model.setData(cell(model, 7, "Wep 1"), "Fusion Gun")
+
+    # Sorting by cost goes through the proxy, leaving the ship's order alone
+    hardpoint = window.spacecraft.hardpoints[7]
+    window.hardpoint_view.sortByColumn(model.column("Cost"), Qt.DescendingOrder)
+    assert window.hardpoint_proxy.mapToSource(window.hardpoint_proxy.index(0, 0)).row() == 7
+    assert window.spacecraft.hardpoints[7] is hardpoint
+
+    # Removing the selected row
+    window.hardpoint_view.selectRow(0)
+    window.remove_selected_hardpoints()
+    assert model.rowCount() == 19
+    assert hardpoint not in window.spacecraft.hardpoints
+
+
+def test_validate_folder(window, qtbot, tmp_path):
+    """ Tests validating a folder runs in the background and collects the failures """
+    directory = str(tmp_path / "ships")
+    shutil.copytree("imperium/shipyard/models/default", directory)
+    with open(os.path.join(directory, "broken.srd"), 'w') as f:
+        f.write("{not json")
+
+    worker = window.validate_folder(directory)
+    assert window.cancel_action.isEnabled()
+    with qtbot.waitSignal(worker.signals.finished, timeout=10000) as blocker:
+        pass
+    assert blocker.args == [True]
+    assert [os.path.basename(path) for path, _ in window.validation] == ["broken.srd"]
+    assert window.statusBar().currentMessage() == "Validated 13 SRD files, 1 failed"
+    assert window.workers == [] and not window.cancel_action.isEnabled()
+
+
+def test_fleet_browser(window, qtbot):
+    """ Tests browsing a folder lists it in the background, orders it off the GUI thread and opens rows """
+    worker = window.browse_fleet("imperium/shipyard/models/default")
+    with qtbot.waitSignal(worker.signals.finished, timeout=10000):
+        pass
+    browser = window.fleet_browser
+    model = browser.model
+    assert model.rowCount() == 12
+    assert model.data(model.index(0, 0)) == "Corsair"
+
+    # Sorting by tonnage twice sorts it from the largest down
+    def tonnages():
+        return [float(model.data(model.index(row, 1))) for row in range(model.rowCount())]
+
+    browser.sort_by(FleetModel.HEADERS.index("Tonnage"))
+    browser.sort_by(FleetModel.HEADERS.index("Tonnage"))
+    qtbot.waitUntil(lambda: window.workers == [], timeout=10000)
+    assert tonnages() == sorted(tonnages(), reverse=True) and tonnages() != sorted(tonnages())
+
+    browser.filter_line.setText("scout")
+    qtbot.waitUntil(lambda: model.rowCount() == 1, timeout=10000)
+
+    # Opening a row decodes it straight into the editor
+    browser.open_row(model.index(0, 0))
+    assert window.spacecraft.tonnage == 100
+    assert window.spacecraft.jdrive.drive_type == "A"
+    assert window.windowTitle() == "Imperium Shipyard - Scout Type-S.srd"
+    assert window.jump_label.text() == "A"
+
+
+def test_comparison(window, qtbot):
+    """ Tests the comparison dock follows edits, listing again only the sections they changed """
+    window.show()
+    panel = window.compare_ships(["imperium/shipyard/models/default/Far Trader.srd",
+                                  "imperium/shipyard/models/default/Free Trader Type-A.srd"])
+    model = panel.model
+    assert model.columnCount() == 4
+    assert model.headerData(2, Qt.Horizontal) == "Far Trader"
+    assert model.data(model.index(0, 1)) == "100"
+    assert model.data(model.index(0, 2)) == "200 (+100)"
+
+    def flush():
+        qtbot.waitUntil(lambda: window.stats_dirty is False)
+
+    listed = panel.cache.listed
+    window.meson_screen.setChecked(True)
+    flush()
+    assert panel.cache.listed - listed == 1
+    assert panel.cache.components()[0] == window.spacecraft.get_components()
+    assert model.stats['cost'] == round(window.spacecraft.get_total_cost(), 3)
+
+    # A closed dock only notes the edits, catching up once it is shown again
+    panel.close()
+    listed = panel.cache.listed
+    window.add_hardpoint()
+    flush()
+    assert panel.cache.listed == listed
+    panel.show()
+    assert panel.cache.listed - listed == 1
+    assert model.stats['hardpoints'] == 1
+    assert any(kind == "part" and key[0] == "hardpoints" for kind, key in model.rows)
+
+    # Loading another ship lists it all again
+    window.open_design(("imperium/shipyard/models/default/Far Trader.srd", None))
+    flush()
+    assert all(value == model.references[0][1][stat] for stat, value in model.stats.items())
+    assert not any(model.cell(row, 2)[1] for row in model.rows)
+
+
+def test_worker_cancel(window, qtbot):
+    """ Tests a job hands its results to the GUI thread in batches and stops when cancelled """
+    def count():
+        number = 0
+        while True:
+            number += 1
+            yield number
+
+    batches = list()
+    threads = set()
+
+    def collect(results):
+        batches.append(results)
+        threads.add(threading.current_thread())
+
+    worker = window.start_job(count, on_results=collect)
+    qtbot.waitUntil(lambda: len(batches) >= 2, timeout=5000)
+    with qtbot.waitSignal(worker.signals.finished, timeout=5000) as blocker:
+        window.cancel_jobs()
+    assert blocker.args == [False]
+
+    # Results arrive in order, in far fewer batches than results
+    results = [number for batch in batches for number in batch]
+    assert results == list(range(1, len(results) + 1))
+    assert len(batches) < len(results)
+    assert threads == {threading.main_thread()}
+
+
+def test_deferred_panels(window, qtbot):
+    """ Tests the hardpoint stats are built on the first idle tick after showing, with the current ship """
+    assert window.model_dict is None
+    window.add_hardpoint()
+    window.hardpoint_model.setData(cell(window.hardpoint_model, 0, "Turret"), "Single Turret")
+    window.flush_stats()
+
+    window.show()
+    qtbot.waitUntil(lambda: not window.deferred_panels)
+    assert window.model_dict["Single Turret"].text() == "1"
+    assert window.active_hardpoints.text() == "1"
+
+
+def test_startup_trace(qtbot, monkeypatch, capsys):
+    """ Tests the startup trace times each panel to its first paint """
+    monkeypatch.setenv("IMPERIUM_STARTUP_TRACE", "1")
+    window = Window()
+    qtbot.addWidget(window)
+    assert [name for name, _ in window.trace.steps][:2] == ["Import and QApplication", "Menu"]
+
+    window.build_panels()
+    window.show()
+    qtbot.waitUntil(lambda: window.trace.reported)
+    assert {name for name, _ in window.trace.painted} >= {"Base Stats", "Hardpoints:", "Hardpoint Stats:", "Cont."}
+    assert "Cold start" in capsys.readouterr().out
+
+
 def test_tonnage_drive(window):
     """
     Test for automatically upgrading to lowest available drive on new tonnage
@@ -331,14 +572,14 @@ def test_add_hardpoint(window):
     # Add hardpoint
     window.add_hardpoint()
     assert len(window.spacecraft.hardpoints) == 1
-    assert window.hp_config_layout.itemAt(5).widget() is not None
+    assert window.hardpoint_model.rowCount() == 1
     assert window.total_hp.text() == "1"
     assert window.avail_hp.text() == "0"
 
     # Remove hardpoint
     window.remove_hardpoint(window.spacecraft.hardpoints[0])
     assert len(window.spacecraft.hardpoints) == 0
-    assert window.hp_config_layout.itemAt(5) is None
+    assert window.hardpoint_model.rowCount() == 0
     assert window.total_hp.text() == "1"
     assert window.avail_hp.text() == "1"
 
@@ -347,29 +588,27 @@ def test_display_turret(window):
     """ Tests displaying the turret of a hardpoint """
     assert window is not None
 
-    # Add hardpoint and call display
+    # Add hardpoints and check their rows
     window.add_hardpoint()
     window.add_hardpoint()
-    window.display_turret(window.turret_config_layout, window.active_hp_buttons[0], window.spacecraft.hardpoints[0])
-
-    # Check for proper displays
-    name = "---- HP: {} ----".format(window.spacecraft.hardpoints[0].id)
-    assert window.turret_config_layout.itemAt(0).widget().text() == name
-    assert window.turret_config_layout.itemAt(2).widget().currentText() == "---"
+    model = window.hardpoint_model
+    assert model.data(cell(model, 0, "HP")) == window.spacecraft.hardpoints[0].id
+    assert model.data(cell(model, 0, "Turret")) == "---"
+    assert not model.flags(cell(model, 0, "Wep 1")) & Qt.ItemIsEditable
 
 
 def test_turret_addon(window):
     """ Tests adding a turret addon """
     assert window is not None
 
-    # Add hardpoint and get turret display
+    # Add hardpoint and a turret
     window.add_hardpoint()
-    window.display_turret(window.turret_config_layout, window.active_hp_buttons[0], window.spacecraft.hardpoints[0])
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(1)
+    model = window.hardpoint_model
+    model.setData(cell(model, 0, "Turret"), "Single Turret")
 
-    # Checked the popup and call mod turret option
-    window.turret_config_layout.itemAt(4).widget().setChecked(True)
-    window.modify_turret_option(window.spacecraft.hardpoints[0], "Pop-up Turret")
+    # Check the popup
+    assert model.setData(cell(model, 0, "Pop-up"), Qt.Checked, Qt.CheckStateRole)
+    assert window.spacecraft.hardpoints[0].popup is True
     assert window.spacecraft.get_remaining_cargo() == 87
     assert window.spacecraft.get_total_cost() == 3.7
 
@@ -378,28 +617,29 @@ def test_display_turret_with_wep(window):
     """ Tests displaying the turret of a hardpoint that has a weapon """
     assert window is not None
 
-    # Add hardpoint and display turret
+    # Add hardpoint and change turret to single model
     window.add_hardpoint()
-    window.display_turret(window.turret_config_layout, window.active_hp_buttons[0], window.spacecraft.hardpoints[0])
-
-    # Change turret to single model
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(1)
+    model = window.hardpoint_model
+    model.setData(cell(model, 0, "Turret"), "Single Turret")
     assert window.spacecraft.hardpoints[0].turret is not None
     assert window.spacecraft.get_total_cost() == 2.7
     assert window.spacecraft.get_remaining_cargo() == 89
 
     # Add weapon to turret
-    window.turret_config_layout.itemAt(8).widget().setCurrentIndex(1)
+    model.setData(cell(model, 0, "Wep 1"), "Pulse Laser")
+    assert model.data(cell(model, 0, "Wep 1")) == "Pulse Laser"
     assert window.spacecraft.get_remaining_cargo() == 89
     assert window.spacecraft.get_total_cost() == 3.2
 
     # Swap turret model to bayweapon
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(4)
+    model.setData(cell(model, 0, "Turret"), "Bay Weapon")
+    assert model.data(cell(model, 0, "Wep 1")) == "---"
+    assert model.data(cell(model, 0, "Sandcaster")) is None
     assert window.spacecraft.get_remaining_cargo() == 39
     assert window.spacecraft.get_total_cost() == 2.5
 
     # Remove turret, back to '---'
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(0)
+    model.setData(cell(model, 0, "Turret"), "---")
     assert window.spacecraft.get_remaining_cargo() == 90
     assert window.spacecraft.get_total_cost() == 2.5
     assert window.spacecraft.hardpoints[0].turret is None
@@ -410,20 +650,13 @@ def test_turret_ammo(window):
     assert window is not None
 
     window.add_hardpoint()
-    window.display_turret(window.turret_config_layout, window.active_hp_buttons[0], window.spacecraft.hardpoints[0])
-
-    # Change turret to single model
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(1)
+    model = window.hardpoint_model
+    model.setData(cell(model, 0, "Turret"), "Single Turret")
 
     # Modify missile ammo
-    window.turret_config_layout.itemAt(15).widget().setText("1")
-
-    turret = window.spacecraft.hardpoints[0].turret
-    ammo_type = window.turret_config_layout.itemAt(13).widget().text()[:-10]
-    total_label = window.turret_config_layout.itemAt(14).widget()
-    edit = window.turret_config_layout.itemAt(15).widget()
-
-    window.modify_turret_ammo(turret, ammo_type, total_label, edit)
+    ammo_type = model.missiles[0]
+    assert model.setData(cell(model, 0, "{} Missiles".format(ammo_type)), 1)
+    assert not model.setData(cell(model, 0, "{} Missiles".format(ammo_type)), -1)
     assert window.spacecraft.get_total_cost() == 2.715
     assert window.spacecraft.get_remaining_cargo() == 88
     assert window.spacecraft.hardpoints[0].turret.missiles.get(ammo_type) == 1
@@ -434,24 +667,75 @@ def test_sandcaster_ammo(window):
     assert window is not None
 
     window.add_hardpoint()
-    window.display_turret(window.turret_config_layout, window.active_hp_buttons[0], window.spacecraft.hardpoints[0])
-
-    # Change turret to single model
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(1)
+    model = window.hardpoint_model
+    model.setData(cell(model, 0, "Turret"), "Single Turret")
 
     # Modify sandcaster ammo
-    window.turret_config_layout.itemAt(24).widget().setText("1")
-
-    turret = window.spacecraft.hardpoints[0].turret
-    total_label = window.turret_config_layout.itemAt(23).widget()
-    edit = window.turret_config_layout.itemAt(24).widget()
-    window.modify_turret_sandcaster(turret, total_label, edit)
-
+    assert model.setData(cell(model, 0, "Sandcaster"), "1")
     assert window.spacecraft.get_total_cost() == 2.710
     assert window.spacecraft.get_remaining_cargo() == 88
     assert window.spacecraft.hardpoints[0].turret.sandcaster_barrels == 1
 
 
+def test_turret_delegates(window, qtbot):
+    """ Tests the table's delegates edit turrets, weapons and ammo """
+    window.add_hardpoint()
+    view = window.hardpoint_view
+    model = window.hardpoint_model
+
+    index = window.hardpoint_proxy.mapFromSource(cell(model, 0, "Turret"))
+    editor = window.choice_delegate.createEditor(view, None, index)
+    assert editor.itemText(0) == "---" and editor.count() == 5
+    editor.setCurrentText("Single Turret")
+    window.choice_delegate.setModelData(editor, window.hardpoint_proxy, index)
+    assert window.spacecraft.hardpoints[0].turret.name == "Single Turret"
+
+    index = window.hardpoint_proxy.mapFromSource(cell(model, 0, "Sandcaster"))
+    editor = window.ammo_delegate.createEditor(view, None, index)
+    assert editor.minimum() == 0
+    editor.setValue(2)
+    window.ammo_delegate.setModelData(editor, window.hardpoint_proxy, index)
+    assert window.spacecraft.hardpoints[0].turret.sandcaster_barrels == 2
+
+
+def test_shared_catalog(window, qtbot, monkeypatch):
+    """ Tests combo boxes share the catalog's models, so adding parts never reads the catalog """
+    other = Window()
+    qtbot.addWidget(other)
+    catalog = window.catalog
+    assert other.catalog is catalog
+    assert window.sensors.model() is other.sensors.model() is catalog.model("sensors")
+    assert window.software_box.model().sourceModel() is catalog.model("software")
+
+    def read(filename):
+        raise AssertionError("read {}".format(filename))
+    monkeypatch.setattr("imperium.gui.catalog.get_file_data", read)
+    monkeypatch.setattr("imperium.gui.hardpoints.get_file_data", read)
+
+    # Software rows share the level models, and the box hides what is installed in either window
+    window.software_box.setCurrentText("Jump Control")
+    window.add_software(window.software_box)
+    box = window.software_rows.widgets("Jump Control")[1]
+    assert box.model() is catalog.levels.get("Jump Control") and box.currentText() == "1"
+    assert window.software_box.findText("Jump Control") == -1
+    assert other.software_box.findText("Jump Control") != -1
+
+    window.remove_software(window.software_rows.widgets("Jump Control")[0])
+    assert window.software_box.findText("Jump Control") != -1
+
+    # Turret editors list the shared models
+    window.add_hardpoint()
+    index = window.hardpoint_proxy.mapFromSource(cell(window.hardpoint_model, 0, "Turret"))
+    editor = window.choice_delegate.createEditor(window.hardpoint_view, None, index)
+    assert editor.model() is catalog.model("turrets")
+
+    # Views limited to a tech level are shared too
+    weapons = catalog.model("weapons", tl=7)
+    assert catalog.model("weapons", tl=7) is weapons
+    assert 0 < weapons.rowCount() < catalog.model("weapons").rowCount()
+    assert weapons.data(weapons.index(0, 0)) == "---"
+
+
 def test_reset_ship(window):
     """ Tests resetting the ship to a default state """
     # Change tonnage, add a hardpoint and turret
@@ -459,8 +743,7 @@ def test_reset_ship(window):
     window.edit_tonnage()
 
     window.add_hardpoint()
-    window.display_turret(window.turret_config_layout, window.active_hp_buttons[0], window.spacecraft.hardpoints[0])
-    window.turret_config_layout.itemAt(2).widget().setCurrentIndex(1)
+    window.hardpoint_model.setData(cell(window.hardpoint_model, 0, "Turret"), "Single Turret")
 
     assert window.spacecraft.get_total_cost() == 9.2
     assert window.spacecraft.get_remaining_cargo() == 189
@@ -471,6 +754,7 @@ def test_reset_ship(window):
     assert window.spacecraft.get_total_cost() == 2.5
     assert window.spacecraft.get_remaining_cargo() == 90
     assert len(window.spacecraft.hardpoints) == 0
+    assert window.hardpoint_model.rowCount() == 0
 
 
 def test_load_model(window):
@@ -525,6 +809,10 @@ def test_save_model(window):
     # Save the loaded model
     window.fileloader.save_model("tests/savetestship.srd", window.spacecraft)
 
+    # Weapons are saved by their catalog name
+    with open("tests/savetestship.srd") as f:
+        assert json.load(f)['hardpoints'][0]['turret']['weapons'] == ["Sandcaster", "Beam Laser"]
+
     # Reset the ship and reload in the new saved ship
     window.reset_ship()
     assert window.spacecraft.tonnage == 100
@@ -547,3 +835,52 @@ def test_save_model(window):
     assert window.spacecraft.sensors.name == "Basic Military"
     assert window.spacecraft.computer.model == "Model 4"
     assert len(window.spacecraft.hardpoints) == 4
+
+
+def test_load_spacecraft(window):
+    """ Tests the headless load matches the state of a GUI load """
+    window.fileloader.load_model("tests/testship.srd", window)
+    spacecraft = window.fileloader.load_spacecraft("tests/testship.srd")
+
+    assert spacecraft.get_stats() == window.spacecraft.get_stats()
+    assert window.fileloader.encode_model(spacecraft) == window.fileloader.encode_model(window.spacecraft)
+
+
+def test_save_many(tmp_path):
+    """ Tests saving a batch of models and loading them back """
+    fileloader = FileLoader()
+    ship = fileloader.load_spacecraft("tests/testship.srd")
+
+    paths = [str(tmp_path / "ship{}.srd".format(i)) for i in range(3)]
+    assert fileloader.save_many((path, ship) for path in paths) == 3
+
+    for path in paths:
+        loaded = fileloader.load_spacecraft(path)
+        assert loaded.get_total_cost() == 383.725
+        assert loaded.get_remaining_cargo() == 62
+
+
+def test_describe_file(window):
+    """ Tests the load dialog preview of a SRD file """
+    text = window.describe_file("imperium/shipyard/models/default/Far Trader.srd")
+    assert "Tonnage: 200" in text
+    assert "Jump: 2" in text
+
+    assert window.describe_file("README.md") == ""
+
+
+def test_instrument_overlay(qtbot, monkeypatch):
+    """ Tests the window floats the instrumentation totals over itself only while instrumentation is on """
+    window = Window()
+    qtbot.addWidget(window)
+    assert window.overlay is None
+
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    monkeypatch.setattr(instrument, "counters", dict())
+    window = Window()
+    qtbot.addWidget(window)
+    window.show()
+    instrument.count("gui.widgets_created", 3)
+    window.overlay.refresh()
+    assert "gui.widgets_created" in window.overlay.text()
+    assert window.overlay.geometry().right() <= window.width()
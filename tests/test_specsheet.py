@@ -0,0 +1,75 @@
+"""
+@file test_specsheet.py
+
+Unit tests for rendering spec sheets, and skipping the ships whose sheets are current
+"""
+import json
+import os
+import shutil
+from PyQt5.QtGui import QImage
+from imperium.gui.specsheet import (CACHED, MANIFEST, RENDERED, build_sheet, render_library, render_sheet)
+from imperium.shipyard.fileloader import FileLoader
+
+MODELS = "imperium/shipyard/models/default"
+
+
+def test_build_sheet():
+    """ Tests the sheet lists the drives, every hardpoint and costs adding up to the ship's """
+    spacecraft = FileLoader().load_spacecraft(os.path.join(MODELS, "Mercenary Cruiser.srd"))
+    sheet = build_sheet(spacecraft, "Mercenary Cruiser")
+    tables = {heading: rows for heading, _, rows in sheet['tables']}
+
+    assert sheet['title'] == "Mercenary Cruiser"
+    assert [row[0] for row in tables['Drives']] == ["Jump Drive", "Manoeuvre Drive", "Power Plant"]
+    assert len(tables['Hardpoints']) == 8
+    assert tables['Cost Breakdown'][-1] == ["Total", "", "719", "478"]
+    assert round(sum(float(row[3]) for row in tables['Cost Breakdown'][:-1]), 3) == 478
+
+
+def test_render_formats(qtbot, tmp_path):
+    """ Tests a sheet renders to a PNG at least a page tall and to a PDF """
+    sheet = build_sheet(FileLoader().load_spacecraft("tests/testship.srd"))
+    render_sheet(sheet, str(tmp_path / "ship.png"), "png")
+    render_sheet(sheet, str(tmp_path / "ship.pdf"), "pdf")
+
+    image = QImage(str(tmp_path / "ship.png"))
+    assert (image.width(), image.height()) == (1240, 1754)
+    with open(tmp_path / "ship.pdf", 'rb') as f:
+        assert f.read(5) == b"%PDF-"
+    assert sorted(os.listdir(tmp_path)) == ["ship.pdf", "ship.png"]
+
+
+def test_render_library(qtbot, tmp_path):
+    """ Tests a library renders once, ships unchanged since being skipped on the next run """
+    library = tmp_path / "library"
+    shutil.copytree(MODELS, library)
+    out = str(tmp_path / "sheets")
+
+    results = dict(render_library([str(library)], out, workers=1))
+    assert list(results.values()) == [RENDERED] * 12
+    assert "Corsair.png" in os.listdir(out)
+
+    # Editing a ship renders only its sheet again
+    path = library / "Yacht.srd"
+    model = json.loads(path.read_text())
+    model['stats']['tonnage'] = 300
+    model['hash'] = None
+    path.write_text(json.dumps(model))
+    results = dict(render_library([str(library)], out, workers=1))
+    assert results.pop(str(path)) == RENDERED
+    assert set(results.values()) == {CACHED}
+
+    # A deleted sheet is rendered again, even though the manifest lists it
+    os.remove(os.path.join(out, "Corsair.png"))
+    results = dict(render_library([str(library)], out, workers=1))
+    assert results[str(library / "Corsair.srd")] == RENDERED
+    with open(os.path.join(out, MANIFEST)) as f:
+        assert len(json.load(f)) == 12
+
+
+def test_render_pool(tmp_path):
+    """ Tests sheets render on worker processes, each with its own application """
+    paths = [os.path.join(MODELS, name) for name in ("Scout Type-S.srd", "Far Trader.srd")]
+    results = dict(render_library(paths, str(tmp_path), "pdf", workers=2))
+    assert results == {path: RENDERED for path in paths}
+    assert sorted(os.listdir(tmp_path)) == ["Far Trader.pdf", "Scout Type-S.pdf", MANIFEST]
@@ -0,0 +1,117 @@
+"""
+@file test_stream.py
+
+Unit tests for the line-delimited fleet codec
+"""
+import io
+import json
+import os
+import shutil
+import pytest
+from imperium.classes.spacecraft import Spacecraft
+from imperium.shipyard.fileloader import FileLoader
+from imperium.shipyard.schema import SRD_VERSION, hash_model
+from imperium.shipyard.stream import (export_directory, import_directory, read_fleet, read_model, read_models,
+                                      write_fleet)
+
+DEFAULT_MODELS = "imperium/shipyard/models/default"
+
+
+def test_fleet_round_trip():
+    """ Tests writing and reading spacecraft through a stream """
+    small = Spacecraft(100)
+    large = Spacecraft(2000)
+    large.name = "Dreadnought"
+
+    buffer = io.StringIO()
+    assert write_fleet([small, large], buffer, stats=True) == 2
+    assert len(buffer.getvalue().splitlines()) == 2
+
+    buffer.seek(0)
+    records = list(read_models(buffer))
+    assert records[1]['name'] == "Dreadnought"
+    assert records[1]['computed']['tonnage'] == 2000
+
+    buffer.seek(0)
+    ships = list(read_fleet(buffer))
+    assert [ship.tonnage for ship in ships] == [100, 2000]
+    assert ships[1].name == "Dreadnought"
+
+
+def test_read_skips_blank_and_binary():
+    """ Tests reading from a binary stream with blank lines """
+    buffer = io.StringIO()
+    write_fleet([Spacecraft(200)], buffer)
+    data = ("\n" + buffer.getvalue() + "\n").encode()
+
+    ships = list(read_fleet(io.BytesIO(data)))
+    assert len(ships) == 1
+    assert ships[0].tonnage == 200
+
+
+def test_read_model(tmp_path):
+    """ Tests reading one design from an archive by its position, blank lines not counting """
+    path = str(tmp_path / "fleet.jsonl")
+    with open(path, 'w') as f:
+        export_directory(DEFAULT_MODELS, f)
+    with open(path) as f:
+        models = list(read_models(f))
+    with open(path, 'a') as f:
+        f.write("\n\n")
+
+    assert read_model(path, 3) == models[3]
+    assert read_model(path, len(models) - 1)['name'] == models[-1]['name']
+    with pytest.raises(IndexError):
+        read_model(path, len(models))
+
+
+def test_directory_round_trip(tmp_path):
+    """ Tests exporting the default ships and importing them into a new directory """
+    buffer = io.StringIO()
+    assert export_directory(DEFAULT_MODELS, buffer, stats=True) == 12
+
+    buffer.seek(0)
+    assert import_directory(buffer, str(tmp_path)) == 12
+    assert os.path.exists(os.path.join(str(tmp_path), "Far Trader.srd"))
+
+    # Computed stats stay out of the written files
+    with open(os.path.join(str(tmp_path), "Far Trader.srd")) as f:
+        assert "computed" not in next(read_models(f))
+
+
+def test_unnamed_hash(tmp_path):
+    """ Tests a design named after its file is exported and imported with the hash of its new contents """
+    model = FileLoader().encode_model(Spacecraft(100))
+    with open(str(tmp_path / "Scout.srd"), 'w') as f:
+        json.dump(model, f)
+
+    buffer = io.StringIO()
+    assert export_directory(str(tmp_path), buffer, stats=True) == 1
+    buffer.seek(0)
+    exported = next(read_models(buffer))
+    assert exported['name'] == "Scout"
+    assert exported['hash'] != model['hash']
+    exported.pop('computed')
+    assert exported['hash'] == hash_model(exported)
+
+    buffer.seek(0)
+    imported = tmp_path / "imported"
+    assert import_directory(buffer, str(imported)) == 1
+    with open(str(imported / "Scout.srd")) as f:
+        written = json.load(f)
+    assert written['hash'] == hash_model(written) == exported['hash']
+
+
+def test_export_legacy(tmp_path):
+    """ Tests a version 1 file is exported upgraded and reads back with all of its parts """
+    shutil.copy("tests/testship.srd", str(tmp_path / "testship.srd"))
+    buffer = io.StringIO()
+    assert export_directory(str(tmp_path), buffer, stats=True) == 1
+
+    buffer.seek(0)
+    assert next(read_models(buffer))['version'] == SRD_VERSION
+    buffer.seek(0)
+    ship = next(read_fleet(buffer))
+    assert [option.name for option in ship.hull_options] == ["Reflec", "Self-Sealing", "Stealth"]
+    assert len(ship.screens) == 2
+    assert round(ship.get_total_cost(), 3) == 383.725
@@ -97,3 +97,30 @@ def test_triple_turret():
     assert turret.get_cost() == 3.0
 
     print("--- Passed test for Triple Turret! ---")
+
+
+def test_load_weapon():
+    """
+    Test loading weapons stored by name or as embedded copies from older files
+    """
+    turret = Turret("Double Turret")
+
+    # Stored by catalog name
+    turret.load_weapon("Beam Laser", 0)
+    assert turret.weapons[0] is turret.data.get("weapons").get("Beam Laser")
+
+    # Stale embedded copies are swapped for the catalog entry
+    turret.load_weapon({"name": "Pulse Laser", "cost": 99.0}, 1)
+    assert turret.get_cost() == 2.0
+
+    # Copies of weapons no longer in the catalog are kept
+    custom = {"name": "Plasma Lance", "cost": 3.0}
+    turret.load_weapon(custom, 1)
+    assert turret.weapons[1] is custom
+
+    turret.load_weapon(None, 0)
+    assert turret.weapons[0] is None
+
+    bay = Turret("Bay Weapon")
+    bay.load_weapon("Missile Bank", 0)
+    assert bay.get_cost() == 12.0